@@ -29,9 +29,17 @@ class AppConfig(BaseModel):
 class DatabaseConfig(BaseModel):
     driver: str = "sqlite"
     url: str = "sqlite:///./resimhub.db"
+    # Connection pool, per engine and per process (sync and async engines each get one)
     pool_size: int = 5
     max_overflow: int = 10
+    pool_timeout_seconds: float = 30.0
+    pool_recycle_seconds: int = 1800
+    pool_pre_ping: bool = True
     echo: bool = False
+    # SQLite only: WAL lets readers run alongside a writer; writers wait instead of failing
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
 
 
 class LoggingConfig(BaseModel):
@@ -72,6 +80,97 @@ class CacheConfig(BaseModel):
     #url: str = "redis://localhost:6379/0"
     url: str = "redis://localhost:6379/"
     timeout_seconds: int = 2
+    # Per-task progress streams (replayable SSE)
+    progress_stream_maxlen: int = 1000
+    progress_stream_ttl_seconds: int = 3600
+    # Shared progress reader fan-out (per API process)
+    progress_client_queue_size: int = 100
+    progress_heartbeat_seconds: float = 15.0
+    progress_read_block_ms: int = 1000
+    progress_coalesce_seconds: float = 0.5
+    # Tasks one WebSocket client may watch at once
+    progress_ws_max_subscriptions: int = 100
+    # Minimum spacing between progress writes from a running task
+    progress_min_interval_seconds: float = 1.0
+    # Serialized GET responses kept per API process for ETag revalidation
+    response_cache_entries: int = 256
+
+
+class CeleryConfig(BaseModel):
+    default_queue: str = "short"
+    # Task name → queue (workload class)
+    task_routes: dict[str, str] = {
+        "run_training_task": "training",
+        "long_task": "short",
+    }
+    # Queue → worker pool concurrency; every queue listed here is declared
+    worker_concurrency: dict[str, int] = {"short": 4, "training": 2, "benchmark": 2}
+    # Queues running multi-minute jobs: acks_late and prefetch of one task per process
+    long_running_queues: list[str] = ["training", "benchmark"]
+    prefetch_multiplier: int = 4
+    # Redis broker priorities: 0 is served first, max_priority last
+    max_priority: int = 9
+    default_priority: int = 5
+    visibility_timeout_seconds: int = 3600
+    # Training checkpoints (resume after worker loss or retry)
+    checkpoint_dir: str = "storage/checkpoints"
+    checkpoint_interval_epochs: int = 1
+    # Epoch metrics are written to SQL in batches: every N epochs or T seconds, whichever comes first
+    metrics_flush_epochs: int = 10
+    metrics_flush_seconds: float = 30.0
+    # Cooperative cancellation and priority preemption (checked between epochs)
+    cancel_flag_ttl_seconds: int = 86400
+    preemption_enabled: bool = True
+    # A better-priority task must wait this long (no free worker) before it preempts
+    preemption_grace_seconds: float = 5.0
+    # Repeat submissions with the same idempotency key return the first task within this window
+    idempotency_ttl_seconds: int = 86400
+    # One training per experiment at a time (sweep trials excepted); the lease is renewed every epoch
+    experiment_lock_ttl_seconds: int = 120
+    experiment_lock_retry_seconds: int = 30
+
+
+class AdmissionConfig(BaseModel):
+    # Backpressure on POST /orchestrate/train (429 + Retry-After when exceeded)
+    enabled: bool = True
+    # Messages waiting in the broker for one queue, summed over priority levels
+    max_queue_depth: int = 1000
+    # Queued + running tasks per client (X-Client-ID header, else remote address)
+    max_inflight_per_client: int = 50
+    retry_after_seconds: int = 10
+    # In-flight entries older than this are assumed lost and no longer counted
+    inflight_ttl_seconds: int = 86400
+
+
+class AutoscaleConfig(BaseModel):
+    # Local controller resizing Celery worker processes per queue (scripts/run_autoscaler.py)
+    interval_seconds: float = 15.0
+    # Queue → [min, max] worker processes; each runs Settings.celery.worker_concurrency[queue] tasks
+    worker_bounds: dict[str, list[int]] = {"short": [1, 2], "training": [1, 4], "benchmark": [1, 2]}
+    # Grow to one process per this many messages waiting in the broker
+    target_queue_depth_per_worker: int = 4
+    # Grow by one process while the oldest queued task has waited longer than this
+    max_queue_wait_seconds: float = 60.0
+    # Shrink by one idle process at most this often
+    scale_down_cooldown_seconds: float = 300.0
+    # Prometheus endpoint of the controller process
+    metrics_port: int = 9102
+
+
+class RetentionConfig(BaseModel):
+    # Celery results and finished task records expire from Redis after this
+    result_expires_seconds: int = 7 * 86400
+    # Periodic job (Celery beat) moving finished tasks into the SQL archive before they expire
+    archive_enabled: bool = True
+    archive_interval_seconds: int = 300
+    # Finished tasks registered longer ago than this are archived; keep well below the expiry
+    archive_after_seconds: int = 3600
+    archive_batch_size: int = 500
+    # Columnar history for offline analysis: Parquet partitioned by date/env/algo
+    parquet_export_enabled: bool = True
+    parquet_dir: str = "storage/parquet"
+    parquet_export_interval_seconds: int = 3600
+    parquet_row_group_size: int = 50000
 
 
 class SecurityConfig(BaseModel):
@@ -81,6 +180,8 @@ class SecurityConfig(BaseModel):
 
 class SystemConfig(BaseModel):
     max_workers: int = 4
+    # Task backend: "celery" (Redis broker + workers) or "local" (in-process pool, no Redis)
+    executor: str = "celery"
     enable_experiment_tracking: bool = True
 
 
@@ -95,6 +196,10 @@ class Settings(BaseSettings):
     observability: ObservabilityConfig = ObservabilityConfig()
     monitoring: MonitoringConfig = MonitoringConfig()
     cache: CacheConfig = CacheConfig()
+    celery: CeleryConfig = CeleryConfig()
+    admission: AdmissionConfig = AdmissionConfig()
+    retention: RetentionConfig = RetentionConfig()
+    autoscale: AutoscaleConfig = AutoscaleConfig()
     security: SecurityConfig = SecurityConfig()
     system: SystemConfig = SystemConfig()
 
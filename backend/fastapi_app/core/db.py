@@ -1,33 +1,225 @@
 # backend/fastapi_app/core/db.py
 import os
-from sqlalchemy import create_engine
+import time
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import create_engine, event, exc, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from backend.fastapi_app.core.config import settings
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from backend.fastapi_app.core.config import DatabaseConfig, settings
 from shared.models.base import Base
 
 # Load database configuration
 DATABASE_URL = settings.database.url or os.getenv("DATABASE_URL", "sqlite:///./resimhub.db")
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+# Async driver per backend, used by request handlers
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args=connect_args
+db_pool_checkout_seconds = Histogram(
+    "resimhub_db_pool_checkout_seconds", "Time to check a connection out of the pool", ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
 )
+db_pool_timeouts_total = Counter(
+    "resimhub_db_pool_timeouts_total", "Checkouts that gave up waiting for a pooled connection", ["engine"]
+)
+db_pool_checked_out = Gauge("resimhub_db_pool_checked_out", "Connections currently checked out", ["engine"])
+db_pool_overflow = Gauge("resimhub_db_pool_overflow", "Connections open beyond pool_size", ["engine"])
+
+
+def async_database_url(url: str) -> str:
+    """Same database, async driver: sqlite:// → sqlite+aiosqlite://, postgresql:// → postgresql+asyncpg://."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+class _TimedCheckout:
+    """Pool mixin recording checkout latency and timeouts under the `engine` label."""
+
+    engine_label = "sync"
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            db_pool_timeouts_total.labels(engine=self.engine_label).inc()
+            raise
+        finally:
+            db_pool_checkout_seconds.labels(engine=self.engine_label).observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+def engine_options(url: str, config: DatabaseConfig, asynchronous: bool = False) -> dict:
+    """create_engine keyword arguments for `url` built from DatabaseConfig."""
+    options = {"echo": config.echo}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if not asynchronous:
+            options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            return options  # single shared connection; nothing to pool
+    options.update(
+        poolclass=TimedAsyncQueuePool if asynchronous else TimedQueuePool,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout_seconds,
+        pool_recycle=config.pool_recycle_seconds,
+        pool_pre_ping=config.pool_pre_ping,
+    )
+    return options
+
+
+def configure_engine(sync_engine, config: DatabaseConfig, label: str):
+    """Apply SQLite pragmas on every new connection and export pool occupancy gauges."""
+    if sync_engine.dialect.name == "sqlite":
+        @event.listens_for(sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA journal_mode={config.sqlite_journal_mode}")
+            cursor.execute(f"PRAGMA synchronous={config.sqlite_synchronous}")
+            cursor.execute(f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}")
+            cursor.close()
+
+    pool = sync_engine.pool
+    if isinstance(pool, QueuePool):
+        db_pool_checked_out.labels(engine=label).set_function(pool.checkedout)
+        db_pool_overflow.labels(engine=label).set_function(lambda: max(0, pool.overflow()))
+
+
+# Sync engine: startup schema creation, Celery workers and scripts
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, settings.database))
+configure_engine(engine, settings.database, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: API handlers, so queries never block the event loop
+ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, settings.database, asynchronous=True)
+)
+configure_engine(async_engine.sync_engine, settings.database, "async")
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _dialect_insert(table, dialect_name: str):
+    if dialect_name not in UPSERT_DIALECTS:
+        raise ValueError(f"ON CONFLICT inserts are not supported on '{dialect_name}'")
+    return UPSERT_DIALECTS[dialect_name](table)
+
+
+def insert_ignoring_conflicts(table, dialect_name: str, conflict_columns: Optional[list]):
+    """
+    INSERT for `table` that skips rows clashing with the unique `conflict_columns`,
+    or with any unique key if None (ON CONFLICT DO NOTHING); combine with
+    .values([...]) for one multi-row statement.
+    """
+    return _dialect_insert(table, dialect_name).on_conflict_do_nothing(index_elements=conflict_columns)
+
+
+def insert_updating_conflicts(table, dialect_name: str, conflict_columns: list, update_columns: list, rows: list):
+    """Multi-row INSERT of `rows` where clashing rows get `update_columns` overwritten (ON CONFLICT DO UPDATE)."""
+    stmt = _dialect_insert(table, dialect_name).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=conflict_columns,
+        set_={name: stmt.excluded[name] for name in update_columns},
+    )
+
+
+async def bulk_insert_ignoring_conflicts(db: AsyncSession, model, rows: list, key: str) -> tuple:
+    """
+    Insert `rows` (dicts, unique on `key`) in one multi-row INSERT, skipping
+    keys that already exist, then look up the ids of those in one SELECT.
+    Returns ({key: id} created, {key: id} already present); the caller commits.
+    """
+    key_column = getattr(model, key)
+    stmt = (
+        insert_ignoring_conflicts(model.__table__, db.get_bind().dialect.name, [key])
+        .values(rows)
+        .returning(key_column, model.id)
+    )
+    created = dict((await db.execute(stmt)).all())
+
+    missing = [row[key] for row in rows if row[key] not in created]
+    existing = {}
+    if missing:
+        existing = dict((await db.execute(select(key_column, model.id).where(key_column.in_(missing)))).all())
+    return created, existing
+
+
+async def insert_rows_ignoring_conflicts(db: AsyncSession, model, rows: list) -> int:
+    """
+    Insert `rows` (dicts, explicit ids allowed), skipping any that clash with an
+    existing primary or unique key. One multi-row INSERT per distinct set of
+    columns; returns how many rows were inserted. The caller commits.
+    """
+    dialect_name = db.get_bind().dialect.name
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    inserted = 0
+    for group in groups.values():
+        stmt = insert_ignoring_conflicts(model.__table__, dialect_name, None).values(group).returning(model.id)
+        inserted += len((await db.execute(stmt)).all())
+
+    if dialect_name == "postgresql" and any("id" in row for row in rows):
+        # Explicit ids bypass the serial sequence; move it past them
+        table = model.__tablename__
+        await db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+        ))
+    return inserted
+
+
+async def stream_rows(db: AsyncSession, stmt, batch_size: int):
+    """Yield the rows of `stmt` as dicts from a server-side cursor, fetching `batch_size` at a time."""
+    result = await db.stream(stmt.execution_options(yield_per=batch_size))
+    async for row in result.mappings():
+        yield dict(row)
+
+
 def init_db():
     """Initialize database tables. Should be called at startup."""
     # Ensure models are imported to register them with metadata
-    from shared.models.experiment_model import Experiment, Environment
+    from shared.models.experiment_model import Experiment, Environment, TrainingRun, EpochMetric
+    from shared.models.task_archive_model import ArchivedTask
+    from shared.models.model_registry_model import Model
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables; add indexes introduced since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 
 def get_db():
-    """FastAPI dependency to get DB session."""
+    """FastAPI dependency to get a sync DB session (prefer get_async_db in async handlers)."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """FastAPI dependency to get an AsyncSession."""
+    async with AsyncSessionLocal() as db:
+        yield db
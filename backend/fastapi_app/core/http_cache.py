@@ -0,0 +1,112 @@
+# backend/fastapi_app/core/http_cache.py
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from prometheus_client import Counter
+from backend.fastapi_app.core.config import settings
+
+http_cache_requests_total = Counter(
+    "resimhub_http_cache_requests_total", "Cached GET requests by outcome", ["namespace", "result"]
+)
+
+# Set by the response itself, never replayed from the cache
+_OWN_HEADERS = {"content-length", "content-type", "etag", "cache-control"}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list, as RFC 9110 asks for GET."""
+    if not if_none_match:
+        return False
+    wanted = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == wanted:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized GET responses with ETag revalidation.
+
+    Each endpoint passes a cheap change marker (a row count and max id, a
+    counter, a file offset) as `version`. The ETag is derived from the URL and
+    that marker only, so every process hands out the same ETag for the same
+    data, and:
+
+      - a matching If-None-Match gets a 304 without running the query;
+      - an unchanged version is served from the stored body;
+      - only a new version is recomputed and serialized.
+
+    Entries are per process and LRU-bounded; `invalidate()` drops a namespace's
+    entries after a local write. Markers read from the database or Redis keep
+    processes consistent with writes made elsewhere.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # {(namespace, url): (etag, body, headers)}
+
+    def invalidate(self, namespace: str):
+        for key in [key for key in self._entries if key[0] == namespace]:
+            del self._entries[key]
+
+    def etag(self, request: Request, namespace: str, version: Any) -> str:
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        raw = f"{namespace}|{request.url.path}?{query}|{version}"
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+    async def respond(
+        self,
+        request: Request,
+        namespace: str,
+        version: Any,
+        produce: Callable[[], Awaitable[Any]],
+        response: Optional[Response] = None,
+    ) -> Response:
+        """
+        Answer from the cache, or call `produce()` for the content to serve and store.
+        Headers `produce` sets on the injected `response` (e.g. pagination links)
+        are stored with the body. A Response other than 200 from `produce` is
+        passed through uncached.
+        """
+        etag = self.etag(request, namespace, version)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            http_cache_requests_total.labels(namespace=namespace, result="not_modified").inc()
+            return Response(status_code=304, headers=headers)
+
+        key = (namespace, f"{request.url.path}?{request.url.query}")
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == etag:
+            self._entries.move_to_end(key)
+            http_cache_requests_total.labels(namespace=namespace, result="hit").inc()
+            return Response(entry[1], media_type="application/json", headers={**entry[2], **headers})
+
+        content = await produce()
+        extra = {}
+        if isinstance(content, Response):
+            if content.status_code != 200:
+                return content
+            body = content.body
+            extra.update((k, v) for k, v in content.headers.items() if k not in _OWN_HEADERS)
+        else:
+            body = JSONResponse(jsonable_encoder(content)).body
+        if response is not None:
+            for name in [k for k in response.headers if k not in _OWN_HEADERS]:
+                extra[name] = response.headers[name]
+                del response.headers[name]
+
+        self._entries[key] = (etag, body, extra)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        http_cache_requests_total.labels(namespace=namespace, result="miss").inc()
+        return Response(body, media_type="application/json", headers={**extra, **headers})
+
+
+# Shared by the routers so writes can invalidate what reads have cached
+response_cache = ResponseCache(settings.cache.response_cache_entries)
@@ -4,7 +4,7 @@
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError, HTTPException
 from backend.fastapi_app.core.config import AppConfig
-from backend.fastapi_app.core.db import init_db
+from backend.fastapi_app.core.db import SessionLocal, init_db
 
 from middlewares.log_middleware import LogMiddleware
 from shared.utils.exceptions import http_exception_handler, unhandled_exception_handler
@@ -18,8 +18,11 @@ from backend.fastapi_app.routers import (
     analytics,
     benchmark,
     metrics,
+    sweeps,
+    dashboard,
 )
 from backend.fastapi_app.core.logging_config import logger  # structured logger
+from backend.fastapi_app.services.benchmark_service import BenchmarkService
 
 
 
@@ -37,6 +40,8 @@ app.include_router(status.router)
 app.include_router(analytics.router)
 app.include_router(benchmark.router)
 app.include_router(metrics.router)
+app.include_router(sweeps.router)
+app.include_router(dashboard.router)
 
 app.add_middleware(LogMiddleware)
 
@@ -57,6 +62,10 @@ async def on_startup():
         logger.info("Database initialised successfully.")
     except Exception as e:
         logger.error("Database initialisation failed", error=str(e))
+    try:
+        BenchmarkService.register_legacy_models(SessionLocal)
+    except Exception as e:
+        logger.error("Registering legacy models failed", error=str(e))
     logger.info("ReSimHub Application startup complete.")
 
 
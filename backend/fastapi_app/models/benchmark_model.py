@@ -29,6 +29,21 @@ class ModelUploadResponse(BaseModel):
     status: str = Field(..., example="uploaded")
     uploaded_at: datetime = Field(..., example="2025-10-30T14:16:26.241943")
     filename: Optional[str] = Field(None, example="dqn_model.pkl")
+    format: Optional[str] = Field(None, example="pkl")
+    size_bytes: Optional[int] = Field(None, example=1048576)
+    sha256: Optional[str] = Field(None, example="9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08")
+
+
+class ModelResponse(BaseModel):
+    model_id: str = Field(..., example="mdl_afdbb795")
+    filename: str = Field(..., example="dqn_model.pkl")
+    format: str = Field(..., example="pkl")
+    size_bytes: int = Field(..., example=1048576)
+    sha256: str = Field(..., example="9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08")
+    uploaded_at: Optional[datetime] = Field(None, example="2025-10-30T14:16:26.241943")
+
+    class Config:
+        from_attributes = True
 
 
 class BenchmarkRunRequest(BaseModel):
@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Query
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from shared.utils.logger import get_logger
-from backend.fastapi_app.services.analytics_service import AnalyticsService
+from backend.fastapi_app.core.http_cache import response_cache
+from backend.fastapi_app.services.analytics_service import AnalyticsService, run_archive
 
 log = get_logger("AnalyticsRouter")
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
 @router.get("/recent")
-async def get_recent_experiments(limit: int = Query(5, ge=1, le=50)):
+async def get_recent_experiments(request: Request, limit: int = Query(5, ge=1, le=50)):
     """
     List recent experiments with final accuracy/reward.
+    Carries an ETag; If-None-Match gets a 304 until another run completes.
     """
-    records = AnalyticsService.list_recent_experiments(limit)
-    if not records:
-        return {"error": "No experiments found in logs."}
-    return records
+    async def produce():
+        records = await run_in_threadpool(AnalyticsService.list_recent_experiments, limit)
+        if not records:
+            return {"error": "No experiments found in logs."}
+        return records
+
+    version = await run_in_threadpool(AnalyticsService.recent_experiments_version)
+    return await response_cache.respond(request, "analytics_recent", version, produce)
 
 
 @router.get("/experiment/{experiment_id}")
@@ -26,7 +35,7 @@ async def get_experiment_analytics(experiment_id: int):
     - convergence_epoch
     - last_reward
     """
-    df = AnalyticsService.parse_experiment_logs(experiment_id)
+    df = await run_in_threadpool(AnalyticsService.experiment_rewards, experiment_id)
     if df.empty:
         log.warning(f"No logs found for Experiment {experiment_id}")
         return {"error": f"No logs found for Experiment {experiment_id}"}
@@ -36,3 +45,18 @@ async def get_experiment_analytics(experiment_id: int):
     stats["total_epochs"] = len(df)
 
     return stats
+
+
+@router.get("/leaderboard")
+async def get_leaderboard(
+    env: Optional[str] = None,
+    algo: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """
+    Experiments ranked by best final accuracy of their successful runs, read
+    from the Parquet run archive (only the date/env/algo partitions asked for).
+    """
+    return await run_in_threadpool(run_archive.leaderboard, env, algo, since, until, limit)
@@ -1,11 +1,21 @@
 # backend/fastapi_app/routers/benchmark.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.fastapi_app.core.db import get_async_db
+from backend.fastapi_app.core.http_cache import response_cache
 from backend.fastapi_app.services import benchmark_service
+from shared.models.model_registry_model import Model
+from shared.schemas.experiment_schema import ImportResponse
+from shared.utils.ndjson import EXPORT_FETCH_ROWS, import_ndjson, ndjson_response
+from shared.utils.pagination import InvalidCursorError, keyset_page, page_response, select_fields, split_page
 from typing import List, Optional
 
 from backend.fastapi_app.models.benchmark_model import (
     ModelUploadResponse,
+    ModelResponse,
+    BenchmarkResult,
     BenchmarkRunResponse,
     BenchmarkRecentResponse,
     BenchmarkComparisonResponse,
@@ -14,18 +24,56 @@ from backend.fastapi_app.models.benchmark_model import (
 
 router = APIRouter(prefix="/benchmark", tags=["Benchmarking"])
 
+# Listing order: newest upload first
+MODEL_KEY = (Model.id,)
+
+# Cached reads of benchmark results, versioned by BenchmarkService.results_version
+CACHE_NAMESPACE = "benchmark"
+
 @router.post("/upload_model", response_model=ModelUploadResponse)
-async def upload_model(file: UploadFile = File(...)):
+async def upload_model(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)):
     """
     Upload a model file (e.g. .pkl, .pt, .onnx). Returns a generated model_id.
     """
     try:
-        model_id, meta = benchmark_service.BenchmarkService.save_model_file(file)
+        model_id, meta = await benchmark_service.BenchmarkService.save_model_file(file, db)
         return ModelUploadResponse(**meta, status="uploaded")
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+@router.get("/models", response_model=list[ModelResponse])
+async def list_models(
+    request: Request,
+    response: Response,
+    format: Optional[str] = Query(None, description="File format, e.g. pt or onnx"),
+    filename: Optional[str] = Query(None),
+    sha256: Optional[str] = Query(None, description="Find uploads of identical content"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. model_id,size_bytes"),
+    cursor: Optional[str] = Query(None, description="`X-Next-Cursor` from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List registered models newest first, one keyset page at a time.
+    Each filter is served by an index on the models table.
+    """
+    stmt, names = select_fields(Model, ModelResponse, fields, MODEL_KEY)
+    if format is not None:
+        stmt = stmt.where(Model.format == format.lstrip(".").lower())
+    if filename is not None:
+        stmt = stmt.where(Model.filename == filename)
+    if sha256 is not None:
+        stmt = stmt.where(Model.sha256 == sha256.lower())
+    try:
+        stmt = keyset_page(stmt, MODEL_KEY, cursor, limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    rows, next_cursor = split_page((await db.execute(stmt)).mappings().all(), ("id",), limit)
+    return page_response(request, response, rows, names, next_cursor, partial=fields is not None)
+
+
 @router.post("/run", response_model=BenchmarkRunResponse)
 async def run_benchmark(
     model_id: str = Form(...),
@@ -37,6 +85,7 @@ async def run_benchmark(
     """
     try:
         result = benchmark_service.BenchmarkService.run_benchmark_simulation(model_id, env_name, episodes)
+        response_cache.invalidate(CACHE_NAMESPACE)
         return result
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
@@ -51,13 +100,39 @@ async def list_recent(limit: int = Query(10, ge=1, le=100)):
     return {"count": len(results), "results": results}
 
 
+@router.get("/results/export")
+async def export_results():
+    """Stream every stored benchmark result as NDJSON, oldest first."""
+    return ndjson_response(
+        benchmark_service.BenchmarkService.iter_results(EXPORT_FETCH_ROWS), "benchmark_results.ndjson"
+    )
+
+
+@router.post("/results/import", response_model=ImportResponse)
+async def import_results(request: Request):
+    """Load benchmark results (the format of /benchmark/results/export) in batches."""
+    async def write(batch: list) -> int:
+        results = [item.model_dump(mode="json", exclude_none=True) for item in batch]
+        stored = await run_in_threadpool(benchmark_service.BenchmarkService.store_results, results)
+        response_cache.invalidate(CACHE_NAMESPACE)
+        return stored
+
+    return await import_ndjson(request, BenchmarkResult, write)
+
+
 @router.get("/compare", response_model=BenchmarkComparisonResponse, responses={404: {"model": APIErrorResponse}})
-async def compare_models(model_ids: str = Query(...), env: str = Query(None)):
+async def compare_models(request: Request, model_ids: str = Query(...), env: str = Query(None)):
     """
     Compare multiple models by mean_reward. Provide model_ids as a comma-separated list.
+    Carries an ETag; If-None-Match gets a 304 until a benchmark result is stored.
     """
     ids = [mid.strip() for mid in model_ids.split(",") if mid.strip()]
-    comparison = benchmark_service.BenchmarkService.compare_models(ids, env_name=env)
-    if "error" in comparison:
-        return JSONResponse(status_code=404, content={"error": comparison["error"]})
-    return comparison
\ No newline at end of file
+
+    async def produce():
+        comparison = await run_in_threadpool(benchmark_service.BenchmarkService.compare_models, ids, env_name=env)
+        if "error" in comparison:
+            return JSONResponse(status_code=404, content={"error": comparison["error"]})
+        return BenchmarkComparisonResponse.model_validate(comparison)
+
+    version = await run_in_threadpool(benchmark_service.BenchmarkService.results_version)
+    return await response_cache.respond(request, CACHE_NAMESPACE, version, produce)
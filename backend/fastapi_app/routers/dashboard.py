@@ -0,0 +1,73 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.fastapi_app.core.db import get_async_db
+from backend.fastapi_app.services.analytics_service import AnalyticsService
+from backend.fastapi_app.services.benchmark_service import BenchmarkService
+from backend.fastapi_app.services.executor import get_executor
+from shared.models.experiment_model import Experiment
+from shared.schemas.experiment_schema import ExperimentResponse
+from shared.utils.logger import get_logger
+
+log = get_logger("DashboardRouter")
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+SECTIONS = ("experiments", "analytics", "benchmarks", "tasks")
+
+executor = get_executor()
+
+
+@router.get("/summary")
+async def get_dashboard_summary(
+    sections: Optional[str] = Query(None, description=f"Comma-separated subset of {','.join(SECTIONS)}"),
+    experiments_limit: int = Query(10, ge=1, le=100),
+    analytics_limit: int = Query(5, ge=1, le=50),
+    benchmarks_limit: int = Query(10, ge=1, le=100),
+    tasks_limit: int = Query(20, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Everything the dashboard home view shows, in one round trip.
+
+    The requested sections (all by default) are gathered concurrently, the
+    blocking ones in the threadpool, so the response takes as long as the
+    slowest source rather than their sum. A failing source leaves its section
+    null and is reported under `errors`; the other sections are still returned.
+    """
+    wanted = list(SECTIONS) if not sections else list(dict.fromkeys(s.strip() for s in sections.split(",") if s.strip()))
+    unknown = [name for name in wanted if name not in SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+
+    async def experiments():
+        rows = await db.scalars(select(Experiment).order_by(Experiment.id.desc()).limit(experiments_limit))
+        return [ExperimentResponse.model_validate(row) for row in rows]
+
+    async def analytics():
+        return await run_in_threadpool(AnalyticsService.list_recent_experiments, analytics_limit)
+
+    async def benchmarks():
+        return await run_in_threadpool(BenchmarkService.list_recent_results, benchmarks_limit)
+
+    async def tasks():
+        return await run_in_threadpool(executor.registry.list_tasks, limit=tasks_limit)
+
+    sources = {"experiments": experiments, "analytics": analytics, "benchmarks": benchmarks, "tasks": tasks}
+    started = time.perf_counter()
+    results = await asyncio.gather(*(sources[name]() for name in wanted), return_exceptions=True)
+
+    summary = {"generated_at": datetime.utcnow(), "errors": {}}
+    for name, result in zip(wanted, results):
+        if isinstance(result, Exception):
+            log.warning(f"Dashboard section {name} failed: {result}")
+            summary[name] = None
+            summary["errors"][name] = str(result) or type(result).__name__
+        else:
+            summary[name] = result
+    log.info(f"Dashboard summary ({', '.join(wanted)}) in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return summary
@@ -1,22 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from shared.schemas.experiment_schema import EnvironmentCreate, EnvironmentResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.schemas.experiment_schema import BulkCreateResponse, ImportResponse, EnvironmentImport, EnvironmentCreate, EnvironmentBulkCreate, EnvironmentResponse
 from shared.models.experiment_model import Environment
-from backend.fastapi_app.core.db import get_db
+from shared.utils.ndjson import EXPORT_FETCH_ROWS, import_ndjson, ndjson_response
+from shared.utils.pagination import InvalidCursorError, keyset_page, page_response, select_fields, split_page
+from backend.fastapi_app.core.http_cache import response_cache
+from backend.fastapi_app.core.db import (
+    bulk_insert_ignoring_conflicts,
+    get_async_db,
+    insert_rows_ignoring_conflicts,
+    stream_rows,
+)
 
 router = APIRouter(prefix="/environments", tags=["Environments"])
 
+# Listing order: newest first. Ids are assigned in creation order, and unlike
+# registered_at (second resolution on SQLite) they never tie.
+ENVIRONMENT_KEY = (Environment.id,)
+
+# Listings are versioned by the row count and highest id, which change on any
+# insert or delete whichever process made it
+CACHE_NAMESPACE = "environments"
+
 @router.post("/", response_model=EnvironmentResponse)
-async def register_environment(payload: EnvironmentCreate, db: Session = Depends(get_db)):
-    existing = db.query(Environment).filter(Environment.env_name == payload.env_name).first()
+async def register_environment(payload: EnvironmentCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await db.scalar(select(Environment).where(Environment.env_name == payload.env_name).limit(1))
     if existing:
         raise HTTPException(status_code=400, detail="Environment already registered")
     env = Environment(env_name=payload.env_name, version=payload.version)
     db.add(env)
-    db.commit()
-    db.refresh(env)
+    await db.commit()
+    response_cache.invalidate(CACHE_NAMESPACE)
+    await db.refresh(env)
     return env
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def create_environments_bulk(payload: EnvironmentBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Register many environments in one transaction with a single multi-row INSERT.
+    Names that already exist are left untouched and reported under `existing`;
+    repeated names within the payload keep their first entry.
+    """
+    rows = {}
+    for item in payload.environments:
+        rows.setdefault(item.env_name, {"env_name": item.env_name, "version": item.version})
+    created, existing = await bulk_insert_ignoring_conflicts(db, Environment, list(rows.values()), "env_name")
+    await db.commit()
+    response_cache.invalidate(CACHE_NAMESPACE)
+    return BulkCreateResponse(
+        created=[created[k] for k in rows if k in created],
+        existing=[existing[k] for k in rows if k in existing],
+    )
+
 @router.get("/", response_model=list[EnvironmentResponse])
-async def list_environments(db: Session = Depends(get_db)):
-    return db.query(Environment).all()
+async def list_environments(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,env_name"),
+    cursor: Optional[str] = Query(None, description="`X-Next-Cursor` from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List registered environments newest first, one keyset page at a time.
+    Pages carry an ETag; polling with If-None-Match gets a 304 until an environment is added.
+    """
+    stmt, names = select_fields(Environment, EnvironmentResponse, fields, ENVIRONMENT_KEY)
+    try:
+        stmt = keyset_page(stmt, ENVIRONMENT_KEY, cursor, limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    async def produce():
+        rows, next_cursor = split_page((await db.execute(stmt)).mappings().all(), ("id",), limit)
+        return page_response(request, response, rows, names, next_cursor, partial=fields is not None)
+
+    version = tuple((await db.execute(select(func.count(), func.max(Environment.id)))).one())
+    return await response_cache.respond(request, CACHE_NAMESPACE, version, produce, response)
+
+@router.get("/export")
+async def export_environments(db: AsyncSession = Depends(get_async_db)):
+    """
+    Stream every environment as NDJSON, oldest first. Rows are read through a
+    server-side cursor and written as they arrive, whatever the table size.
+    """
+    stmt = select(*Environment.__table__.columns).order_by(Environment.id)
+    return ndjson_response(stream_rows(db, stmt, EXPORT_FETCH_ROWS), "environments.ndjson")
+
+@router.post("/import", response_model=ImportResponse)
+async def import_environments(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Load environments from an NDJSON body (the format of /environments/export), one
+    multi-row INSERT and commit per batch. Rows whose id or name already
+    exists are skipped, so an interrupted import can simply be re-sent.
+    """
+    async def write(batch: list) -> int:
+        inserted = await insert_rows_ignoring_conflicts(db, Environment, [item.model_dump(exclude_none=True) for item in batch])
+        await db.commit()
+        response_cache.invalidate(CACHE_NAMESPACE)
+        return inserted
+
+    return await import_ndjson(request, EnvironmentImport, write)
@@ -1,22 +1,112 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from shared.schemas.experiment_schema import ExperimentCreate, ExperimentResponse
-from shared.models.experiment_model import Experiment
-from backend.fastapi_app.core.db import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.schemas.experiment_schema import BulkCreateResponse, ImportResponse, ExperimentImport, ExperimentCreate, ExperimentBulkCreate, ExperimentResponse
+from shared.models.experiment_model import Environment, Experiment
+from shared.utils.ndjson import EXPORT_FETCH_ROWS, import_ndjson, ndjson_response
+from shared.utils.pagination import InvalidCursorError, keyset_page, page_response, select_fields, split_page
+from backend.fastapi_app.core.db import (
+    bulk_insert_ignoring_conflicts,
+    get_async_db,
+    insert_rows_ignoring_conflicts,
+    stream_rows,
+)
 
 router = APIRouter(prefix="/experiments", tags=["Experiments"])
 
+# Listing order: newest first. Ids are assigned in creation order, and unlike
+# created_at (second resolution on SQLite) they never tie.
+EXPERIMENT_KEY = (Experiment.id,)
+
 @router.post("/", response_model=ExperimentResponse)
-async def create_experiment(payload: ExperimentCreate, db: Session = Depends(get_db)):
-    existing = db.query(Experiment).filter(Experiment.name == payload.name).first()
+async def create_experiment(payload: ExperimentCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await db.scalar(select(Experiment).where(Experiment.name == payload.name).limit(1))
     if existing:
         raise HTTPException(status_code=400, detail="Experiment name already exists")
-    experiment = Experiment(name=payload.name, algo=payload.algo)
+    experiment = Experiment(name=payload.name, algo=payload.algo, environment_id=payload.environment_id)
     db.add(experiment)
-    db.commit()
-    db.refresh(experiment)
+    await db.commit()
+    await db.refresh(experiment)
     return experiment
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def create_experiments_bulk(payload: ExperimentBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Register many experiments in one transaction with a single multi-row INSERT.
+    Names that already exist are left untouched and reported under `existing`;
+    repeated names within the payload keep their first entry. Unknown
+    environment ids reject the whole request with a 400.
+    """
+    rows = {}
+    for item in payload.experiments:
+        rows.setdefault(item.name, {"name": item.name, "algo": item.algo, "environment_id": item.environment_id})
+
+    environment_ids = {row["environment_id"] for row in rows.values() if row["environment_id"] is not None}
+    if environment_ids:
+        found = set(await db.scalars(select(Environment.id).where(Environment.id.in_(environment_ids))))
+        missing = sorted(environment_ids - found)
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Unknown environment_id: {', '.join(map(str, missing))}")
+    created, existing = await bulk_insert_ignoring_conflicts(db, Experiment, list(rows.values()), "name")
+    await db.commit()
+    return BulkCreateResponse(
+        created=[created[k] for k in rows if k in created],
+        existing=[existing[k] for k in rows if k in existing],
+    )
+
 @router.get("/", response_model=list[ExperimentResponse])
-async def list_experiments(db: Session = Depends(get_db)):
-    return db.query(Experiment).all()
+async def list_experiments(
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None),
+    algo: Optional[str] = Query(None),
+    environment_id: Optional[int] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,name"),
+    cursor: Optional[str] = Query(None, description="`X-Next-Cursor` from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List experiments newest first, one keyset page at a time.
+    Each filter has a matching (status, id), (algo, id) or (environment_id, id)
+    index, so a page filtered on one of them costs one index range scan however
+    many experiments exist.
+    """
+    stmt, names = select_fields(Experiment, ExperimentResponse, fields, EXPERIMENT_KEY)
+    if status is not None:
+        stmt = stmt.where(Experiment.status == status)
+    if algo is not None:
+        stmt = stmt.where(Experiment.algo == algo)
+    if environment_id is not None:
+        stmt = stmt.where(Experiment.environment_id == environment_id)
+    try:
+        stmt = keyset_page(stmt, EXPERIMENT_KEY, cursor, limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    rows, next_cursor = split_page((await db.execute(stmt)).mappings().all(), ("id",), limit)
+    return page_response(request, response, rows, names, next_cursor, partial=fields is not None)
+
+@router.get("/export")
+async def export_experiments(db: AsyncSession = Depends(get_async_db)):
+    """
+    Stream every experiment as NDJSON, oldest first. Rows are read through a
+    server-side cursor and written as they arrive, whatever the table size.
+    """
+    stmt = select(*Experiment.__table__.columns).order_by(Experiment.id)
+    return ndjson_response(stream_rows(db, stmt, EXPORT_FETCH_ROWS), "experiments.ndjson")
+
+@router.post("/import", response_model=ImportResponse)
+async def import_experiments(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Load experiments from an NDJSON body (the format of /experiments/export), one
+    multi-row INSERT and commit per batch. Rows whose id or name already
+    exists are skipped, so an interrupted import can simply be re-sent.
+    """
+    async def write(batch: list) -> int:
+        inserted = await insert_rows_ignoring_conflicts(db, Experiment, [item.model_dump(exclude_none=True) for item in batch])
+        await db.commit()
+        return inserted
+
+    return await import_ndjson(request, ExperimentImport, write)
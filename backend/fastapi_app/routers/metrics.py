@@ -1,10 +1,12 @@
 # backend/fastapi_app/routers/metrics.py
 from fastapi import APIRouter, Depends
 from prometheus_client import Gauge, generate_latest, CONTENT_TYPE_LATEST
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from ..core.db import get_db
 from ..core.logging_config import logger
+from ..services.executor import get_executor
 
 router = APIRouter(prefix="/metrics", tags=["Observability"])
 
@@ -20,6 +22,7 @@ rl_avg_benchmark_latency_ms.set(24.56)
 
 logger.info("Observability & Persistence initialized.")
 
+
 @router.get("/", response_class=Response)
 async def get_metrics(db: Session = Depends(get_db)):
     """
@@ -28,6 +31,11 @@ async def get_metrics(db: Session = Depends(get_db)):
     """
     try:
         logger.info("Serving metrics endpoint")
+        try:
+            # Sample broker depth for every queue (resimhub_queue_depth gauge)
+            await run_in_threadpool(get_executor().sample_queue_depths)
+        except Exception as e:
+            logger.warning("Queue depth unavailable", error=str(e))
         metrics_data = generate_latest()
         return Response(content=metrics_data, media_type=CONTENT_TYPE_LATEST)
     except Exception as e:
@@ -1,55 +1,138 @@
 import json
 import asyncio
-from fastapi import APIRouter, Request
+import uuid
+from contextlib import aclosing
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from celery.result import AsyncResult
-from backend.fastapi_app.services.orchestrator import run_training_task, celery_app
-from backend.fastapi_app.services.progress_broadcast import ProgressBroadcastService
-from shared.schemas.orchestrator_schema import TaskQueueResponse, TaskStatusResponse, TrainingRequest
+from backend.fastapi_app.core.config import settings
+from backend.fastapi_app.services.executor import get_executor
+from backend.fastapi_app.services.progress_broadcast import ProgressMultiplexer, is_terminal_event
+from backend.fastapi_app.services.task_registry import InvalidCursorError
+from backend.fastapi_app.services.admission_control import AdmissionRejected
+from shared.schemas.orchestrator_schema import (
+    BulkTaskStatusRequest,
+    BulkTaskStatusResponse,
+    TaskCancelResponse,
+    TaskListResponse,
+    TaskQueueResponse,
+    TaskRecordExport,
+    TaskStatusResponse,
+    TrainingRequest,
+)
+from shared.schemas.experiment_schema import ImportResponse
 from shared.utils.logger import get_logger
+from shared.utils.ndjson import EXPORT_FETCH_ROWS, import_ndjson, ndjson_response
 
 router = APIRouter(prefix="/orchestrate", tags=["Orchestration"])
 log = get_logger("OrchestratorRouter")
 
-broadcast_service = ProgressBroadcastService()
+# Celery + Redis or the in-process pool, per settings.system.executor
+executor = get_executor()
+broadcast_service = executor.progress
 
-# Connect the broadcast service to Redis
+# Connect the broadcast service (and start local workers)
 @router.on_event("startup")
 async def startup_event():
-    await broadcast_service.connect()
+    await executor.start()
+
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    await executor.close()
 
 
 # -----------------------------
 # 🧠 Training Orchestration
 # -----------------------------
 @router.post("/train", response_model=TaskQueueResponse)
-async def orchestrate_training(payload: TrainingRequest):
+async def orchestrate_training(
+    payload: TrainingRequest,
+    request: Request,
+    client_id: Optional[str] = Header(None, alias="X-Client-ID"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=200),
+):
     """
-    Queue a new training job asynchronously via Celery.
+    Queue a new training job asynchronously on the configured executor.
+    Repeating a request (same Idempotency-Key, or the same payload while the
+    first task is still in flight) returns the existing task with status "duplicate".
+    Returns 429 with Retry-After when the training queue or the client's
+    in-flight tasks are over the limits in Settings.admission.
     """
+    max_priority = settings.celery.max_priority
+    if payload.priority is not None and payload.priority > max_priority:
+        raise HTTPException(status_code=422, detail=f"priority must be between 0 and {max_priority}")
+
+    client_id = client_id or (request.client.host if request.client else "anonymous")
     log.info(
-        f"Queuing training task: experiment={payload.experiment_id}, env={payload.env_name}, algo={payload.algo}"
+        f"Queuing training task: experiment={payload.experiment_id}, env={payload.env_name}, "
+        f"algo={payload.algo}, client={client_id}"
     )
-    task = run_training_task.delay(payload.experiment_id, payload.env_name, payload.algo)
-    return TaskQueueResponse(task_id=task.id, status="queued")
+    task_id = str(uuid.uuid4())
+    try:
+        submitted_id = await run_in_threadpool(
+            executor.submit_training,
+            payload.experiment_id,
+            payload.env_name,
+            payload.algo,
+            payload.priority,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+            task_id=task_id,
+        )
+    except AdmissionRejected as exc:
+        raise HTTPException(status_code=429, detail=exc.detail, headers={"Retry-After": str(exc.retry_after)})
+    return TaskQueueResponse(task_id=submitted_id, status="queued" if submitted_id == task_id else "duplicate")
+
+
+# -----------------------------
+# 📦 Task Record Export / Import (NDJSON)
+# -----------------------------
+@router.get("/tasks/export")
+async def export_tasks():
+    """
+    Stream every task record as NDJSON: live tasks newest first, then the
+    archive. Records are fetched one batch at a time while the response is
+    written; finished tasks carry their result whether archived or not.
+    """
+    return ndjson_response(
+        executor.registry.iter_records(EXPORT_FETCH_ROWS, executor.task_states), "tasks.ndjson"
+    )
+
+
+@router.post("/tasks/import", response_model=ImportResponse)
+async def import_tasks(request: Request):
+    """
+    Load task records (the format of /orchestrate/tasks/export) into the task
+    archive in batches; tasks already archived are replaced. Imported tasks are
+    history only and are never re-queued.
+    """
+    archive = executor.registry.archive
+    if archive is None:
+        raise HTTPException(status_code=501, detail=f"The {executor.name} executor has no task archive")
+
+    async def write(batch: list) -> int:
+        entries = [(item.task_id, item.record, item.result) for item in batch]
+        return await run_in_threadpool(archive.store, entries)
+
+    return await import_ndjson(request, TaskRecordExport, write)
 
 
 # -----------------------------
 # 🔍 Check Task Status (API)
 # -----------------------------
-@router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
-async def get_task_status(task_id: str):
+def _build_task_status(task_id: str, status: str, info) -> dict:
     """
-    Get current status and progress for a given Celery task.
+    Shape a Celery state and its metadata into the task status response.
     """
-    result = AsyncResult(task_id, app=celery_app)
-    response = {"task_id": task_id, "status": result.status}
+    response = {"task_id": task_id, "status": status}
 
-    if result.status == "PENDING":
+    if status == "PENDING":
         response["progress"] = {"current": 0, "total": 1, "percentage": 0}
         response["result"] = None
-    elif result.status == "PROGRESS":
-        meta = result.info or {}
+    elif status == "PROGRESS":
+        meta = info or {}
         current = meta.get("current", 0)
         total = meta.get("total", 1)
         response["progress"] = {
@@ -58,8 +141,8 @@ async def get_task_status(task_id: str):
             "percentage": round((current / total) * 100, 2),
         }
         response["result"] = None
-    elif result.status == "SUCCESS":
-        meta = result.result or {}
+    elif status == "SUCCESS":
+        meta = info or {}
         response["progress"] = {
             "current": meta.get("total", 1),
             "total": meta.get("total", 1),
@@ -69,39 +152,182 @@ async def get_task_status(task_id: str):
     else:
         # FAILURE / RETRY / REVOKED
         response["progress"] = None
-        response["result"] = str(result.info)
+        response["result"] = str(info)
+
+    return response
+
+
+@router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
+async def get_task_status(task_id: str):
+    """
+    Get current status and progress for a given task.
+    """
+    [(status, info)] = await run_in_threadpool(executor.task_states, [task_id])
+    response = _build_task_status(task_id, status, info)
 
     log.info(f"Task {task_id} status: {response['status']}")
     return response
 
 
+# -----------------------------
+# 🛑 Cancel Task
+# -----------------------------
+@router.delete("/tasks/{task_id}", response_model=TaskCancelResponse)
+async def cancel_task(task_id: str):
+    """
+    Cancel a queued or running task.
+    Queued tasks are revoked immediately; running tasks stop at their next epoch boundary.
+    """
+    if not await run_in_threadpool(executor.registry.get, task_id):
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    status = await run_in_threadpool(executor.cancel, task_id)
+    return TaskCancelResponse(task_id=task_id, status=status)
+
+
+# -----------------------------
+# 🔍 Bulk Task Status (API)
+# -----------------------------
+@router.post("/tasks/status", response_model=BulkTaskStatusResponse)
+async def get_bulk_task_status(payload: BulkTaskStatusRequest):
+    """
+    Get status and progress for many tasks with a single result-backend read.
+    """
+    task_ids = list(dict.fromkeys(payload.task_ids))
+    states = await run_in_threadpool(executor.task_states, task_ids)
+    tasks = [
+        _build_task_status(task_id, status, info)
+        for task_id, (status, info) in zip(task_ids, states)
+    ]
+
+    log.info(f"Bulk status lookup for {len(tasks)} tasks")
+    return {"count": len(tasks), "tasks": tasks}
+
+
 # -----------------------------
 # 📡 Stream Task Progress (SSE)
 # -----------------------------
 @router.get("/tasks/stream/{task_id}")
-async def stream_task_progress(request: Request, task_id: str):
+async def stream_task_progress(
+    request: Request,
+    task_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
-    Stream live progress updates from Celery through Redis → FastAPI via SSE.
+    Stream live progress updates from the executor (Redis Streams for Celery) → FastAPI via SSE.
+    Every event carries its stream id, so reconnecting clients (which send Last-Event-ID)
+    replay only what they missed before tailing live updates. All clients in this process
+    share one Redis reader; idle streams get heartbeat comments so disconnects are noticed.
     """
     async def event_stream():
-        async for message in broadcast_service.subscribe(task_id):
-            if await request.is_disconnected():
-                log.info(f"Client disconnected from SSE stream for {task_id}")
-                break
-            yield f"data: {message}\n\n"
-            await asyncio.sleep(0.2)
+        async with aclosing(broadcast_service.subscribe(task_id, last_event_id)) as updates:
+            async for event_id, message in updates:
+                if await request.is_disconnected():
+                    log.info(f"Client disconnected from SSE stream for {task_id}")
+                    break
+                if event_id is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"id: {event_id}\ndata: {message}\n\n"
+                if is_terminal_event(message):
+                    break
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 # -----------------------------
-# 📋 Placeholder: List All Tasks
+# 🔌 Multi-task Progress (WebSocket)
 # -----------------------------
-@router.get("/tasks")
-async def list_all_tasks():
+@router.websocket("/ws/progress")
+async def progress_socket(
+    websocket: WebSocket,
+    interval: Optional[float] = Query(None, ge=0.05, le=60, description="Coalescing window in seconds"),
+):
     """
-    Placeholder endpoint to list all tasks.
+    Watch many tasks over one WebSocket.
+
+    Client → server:  {"action": "subscribe" | "unsubscribe", "task_ids": [...]}
+    Server → client:  {"type": "progress", "updates": [{"task_id", "event_id", "data"}, ...]}
+                      {"type": "subscriptions", "task_ids": [...]}
+                      {"type": "error", "detail": "..."}
+
+    Updates are coalesced per task, so each frame carries only the latest event
+    per task within the interval. At most `progress_ws_max_subscriptions` tasks
+    are watched at once (finished tasks drop out); a subscribe going over the
+    cap is refused with an error frame.
     """
+    await websocket.accept()
+    mux = ProgressMultiplexer(broadcast_service) if interval is None else ProgressMultiplexer(broadcast_service, interval)
+    max_subscriptions = settings.cache.progress_ws_max_subscriptions
+    # Progress batches and replies are written from two tasks; frames must not interleave
+    send_lock = asyncio.Lock()
+
+    async def send(frame: dict):
+        async with send_lock:
+            await websocket.send_json(frame)
+
+    async def send_batches():
+        async for batch in mux.batches():
+            await send({"type": "progress", "updates": batch})
+
+    sender = asyncio.create_task(send_batches())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                action = message["action"]
+                task_ids = [str(tid) for tid in message["task_ids"]]
+            except (ValueError, KeyError, TypeError):
+                await send({"type": "error", "detail": "Expected {\"action\": ..., \"task_ids\": [...]}"})
+                continue
 
-    
-    return {"message": "Feature coming soon"}
+            if action == "subscribe":
+                watched = len(set(mux.task_ids) | set(task_ids))
+                if watched > max_subscriptions:
+                    await send({
+                        "type": "error",
+                        "detail": f"Subscription limit exceeded: at most {max_subscriptions} tasks per connection",
+                    })
+                    continue
+                mux.subscribe(task_ids)
+            elif action == "unsubscribe":
+                mux.unsubscribe(task_ids)
+            else:
+                await send({"type": "error", "detail": f"Unknown action: {action}"})
+                continue
+            await send({"type": "subscriptions", "task_ids": mux.task_ids})
+    except WebSocketDisconnect:
+        log.info(f"WebSocket progress client disconnected ({len(mux.task_ids)} subscriptions)")
+    finally:
+        sender.cancel()
+        await mux.close()
+
+
+# -----------------------------
+# 📋 List Tasks (indexed, paginated)
+# -----------------------------
+@router.get("/tasks", response_model=TaskListResponse)
+async def list_all_tasks(
+    status: Optional[str] = Query(None, description="Filter by task status, e.g. RUNNING, SUCCESS"),
+    experiment_id: Optional[int] = Query(None),
+    env: Optional[str] = Query(None),
+    algo: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    List tracked tasks, newest first, using the Redis task indexes.
+    Each page costs a bounded number of Redis round trips independent of the total task count.
+    """
+    try:
+        page = await run_in_threadpool(
+            executor.registry.list_tasks,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            experiment_id=experiment_id,
+            env=env,
+            algo=algo,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return page
@@ -1,13 +1,19 @@
 from fastapi import APIRouter
-from backend.fastapi_app.services.orchestrator import celery_app
+from fastapi.concurrency import run_in_threadpool
+from backend.fastapi_app.services.executor import get_executor
 
 router = APIRouter(prefix="/status", tags=["Task Status"])
 
+executor = get_executor()
+
 @router.get("/{task_id}")
 async def get_status(task_id: str):
-    task_result = celery_app.AsyncResult(task_id)
+    # The executor answers for either backend (Celery falls back to the task
+    # archive once the result has been compacted); lookups block, so they run
+    # off the event loop
+    state, result = (await run_in_threadpool(executor.task_states, [task_id]))[0]
     return {
         "task_id": task_id,
-        "state": task_result.state,
-        "result": task_result.result
+        "state": state,
+        "result": result
     }
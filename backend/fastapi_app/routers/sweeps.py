@@ -0,0 +1,62 @@
+# backend/fastapi_app/routers/sweeps.py
+from fastapi import APIRouter, HTTPException
+from backend.fastapi_app.core.config import settings
+from backend.fastapi_app.services.executor import get_executor
+from backend.fastapi_app.services.sweep_scheduler import SweepScheduler, expand_grid
+from shared.schemas.sweep_schema import SweepRequest, SweepResponse
+from shared.utils.logger import get_logger
+
+router = APIRouter(prefix="/orchestrate/sweeps", tags=["Sweeps"])
+log = get_logger("SweepRouter")
+
+executor = get_executor()
+sweep_scheduler = SweepScheduler(
+    executor.progress, submit=executor.submit_training, stop=executor.cancel, store=executor.sweep_store
+)
+
+
+@router.on_event("startup")
+async def startup_event():
+    # Runs after the orchestrator router started the executor. Sweeps left by
+    # a dead process are taken over once their lease expires.
+    sweep_scheduler.watch()
+
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    await sweep_scheduler.close()
+
+
+@router.post("/", response_model=SweepResponse)
+async def start_sweep(payload: SweepRequest):
+    """
+    Launch a successive-halving sweep: one training task per config, with
+    trials below each rung's top 1/reduction_factor stopped early.
+    """
+    max_priority = settings.celery.max_priority
+    if payload.priority is not None and payload.priority > max_priority:
+        raise HTTPException(status_code=422, detail=f"priority must be between 0 and {max_priority}")
+
+    configs = payload.configs or expand_grid(payload.grid)
+    log.info(f"Starting sweep over {len(configs)} configs for experiment={payload.experiment_id}")
+    return await sweep_scheduler.start(
+        payload.experiment_id,
+        payload.env_name,
+        payload.algo,
+        configs,
+        min_epochs=payload.min_epochs,
+        max_epochs=payload.max_epochs,
+        eta=payload.reduction_factor,
+        priority=payload.priority,
+    )
+
+
+@router.get("/{sweep_id}", response_model=SweepResponse)
+async def get_sweep(sweep_id: str):
+    """
+    Rung status for a sweep: per-rung scores, promotions and trial states.
+    """
+    sweep = await sweep_scheduler.get(sweep_id)
+    if not sweep:
+        raise HTTPException(status_code=404, detail=f"Sweep {sweep_id} not found")
+    return sweep
@@ -0,0 +1,101 @@
+# backend/fastapi_app/services/admission_control.py
+import time
+from prometheus_client import Counter, Gauge
+from backend.fastapi_app.core.config import AdmissionConfig
+from shared.utils.logger import get_logger
+
+log = get_logger("AdmissionControl")
+
+INFLIGHT_KEY = "resimhub:admission:inflight"
+
+queue_depth_gauge = Gauge("resimhub_queue_depth", "Messages waiting in the Celery broker", ["queue"])
+admission_rejected_total = Counter(
+    "resimhub_admission_rejected_total", "Task submissions rejected by admission control", ["reason"]
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a submission would exceed a queue or client limit."""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Backpressure for task submission.
+
+    Before a task is enqueued, the broker depth of its queue (the Redis lists
+    kombu keeps per priority level) and the submitting client's in-flight
+    count are checked against the limits in Settings.admission.
+
+    In-flight tasks are tracked per client in a sorted set scored by admission
+    time: resimhub:admission:inflight:{client_id}. Tasks leave it when they
+    finish; entries older than `inflight_ttl_seconds` are pruned so lost tasks
+    cannot lock a client out forever.
+    """
+
+    def __init__(self, broker_client, state_client, config: AdmissionConfig, priority_steps: list, sep: str = ":"):
+        self.broker = broker_client
+        self.redis = state_client
+        self.config = config
+        self.priority_steps = priority_steps
+        self.sep = sep
+
+    @staticmethod
+    def inflight_key(client_id: str) -> str:
+        return f"{INFLIGHT_KEY}:{client_id}"
+
+    def _priority_keys(self, queue: str) -> list:
+        # Same naming as kombu's Redis transport: priority 0 uses the bare queue name
+        return [f"{queue}{self.sep}{pri}" if pri else queue for pri in self.priority_steps]
+
+    def queue_depth(self, queue: str) -> int:
+        """Messages waiting in the broker for `queue`; also updates the depth gauge."""
+        pipe = self.broker.pipeline(transaction=False)
+        for key in self._priority_keys(queue):
+            pipe.llen(key)
+        depth = sum(pipe.execute())
+        queue_depth_gauge.labels(queue=queue).set(depth)
+        return depth
+
+    def admit(self, queue: str, client_id: str, task_id: str):
+        """
+        Reserve an in-flight slot for `task_id`, or raise AdmissionRejected.
+        The client slot is taken and counted in one transaction, so concurrent
+        submissions from one client cannot overshoot the limit.
+        """
+        if not self.config.enabled:
+            return
+
+        depth = self.queue_depth(queue)
+        if depth >= self.config.max_queue_depth:
+            admission_rejected_total.labels(reason="queue_depth").inc()
+            log.warning(f"Rejecting submission to {queue}: {depth} messages waiting")
+            raise AdmissionRejected(f"Queue '{queue}' is full ({depth} tasks waiting)", self.config.retry_after_seconds)
+
+        key = self.inflight_key(client_id)
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(key, "-inf", now - self.config.inflight_ttl_seconds)
+        pipe.zadd(key, {task_id: now})
+        pipe.zcard(key)
+        pipe.expire(key, self.config.inflight_ttl_seconds)
+        inflight = pipe.execute()[2]
+
+        if inflight > self.config.max_inflight_per_client:
+            self.redis.zrem(key, task_id)
+            admission_rejected_total.labels(reason="client_inflight").inc()
+            log.warning(f"Rejecting submission from {client_id}: {inflight - 1} tasks in flight")
+            raise AdmissionRejected(
+                f"Too many tasks in flight for client '{client_id}' (limit {self.config.max_inflight_per_client})",
+                self.config.retry_after_seconds,
+            )
+
+    def release(self, client_id: str, task_id: str):
+        self.redis.zrem(self.inflight_key(client_id), task_id)
+
+    def inflight(self, client_id: str) -> int:
+        return self.redis.zcard(self.inflight_key(client_id))
@@ -1,21 +1,105 @@
 import re
+import threading
 import pandas as pd
 from pathlib import Path
+from sqlalchemy import func, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from backend.fastapi_app.core.config import settings
+from backend.fastapi_app.core.db import SessionLocal, engine
+from backend.fastapi_app.services.benchmark_service import BenchmarkService
+from backend.fastapi_app.services.run_archive import RunArchive
+from shared.models.experiment_model import EpochMetric, TrainingRun
 from shared.utils.logger import get_logger
 
 log = get_logger("AnalyticsService")
 
 LOG_FILE = Path("logs/resimhub.log")
 
+_metrics_tables_ready = False
+
+# Parquet history of finished runs and benchmarks, filled by the periodic export
+run_archive = RunArchive(
+    settings.retention.parquet_dir,
+    SessionLocal,
+    row_group_size=settings.retention.parquet_row_group_size,
+    benchmark_source=BenchmarkService.results_since,
+)
+
+
+def metrics_tables_exist() -> bool:
+    """Whether training_runs / epoch_metrics exist (checked until they do)."""
+    global _metrics_tables_ready
+    if not _metrics_tables_ready:
+        try:
+            inspector = inspect(engine)
+            _metrics_tables_ready = all(
+                inspector.has_table(t) for t in (TrainingRun.__tablename__, EpochMetric.__tablename__)
+            )
+        except SQLAlchemyError as e:
+            log.warning(f"Metrics tables unavailable: {e}")
+    return _metrics_tables_ready
+
+
+class _LogCompletionOffset:
+    """
+    Offset just past the last "Experiment N completed" line of the log. Each
+    call reads only what was appended since the previous one; request and
+    epoch lines move the file size but not this marker.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._inode = None
+        self._offset = 0
+        self._last = 0
+
+    def marker(self) -> str:
+        with self._lock:
+            stat = self.path.stat()
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                # New or rotated file: rescan from the start
+                self._inode, self._offset, self._last = stat.st_ino, 0, 0
+            with self.path.open("rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partially written; read it next time
+                    self._offset += len(line)
+                    if b" completed" in line and AnalyticsService.final_accuracy_pattern.search(
+                        line.decode(errors="replace")
+                    ):
+                        self._last = self._offset
+            return f"{self._inode}:{self._last}"
+
 
 class AnalyticsService:
     reward_pattern = re.compile(
-        r"Experiment (\d+)\s*\| Epoch (\d+)/(\d+)\s*\| Reward:\s*([\d\.]+)"
+        r"Experiment (\d+)\s*\| Epoch (\d+)/(\d+)\s*\| Reward:\s*([\d\.]+)(?:\s*\| Task: (\S+))?"
     )
     final_accuracy_pattern = re.compile(
         r"Experiment (\d+) completed.*Env=([\w\-.]+).*Algo=([\w\-.]+).*Final Accuracy: ([\d\.]+)"
     )
 
+    @staticmethod
+    def experiment_rewards(experiment_id: int):
+        """
+        Per-epoch rewards of an experiment as a DataFrame ['epoch', 'reward'],
+        from the epoch_metrics table, or parsed from the logs for experiments
+        trained before the table existed.
+        """
+        if metrics_tables_exist():
+            with SessionLocal() as db:
+                rows = db.execute(
+                    select(EpochMetric.epoch, EpochMetric.reward)
+                    .where(EpochMetric.experiment_id == experiment_id)
+                    .order_by(EpochMetric.recorded_at, EpochMetric.id)
+                ).all()
+            if rows:
+                # Every run of the experiment; a resumed run overwrote its re-run epochs in place
+                return pd.DataFrame(rows, columns=["epoch", "reward"])
+        return AnalyticsService.parse_experiment_logs(experiment_id)
+
     @staticmethod
     def parse_experiment_logs(experiment_id: int):
         """
@@ -26,18 +110,22 @@ class AnalyticsService:
             log.warning(f"No log file found at {LOG_FILE}")
             return pd.DataFrame(columns=["epoch", "reward"])
 
-        rewards = []
+        rewards = {}
         with LOG_FILE.open("r") as f:
-            for line in f:
+            for number, line in enumerate(f):
                 match = AnalyticsService.reward_pattern.search(line)
                 if match:
                     exp_id = int(match.group(1))
                     epoch = int(match.group(2))
                     reward = float(match.group(4))
                     if exp_id == experiment_id:
-                        rewards.append((epoch, reward))
+                        # A task resumed from a checkpoint logs its re-run epochs again:
+                        # the later line replaces the earlier one. Untagged lines all count.
+                        key = (match.group(5), epoch) if match.group(5) else number
+                        rewards.pop(key, None)
+                        rewards[key] = (epoch, reward)
 
-        df = pd.DataFrame(rewards, columns=["epoch", "reward"])
+        df = pd.DataFrame(list(rewards.values()), columns=["epoch", "reward"])
         return df
 
     @staticmethod
@@ -63,6 +151,52 @@ class AnalyticsService:
 
     @staticmethod
     def list_recent_experiments(limit: int = 5):
+        """
+        Most recent `limit` experiments with a completed run (highest id first),
+        from the training_runs table, else detected from the logs.
+        """
+        if metrics_tables_exist():
+            with SessionLocal() as db:
+                runs = db.execute(
+                    select(TrainingRun.experiment_id, TrainingRun.env, TrainingRun.algo, TrainingRun.final_accuracy)
+                    .where(TrainingRun.status == "SUCCESS")
+                    .order_by(TrainingRun.experiment_id.desc(), TrainingRun.completed_at.desc())
+                ).yield_per(500)
+                experiments = {}
+                for exp_id, env, algo, final_accuracy in runs:
+                    if exp_id in experiments:
+                        continue  # an earlier run of an experiment already listed
+                    experiments[exp_id] = {
+                        "experiment_id": exp_id,
+                        "env": env,
+                        "algorithm": algo,
+                        "final_accuracy": final_accuracy,
+                    }
+                    if len(experiments) == limit:
+                        break
+            if experiments:
+                return list(experiments.values())
+        return AnalyticsService.recent_experiments_from_logs(limit)
+
+    @staticmethod
+    def recent_experiments_version() -> str:
+        """
+        Cheap marker that changes with list_recent_experiments: the newest
+        training run when the table has a successful one, else the log offset
+        of the last completion line.
+        """
+        if metrics_tables_exist():
+            with SessionLocal() as db:
+                latest = db.execute(select(func.max(TrainingRun.id), func.max(TrainingRun.completed_at))).one()
+                succeeded = db.scalar(select(TrainingRun.id).where(TrainingRun.status == "SUCCESS").limit(1))
+            if succeeded is not None:
+                return f"db:{latest[0]}:{latest[1]}"
+        if LOG_FILE.exists():
+            return f"log:{_log_completions.marker()}"
+        return "empty"
+
+    @staticmethod
+    def recent_experiments_from_logs(limit: int = 5):
         """
         Detect all experiments in logs, return most recent `limit` experiments.
         """
@@ -89,3 +223,6 @@ class AnalyticsService:
         recent_experiments = sorted(experiments.values(), key=lambda x: x["experiment_id"], reverse=True)
         return recent_experiments[:limit]
 
+
+_log_completions = _LogCompletionOffset(LOG_FILE)
+
@@ -0,0 +1,171 @@
+# backend/fastapi_app/services/autoscaler.py
+import math
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from prometheus_client import Counter, Gauge
+from shared.utils.logger import get_logger
+
+log = get_logger("Autoscaler")
+
+autoscaler_workers = Gauge("resimhub_autoscaler_workers", "Worker processes currently serving a queue", ["queue"])
+autoscaler_desired_workers = Gauge(
+    "resimhub_autoscaler_desired_workers", "Worker processes the autoscaler wants for a queue", ["queue"]
+)
+autoscaler_queue_wait = Gauge(
+    "resimhub_autoscaler_queue_wait_seconds", "Age of the longest-waiting queued task", ["queue"]
+)
+autoscaler_decisions_total = Counter(
+    "resimhub_autoscaler_decisions_total", "Scaling decisions taken", ["queue", "direction", "reason"]
+)
+
+
+@dataclass
+class ScalingPolicy:
+    """
+    Worker-count rules for one queue.
+
+      - Grow straight to one process per `target_depth_per_worker` waiting messages.
+      - Otherwise grow by one while the oldest queued task has waited past `max_wait_seconds`.
+      - Shrink by one when nothing is waiting, at most once per `cooldown_seconds`.
+
+    Waiting work below the target keeps the pool as it is. Shrinking happens
+    once the queue is drained even if workers are still busy; the removed
+    worker gets a warm shutdown and finishes its running tasks before exiting.
+    """
+
+    min_workers: int
+    max_workers: int
+    target_depth_per_worker: int
+    max_wait_seconds: float
+    cooldown_seconds: float
+
+    def desired(self, current: int, depth: int, oldest_wait: float, since_last_change: float) -> tuple:
+        """Return (desired worker count, reason)."""
+        if current < self.min_workers:
+            return self.min_workers, "min_workers"
+        if current > self.max_workers:
+            return self.max_workers, "max_workers"
+
+        needed = math.ceil(depth / max(1, self.target_depth_per_worker))
+        if needed > current and current < self.max_workers:
+            return min(needed, self.max_workers), "queue_depth"
+        if oldest_wait > self.max_wait_seconds and current < self.max_workers:
+            return current + 1, "queue_wait"
+        if depth == 0 and current > self.min_workers and since_last_change >= self.cooldown_seconds:
+            return current - 1, "idle"
+        return current, "steady"
+
+
+class LocalWorkerPool:
+    """
+    Celery worker processes for one queue on this host.
+
+    Worker `i` is started from `argv_factory(queue, i)`; shrinking sends
+    SIGTERM (Celery's warm shutdown: running tasks finish, nothing new is
+    taken) to the highest-numbered worker, so worker 0 always stays.
+    """
+
+    def __init__(self, queue: str, argv_factory: Callable[[str, int], list]):
+        self.queue = queue
+        self.argv_factory = argv_factory
+        self._procs = {}  # {index: Popen}
+        self._stopping = []  # draining after SIGTERM, reaped once they exit
+
+    @property
+    def size(self) -> int:
+        self._stopping = [proc for proc in self._stopping if proc.poll() is None]
+        for index, proc in list(self._procs.items()):
+            if proc.poll() is not None:
+                log.warning(f"Worker {self.queue}-{index} exited with code {proc.returncode}")
+                del self._procs[index]
+        return len(self._procs)
+
+    def scale_to(self, count: int):
+        current = self.size
+        for _ in range(current, count):
+            index = next(i for i in range(count) if i not in self._procs)
+            self._procs[index] = subprocess.Popen(self.argv_factory(self.queue, index))
+            log.info(f"Started worker {self.queue}-{index} (pid {self._procs[index].pid})")
+        for _ in range(count, current):
+            index = max(self._procs)
+            proc = self._procs.pop(index)
+            proc.send_signal(signal.SIGTERM)
+            self._stopping.append(proc)
+            log.info(f"Stopping worker {self.queue}-{index} (pid {proc.pid})")
+
+    def stop_all(self, timeout: Optional[float] = None):
+        procs = list(self._procs.values())
+        self._procs.clear()
+        for proc in procs:
+            proc.send_signal(signal.SIGTERM)
+        procs.extend(self._stopping)
+        self._stopping = []
+        for proc in procs:
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+class Autoscaler:
+    """
+    Periodically resizes worker pools from queue load.
+
+    `sample(queue)` returns (broker depth, oldest queued task wait in seconds).
+    Current and desired pool sizes and every decision are exported as
+    Prometheus metrics, which can also feed an HPA through a custom-metrics adapter.
+    """
+
+    def __init__(
+        self,
+        pools: dict,
+        policies: dict,
+        sample: Callable[[str], tuple],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.pools = pools
+        self.policies = policies
+        self.sample = sample
+        self.clock = clock
+        self._last_change = {queue: clock() for queue in pools}
+
+    def step(self) -> dict:
+        """Run one control round; returns {queue: (previous, desired, reason)}."""
+        decisions = {}
+        now = self.clock()
+        for queue, pool in self.pools.items():
+            try:
+                depth, oldest_wait = self.sample(queue)
+            except Exception as e:
+                log.warning(f"Load sample for {queue} failed; keeping pool size: {e}")
+                continue
+
+            current = pool.size
+            desired, reason = self.policies[queue].desired(
+                current, depth, oldest_wait, now - self._last_change[queue]
+            )
+            autoscaler_queue_wait.labels(queue=queue).set(oldest_wait)
+            autoscaler_desired_workers.labels(queue=queue).set(desired)
+
+            if desired != current:
+                direction = "up" if desired > current else "down"
+                autoscaler_decisions_total.labels(queue=queue, direction=direction, reason=reason).inc()
+                log.info(
+                    f"Scaling {queue} {direction}: {current} → {desired} workers "
+                    f"({reason}; depth={depth}, oldest_wait={oldest_wait:.1f}s)"
+                )
+                pool.scale_to(desired)
+                self._last_change[queue] = now
+
+            autoscaler_workers.labels(queue=queue).set(pool.size)
+            decisions[queue] = (current, desired, reason)
+        return decisions
+
+    def run(self, interval_seconds: float, stop: threading.Event):
+        while not stop.is_set():
+            self.step()
+            stop.wait(interval_seconds)
@@ -1,5 +1,6 @@
 
 # backend/fastapi_app/services/benchmark_service.py
+import hashlib
 import uuid
 from pathlib import Path
 from datetime import datetime
@@ -7,7 +8,11 @@ import random
 import pandas as pd
 import redis
 import json
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from backend.fastapi_app.core.config import CacheConfig
+from shared.models.model_registry_model import Model
 from shared.utils.logger import get_logger
 
 log = get_logger("BenchmarkService")
@@ -18,8 +23,20 @@ cache_config = CacheConfig()
 # Storage paths
 UPLOAD_DIR = Path("storage/models")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
-# Lightweight Redis metadata store (optional - used if Redis available)
+# Change marker for stored benchmark results, bumped on every write
+RESULTS_VERSION_KEY = "benchmark:results:version"
+RESULTS_VERSION_FILE = UPLOAD_DIR / ".results_version"
+# Identities (model:env:evaluated_at) of every result in benchmark:recent_results, for import dedupe
+STORED_RESULTS_KEY = "benchmark:results:stored"
+
+
+def _result_id(result: dict) -> str:
+    return f"{result['model_id']}:{result['env_name']}:{result.get('evaluated_at', '')}"
+
+
+# Lightweight Redis store for benchmark results (optional - used if Redis available)
 try:
     base_url = cache_config.url
     if not base_url.endswith("/"):
@@ -35,35 +52,116 @@ except Exception:
 
 class BenchmarkService:
     @staticmethod
-    def save_model_file(upload_file) -> str:
+    def _store_upload(source, out_path: Path) -> tuple:
+        """Copy an upload to `out_path` in chunks; returns (size in bytes, sha256 hex digest)."""
+        digest = hashlib.sha256()
+        size = 0
+        with open(out_path, "wb") as f:
+            while chunk := source.read(UPLOAD_CHUNK_BYTES):
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+        return size, digest.hexdigest()
+
+    @staticmethod
+    def _size_and_digest(path: Path) -> tuple:
+        """(size in bytes, sha256 hex digest) of a stored model file, read in chunks."""
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            while chunk := f.read(UPLOAD_CHUNK_BYTES):
+                digest.update(chunk)
+                size += len(chunk)
+        return size, digest.hexdigest()
+
+    @staticmethod
+    def register_legacy_models(session_factory) -> int:
         """
-        Save uploaded file to storage and return a generated model_id.
+        Register models uploaded before the models table existed, whose metadata
+        lives in `benchmark:meta:*` Redis hashes or `*.meta.json` files. Files
+        are sized and hashed from disk; models already registered or whose file
+        is gone are skipped, so this is safe to run on every startup. Returns how
+        many were registered.
+        """
+        legacy = {}
+        for meta_path in UPLOAD_DIR.glob("*.meta.json"):
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                continue
+            legacy[meta.get("model_id")] = meta
+        if USE_REDIS:
+            for key in redis_client.scan_iter("benchmark:meta:*"):
+                meta = redis_client.hgetall(key)
+                legacy[meta.get("model_id")] = meta
+        legacy.pop(None, None)
+        if not legacy:
+            return 0
+
+        with session_factory() as db:
+            known = set(db.scalars(select(Model.model_id).where(Model.model_id.in_(legacy))))
+            registered = 0
+            for model_id, meta in legacy.items():
+                path = Path(meta.get("path", ""))
+                if model_id in known or not path.is_file():
+                    continue
+                size, sha256 = BenchmarkService._size_and_digest(path)
+                uploaded_at = meta.get("uploaded_at")
+                db.add(Model(
+                    model_id=model_id,
+                    filename=meta.get("filename") or path.name,
+                    path=str(path),
+                    format=(path.suffix.lstrip(".") or "bin").lower(),
+                    size_bytes=size,
+                    sha256=sha256,
+                    uploaded_at=datetime.fromisoformat(uploaded_at) if uploaded_at else datetime.utcnow(),
+                ))
+                registered += 1
+            db.commit()
+        if registered:
+            log.info(f"Registered {registered} models uploaded before the models table")
+        return registered
+
+    @staticmethod
+    async def save_model_file(upload_file, db: AsyncSession):
+        """
+        Save uploaded file to storage, register it in the models table and
+        return (generated model_id, metadata).
         """
         model_id = f"mdl_{uuid.uuid4().hex[:8]}"
         extension = Path(upload_file.filename).suffix or ".bin"
         out_path = UPLOAD_DIR / f"{model_id}{extension}"
 
-        # write the file
-        with open(out_path, "wb") as f:
-            content = upload_file.file.read()
-            f.write(content)
+        try:
+            # write the file off the event loop
+            size, sha256 = await run_in_threadpool(BenchmarkService._store_upload, upload_file.file, out_path)
+
+            model = Model(
+                model_id=model_id,
+                filename=upload_file.filename,
+                path=str(out_path),
+                format=extension.lstrip(".").lower(),
+                size_bytes=size,
+                sha256=sha256,
+                uploaded_at=datetime.utcnow(),
+            )
+            db.add(model)
+            await db.commit()
+        except BaseException:
+            # Never leave a file behind that no model row points to
+            out_path.unlink(missing_ok=True)
+            raise
 
-        uploaded_at = datetime.utcnow().isoformat()
         metadata = {
             "model_id": model_id,
-            "filename": upload_file.filename,
-            "path": str(out_path),
-            "uploaded_at": uploaded_at,
+            "filename": model.filename,
+            "path": model.path,
+            "format": model.format,
+            "size_bytes": size,
+            "sha256": sha256,
+            "uploaded_at": model.uploaded_at.isoformat(),
         }
-
-        if USE_REDIS:
-            redis_client.hset(f"benchmark:meta:{model_id}", mapping=metadata)
-        else:
-            # fallback: write small metadata file
-            meta_path = UPLOAD_DIR / f"{model_id}.meta.json"
-            meta_path.write_text(json.dumps(metadata))
-
-        log.info(f"Model saved: {out_path} (model_id={model_id})")
+        log.info(f"Model saved: {out_path} (model_id={model_id}, {size} bytes)")
         return model_id, metadata
 
     @staticmethod
@@ -97,12 +195,17 @@ class BenchmarkService:
 
         # Store result in Redis for quick lookup (optional)
         if USE_REDIS:
-            redis_client.hset(f"benchmark:result:{model_id}:{env_name}", mapping=result)
-            redis_client.lpush("benchmark:recent_results", json.dumps(result))
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hset(f"benchmark:result:{model_id}:{env_name}", mapping=result)
+            pipe.lpush("benchmark:recent_results", json.dumps(result))
+            pipe.sadd(STORED_RESULTS_KEY, _result_id(result))
+            pipe.incr(RESULTS_VERSION_KEY)
+            pipe.execute()
         else:
             # fallback to file
             out = UPLOAD_DIR / f"{model_id}_{env_name}_result.json"
             out.write_text(json.dumps(result))
+            RESULTS_VERSION_FILE.write_text(uuid.uuid4().hex)
 
         log.info(f"Benchmark simulated for model={model_id} env={env_name}: mean_reward={mean_reward}")
         return result
@@ -124,6 +227,125 @@ class BenchmarkService:
                     continue
             return results
 
+    @staticmethod
+    def results_since(evaluated_from: str = None, chunk: int = 500):
+        """
+        Benchmark results evaluated at or after the ISO timestamp `evaluated_from`
+        (all if None), oldest first. Inclusive, so results stored later with the
+        same timestamp are not missed; callers drop the ones they already have.
+        Reads the Redis list newest-first in chunks and stops at the first older result.
+        """
+        def is_new(r):
+            return not evaluated_from or r.get("evaluated_at", "") >= evaluated_from
+
+        results = []
+        if USE_REDIS:
+            start = 0
+            while True:
+                batch = [json.loads(i) for i in redis_client.lrange("benchmark:recent_results", start, start + chunk - 1)]
+                newer = [r for r in batch if is_new(r)]
+                results.extend(newer)
+                if len(batch) < chunk or len(newer) < len(batch):
+                    break
+                start += chunk
+        else:
+            for p in UPLOAD_DIR.glob("*_result.json"):
+                try:
+                    r = json.loads(p.read_text())
+                except Exception:
+                    continue
+                if is_new(r):
+                    results.append(r)
+        return sorted(results, key=lambda r: r.get("evaluated_at", ""))
+
+    @staticmethod
+    def iter_results(chunk: int = 500):
+        """
+        Every stored benchmark result, oldest first, reading `chunk` at a time.
+        The Redis list is walked from its tail, which new results never shift.
+        """
+        if USE_REDIS:
+            offset = 0
+            while True:
+                items = redis_client.lrange("benchmark:recent_results", -(offset + chunk), -(offset + 1))
+                for item in reversed(items):
+                    yield json.loads(item)
+                if len(items) < chunk:
+                    break
+                offset += chunk
+        else:
+            for p in UPLOAD_DIR.glob("*_result.json"):
+                try:
+                    yield json.loads(p.read_text())
+                except Exception:
+                    continue
+
+    @staticmethod
+    def store_results(results: list) -> int:
+        """
+        Store imported benchmark results (oldest first) as if they had just been
+        run. A result is identified by model, environment and evaluated_at, so
+        re-sending an import adds nothing while every historical run is kept;
+        the per-model/env lookup only moves to a newer result. Returns how many
+        were stored.
+        """
+        if USE_REDIS:
+            ids = [_result_id(result) for result in results]
+            keys = [f"benchmark:result:{result['model_id']}:{result['env_name']}" for result in results]
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.smismember(STORED_RESULTS_KEY, ids)
+            for key in dict.fromkeys(keys):
+                pipe.hget(key, "evaluated_at")
+            stored, *latest = pipe.execute()
+            latest = dict(zip(dict.fromkeys(keys), latest))
+
+            seen = {result_id for result_id, member in zip(ids, stored) if member}
+            # Results written before STORED_RESULTS_KEY existed are still known by their lookup hash
+            seen.update(f"{key.removeprefix('benchmark:result:')}:{at}" for key, at in latest.items() if at)
+            pipe = redis_client.pipeline(transaction=False)
+            inserted = 0
+            for result_id, key, result in zip(ids, keys, results):
+                if result_id in seen:
+                    continue
+                seen.add(result_id)
+                pipe.sadd(STORED_RESULTS_KEY, result_id)
+                pipe.lpush("benchmark:recent_results", json.dumps(result))
+                evaluated_at = result.get("evaluated_at", "")
+                if latest[key] is None or evaluated_at > latest[key]:
+                    latest[key] = evaluated_at
+                    pipe.hset(key, mapping=result)
+                inserted += 1
+            if inserted:
+                pipe.incr(RESULTS_VERSION_KEY)
+                pipe.execute()
+            return inserted
+
+        # File mode keeps only the latest result per model and environment
+        stored = 0
+        for result in results:
+            out = UPLOAD_DIR / f"{result['model_id']}_{result['env_name']}_result.json"
+            try:
+                current = json.loads(out.read_text()).get("evaluated_at", "")
+            except (OSError, ValueError):
+                current = None
+            if current is not None and result.get("evaluated_at", "") <= current:
+                continue
+            out.write_text(json.dumps(result))
+            stored += 1
+        if stored:
+            RESULTS_VERSION_FILE.write_text(uuid.uuid4().hex)
+        return stored
+
+    @staticmethod
+    def results_version() -> str:
+        """Cheap marker that changes whenever a benchmark result is stored."""
+        if USE_REDIS:
+            return f"redis:{redis_client.get(RESULTS_VERSION_KEY) or 0}"
+        try:
+            return f"file:{RESULTS_VERSION_FILE.read_text()}"
+        except FileNotFoundError:
+            return "file:0"
+
     @staticmethod
     def compare_models(model_ids: list, env_name: str = None):
         """
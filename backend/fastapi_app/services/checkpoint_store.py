@@ -0,0 +1,72 @@
+# backend/fastapi_app/services/checkpoint_store.py
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from shared.utils.logger import get_logger
+
+log = get_logger("CheckpointStore")
+
+
+class CheckpointStore:
+    """
+    Local-disk checkpoints for training tasks, one JSON file per task id.
+
+    Writes go to a temporary file that is fsynced and then renamed over the
+    previous checkpoint, so a worker dying mid-write leaves the last complete
+    checkpoint in place.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, task_id: str) -> Path:
+        return self.root / f"{task_id}.json"
+
+    def save(self, task_id: str, epoch: int, rewards: list, rng, extra: Optional[dict] = None):
+        """
+        Persist progress after `epoch` completed epochs.
+        `rng` is the task's random.Random instance; its state is stored so
+        resumed epochs draw the same values as the interrupted run.
+        """
+        version, internal, gauss_next = rng.getstate()
+        state = {
+            "task_id": task_id,
+            "epoch": epoch,
+            "rewards": rewards,
+            "rng_state": [version, list(internal), gauss_next],
+            "saved_at": datetime.utcnow().isoformat(),
+            **(extra or {}),
+        }
+
+        path = self._path(task_id)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        log.debug(f"Checkpoint saved for {task_id} at epoch {epoch}")
+
+    def load(self, task_id: str) -> Optional[dict]:
+        """
+        Return the last checkpoint for a task, with `rng_state` ready for
+        `random.Random.setstate`, or None if there is none (or it is unreadable).
+        """
+        path = self._path(task_id)
+        if not path.exists():
+            return None
+        try:
+            state = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+        version, internal, gauss_next = state["rng_state"]
+        state["rng_state"] = (version, tuple(internal), gauss_next)
+        return state
+
+    def delete(self, task_id: str):
+        self._path(task_id).unlink(missing_ok=True)
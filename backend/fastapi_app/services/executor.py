@@ -0,0 +1,382 @@
+# backend/fastapi_app/services/executor.py
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache, partial
+from typing import Optional
+from backend.fastapi_app.core.config import settings
+from backend.fastapi_app.services import orchestrator
+from backend.fastapi_app.services.admission_control import AdmissionRejected, queue_depth_gauge
+from backend.fastapi_app.services.progress_broadcast import (
+    LocalProgressBroadcaster,
+    ProgressBroadcastService,
+    TERMINAL_STATUSES,
+)
+from backend.fastapi_app.services.sweep_scheduler import LocalSweepStore
+from backend.fastapi_app.services.task_context import TaskCancelled, TaskContext
+from backend.fastapi_app.services.task_dedup import submission_dedupe_key
+from backend.fastapi_app.services.task_registry import LocalTaskRegistry
+from shared.utils.logger import get_logger
+
+log = get_logger("TaskExecutor")
+
+
+class TaskExecutor(ABC):
+    """
+    What the orchestration routers need from a task backend.
+
+      - submit_training / task_states / cancel  (sync; call via run_in_threadpool)
+      - registry  → task table: get(task_id), list_tasks(...)
+      - progress  → publish / subscribe progress events (SSE, WebSocket, sweeps)
+      - sweep_store → async key-value store for sweep state (None: progress.redis)
+
+    Select the backend with `settings.system.executor` ("celery" or "local").
+    """
+
+    name = "base"
+    registry = None
+    progress = None
+    sweep_store = None
+
+    async def start(self):
+        await self.progress.connect()
+
+    async def close(self):
+        await self.progress.close()
+
+    @abstractmethod
+    def submit_training(
+        self,
+        experiment_id: int,
+        env_name: str,
+        algo: str,
+        priority: Optional[int] = None,
+        total_epochs: Optional[int] = None,
+        hyperparams: Optional[dict] = None,
+        sweep_id: Optional[str] = None,
+        client_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        task_id: Optional[str] = None,
+    ) -> str:
+        """
+        Queue a training task and return its id. A duplicate submission returns
+        the id of the task already in flight; compare with `task_id` to tell.
+        Raises AdmissionRejected when the queue or the client is over its limit.
+        """
+
+    @abstractmethod
+    def task_states(self, task_ids: list) -> list:
+        """(status, info) per task id, Celery state names; unknown tasks are PENDING."""
+
+    @abstractmethod
+    def cancel(self, task_id: str) -> str:
+        """REVOKED if the task never ran, CANCELLING while it winds down, else its final status."""
+
+    def sample_queue_depths(self):
+        """Refresh the resimhub_queue_depth gauge."""
+
+
+# -----------------------------
+# Celery + Redis
+# -----------------------------
+class CeleryExecutor(TaskExecutor):
+    """Celery workers behind a Redis broker; the distributed, multi-node backend."""
+
+    name = "celery"
+
+    def __init__(self):
+        self.registry = orchestrator.task_registry
+        self.progress = ProgressBroadcastService()
+
+    def submit_training(self, experiment_id, env_name, algo, priority=None, total_epochs=None,
+                        hyperparams=None, sweep_id=None, client_id=None, idempotency_key=None, task_id=None) -> str:
+        return orchestrator.submit_training_task(
+            experiment_id, env_name, algo, priority,
+            total_epochs=total_epochs,
+            hyperparams=hyperparams,
+            sweep_id=sweep_id,
+            client_id=client_id,
+            idempotency_key=idempotency_key,
+            task_id=task_id,
+        ).id
+
+    def task_states(self, task_ids: list) -> list:
+        return orchestrator.fetch_task_states(task_ids)
+
+    def cancel(self, task_id: str) -> str:
+        return orchestrator.revoke_task(task_id)
+
+    def sample_queue_depths(self):
+        for queue_name in orchestrator.celery_config.worker_concurrency:
+            orchestrator.admission_controller.queue_depth(queue_name)
+
+
+# -----------------------------
+# In-process pool
+# -----------------------------
+class LocalTaskContext(TaskContext):
+    """
+    TaskContext inside a local pool worker: every write is sent to the API
+    process over a manager queue; cancellation flags live in a manager dict.
+    """
+
+    def __init__(self, task_id: str, events, cancel_flags):
+        self.task_id = task_id
+        self.events = events
+        self.cancel_flags = cancel_flags
+
+    def update_state(self, state: str, meta: dict):
+        self.events.put(("state", self.task_id, state, meta))
+
+    def publish(self, meta: dict):
+        self.events.put(("progress", self.task_id, meta))
+
+    def record(self, data: dict):
+        self.events.put(("record", self.task_id, data))
+
+    def cancel_requested(self) -> bool:
+        return bool(self.cancel_flags.get(self.task_id))
+
+
+def _run_local_training(task_id: str, events, cancel_flags, args: tuple, kwargs: dict):
+    """Pool worker entry point (module level so it can be pickled)."""
+    return orchestrator.train_experiment(LocalTaskContext(task_id, events, cancel_flags), *args, **kwargs)
+
+
+class LocalExecutor(TaskExecutor):
+    """
+    Runs training in a local process pool; no broker, no Redis.
+
+    Workers report state, progress and task-table writes over a manager
+    queue that one coroutine drains into the in-memory registry and the
+    LocalProgressBroadcaster (asyncio queues per client). Completions go
+    through the same queue, after everything the task itself sent.
+
+    Meant for local runs, tests and single-node deployments: all state lives
+    in this process, tasks run in submission order (priority is recorded but
+    not used) and preemption and the per-experiment lock are not applied.
+    """
+
+    name = "local"
+
+    def __init__(self, max_workers: int = settings.system.max_workers):
+        self.max_workers = max_workers
+        self.registry = LocalTaskRegistry()
+        self.progress = LocalProgressBroadcaster()
+        self.sweep_store = LocalSweepStore()
+        self._states = {}    # {task_id: (status, info)}
+        self._futures = {}   # {task_id: Future} for tasks not finished yet
+        self._dedupe = {}    # {dedupe key: (task_id, expires_at, released_on_finish)}
+        self._inflight = {}  # {client_id: set(task_id)}
+        # Guards the maps above and the cancel flags: request threads, the event
+        # drainer and pool callbacks all touch them
+        self._lock = threading.Lock()
+        self._pool = None
+
+    async def start(self):
+        if self._pool is not None:
+            return  # router startup hooks can fire more than once
+        await self.progress.connect()
+        # spawn: never fork a process that runs an event loop and threads
+        mp_context = multiprocessing.get_context("spawn")
+        self._manager = mp_context.Manager()
+        self._events = self._manager.Queue()
+        self._cancel_flags = self._manager.dict()
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context)
+        self._drainer = asyncio.create_task(self._drain())
+        log.info(f"Local executor started with {self.max_workers} worker processes")
+
+    async def close(self):
+        if self._pool is None:
+            return
+        # Running tasks stop at their next epoch boundary
+        with self._lock:
+            for task_id in self._futures:
+                self._cancel_flags[task_id] = True
+        await asyncio.to_thread(self._pool.shutdown, wait=True, cancel_futures=True)
+        self._drainer.cancel()
+        while True:
+            try:
+                self._apply(self._events.get_nowait())
+            except queue.Empty:
+                break
+        self._manager.shutdown()
+        self._pool = None
+        await self.progress.close()
+        log.info("Local executor stopped")
+
+    # -----------------------------
+    # Submission
+    # -----------------------------
+    def submit_training(self, experiment_id, env_name, algo, priority=None, total_epochs=None,
+                        hyperparams=None, sweep_id=None, client_id=None, idempotency_key=None, task_id=None) -> str:
+        task_id = task_id or str(uuid.uuid4())
+        with self._lock:
+            if sweep_id is None:
+                key = submission_dedupe_key(
+                    experiment_id, env_name, algo, idempotency_key, client_id,
+                    total_epochs=total_epochs, hyperparams=hyperparams,
+                )
+                existing = self._dedupe.get(key)
+                if existing and existing[1] > time.monotonic():
+                    log.info(f"Duplicate submission for Experiment {experiment_id}; returning task {existing[0]}")
+                    return existing[0]
+                ttl = orchestrator.celery_config.idempotency_ttl_seconds
+                self._dedupe[key] = (task_id, time.monotonic() + ttl, not idempotency_key)
+            if client_id is not None:
+                self._admit(client_id, task_id)
+
+        self.registry.upsert(task_id, {
+            "experiment_id": experiment_id,
+            "algo": algo,
+            "env": env_name,
+            "status": "QUEUED",
+            "priority": priority,
+            "queue": self.name,
+            "client_id": client_id,
+            "sweep_id": sweep_id,
+            "created_at": datetime.utcnow().isoformat(),
+        })
+
+        kwargs = {"hyperparams": hyperparams}
+        if total_epochs is not None:
+            kwargs["total_epochs"] = total_epochs
+        with self._lock:
+            self._states[task_id] = ("PENDING", None)
+            # Registered before the drainer can see the task finish
+            future = self._pool.submit(
+                _run_local_training, task_id, self._events, self._cancel_flags, (experiment_id, env_name, algo), kwargs
+            )
+            self._futures[task_id] = future
+        future.add_done_callback(partial(self._on_done, task_id))
+        return task_id
+
+    def _admit(self, client_id: str, task_id: str):
+        """
+        Admission control against Settings.admission; the pool backlog stands in
+        for broker depth. Called with the lock held.
+        """
+        config = settings.admission
+        if not config.enabled:
+            return
+        waiting = sum(1 for f in self._futures.values() if not f.running() and not f.done())
+        queue_depth_gauge.labels(queue=self.name).set(waiting)
+        if waiting >= config.max_queue_depth:
+            raise AdmissionRejected(f"Queue '{self.name}' is full ({waiting} tasks waiting)", config.retry_after_seconds)
+        inflight = self._inflight.setdefault(client_id, set())
+        if len(inflight) >= config.max_inflight_per_client:
+            raise AdmissionRejected(
+                f"Too many tasks in flight for client '{client_id}' (limit {config.max_inflight_per_client})",
+                config.retry_after_seconds,
+            )
+        inflight.add(task_id)
+
+    # -----------------------------
+    # Status and cancellation
+    # -----------------------------
+    def task_states(self, task_ids: list) -> list:
+        with self._lock:
+            return [self._states.get(task_id, ("PENDING", None)) for task_id in task_ids]
+
+    def cancel(self, task_id: str) -> str:
+        status = self.registry.get(task_id).get("status")
+        if status in TERMINAL_STATUSES:
+            return status
+
+        with self._lock:
+            future = self._futures.get(task_id)
+            # A successful cancel() runs the done callback here, which only queues an event
+            running = future is not None and not future.cancel()
+            if running:
+                self._cancel_flags[task_id] = True
+        if running:
+            log.info(f"Cancellation requested for running task {task_id}")
+            return "CANCELLING"
+
+        # Never started: the done callback (or this, for unknown tasks) records the revocation
+        if future is None:
+            self._events.put(("done", task_id, "REVOKED", None))
+        log.info(f"Task {task_id} revoked")
+        return "REVOKED"
+
+    def sample_queue_depths(self):
+        with self._lock:
+            waiting = sum(1 for f in self._futures.values() if not f.running() and not f.done())
+        queue_depth_gauge.labels(queue=self.name).set(waiting)
+
+    # -----------------------------
+    # Worker events
+    # -----------------------------
+    def _next_event(self):
+        try:
+            return self._events.get(timeout=0.5)
+        except queue.Empty:
+            return None
+
+    async def _drain(self):
+        while True:
+            event = await asyncio.to_thread(self._next_event)
+            if event is not None:
+                self._apply(event)
+
+    def _apply(self, event: tuple):
+        kind, task_id, *payload = event
+        if kind == "record":
+            self.registry.upsert(task_id, payload[0])
+        elif kind == "progress":
+            self.progress.publish_nowait(task_id, payload[0])
+        elif kind == "state":
+            state, meta = payload
+            with self._lock:
+                if self._states.get(task_id, ("PENDING",))[0] not in TERMINAL_STATUSES:
+                    self._states[task_id] = (state, meta)
+        elif kind == "done":
+            self._finish(task_id, *payload)
+
+    def _on_done(self, task_id: str, future):
+        """Pool callback: queue the outcome behind the task's own events."""
+        try:
+            status, info = "SUCCESS", future.result()
+        except (CancelledError, TaskCancelled):
+            status, info = "REVOKED", None
+        except Exception as exc:
+            status, info = "FAILURE", exc
+        self._events.put(("done", task_id, status, info))
+
+    def _finish(self, task_id: str, status: str, info):
+        with self._lock:
+            # A cancelled task already reported REVOKED with its last progress; keep that
+            if not (status == "REVOKED" and self._states.get(task_id, ("PENDING",))[0] == "REVOKED"):
+                self._states[task_id] = (status, info)
+            self._futures.pop(task_id, None)
+            self._cancel_flags.pop(task_id, None)
+
+        record = self.registry.get(task_id)
+        if status != "SUCCESS" and record.get("status") not in TERMINAL_STATUSES:
+            # Never started, or crashed: nobody else writes the final state
+            now = datetime.utcnow().isoformat()
+            self.registry.upsert(task_id, {"status": status, "completed_at": now})
+            self.progress.publish_nowait(task_id, {"status": status, "timestamp": now})
+
+        with self._lock:
+            self._inflight.get(record.get("client_id"), set()).discard(task_id)
+            for key, (owner, _, released_on_finish) in list(self._dedupe.items()):
+                if owner == task_id and released_on_finish:
+                    del self._dedupe[key]
+
+
+@lru_cache(maxsize=None)
+def get_executor() -> TaskExecutor:
+    """The process-wide executor selected by settings.system.executor."""
+    backend = settings.system.executor
+    if backend == "celery":
+        return CeleryExecutor()
+    if backend == "local":
+        return LocalExecutor()
+    raise ValueError(f"Unknown executor backend: {backend!r} (expected 'celery' or 'local')")
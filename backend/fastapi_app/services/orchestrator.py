@@ -1,11 +1,27 @@
 # backend/fastapi_app/services/orchestrator.py
 from celery import Celery
+from celery.signals import task_postrun
+from celery.exceptions import Ignore, Retry
+from kombu import Exchange, Queue
 import redis
 import json
 import time
 import random
+import uuid
 from datetime import datetime
-from backend.fastapi_app.core.config import CacheConfig
+from backend.fastapi_app.core.config import CacheConfig, settings
+from backend.fastapi_app.core.db import SessionLocal, engine
+from backend.fastapi_app.services.task_registry import TaskRegistry, TASK_TABLE_KEY
+from backend.fastapi_app.services.progress_broadcast import progress_stream_key, TERMINAL_STATUSES
+from backend.fastapi_app.services.progress_reporter import ProgressReporter
+from backend.fastapi_app.services.checkpoint_store import CheckpointStore
+from backend.fastapi_app.services.task_control import TaskControl
+from backend.fastapi_app.services.admission_control import AdmissionController
+from backend.fastapi_app.services.task_dedup import TaskDeduplicator, submission_dedupe_key
+from backend.fastapi_app.services.task_context import TaskCancelled, TaskContext
+from backend.fastapi_app.services.task_archive import TaskArchive
+from backend.fastapi_app.services.run_metrics import RunMetricsWriter
+from backend.fastapi_app.services.analytics_service import run_archive
 from shared.utils.logger import get_logger
 
 log = get_logger("TrainingService")
@@ -29,77 +45,527 @@ celery_app = Celery(
     backend=backend_url,
 )
 
+# Queues per workload class: short tests never wait behind multi-minute training jobs
+celery_config = settings.celery
+celery_app.conf.update(
+    task_default_queue=celery_config.default_queue,
+    task_queues=[Queue(name, Exchange(name), routing_key=name) for name in celery_config.worker_concurrency],
+    task_routes={task: {"queue": queue} for task, queue in celery_config.task_routes.items()},
+    task_annotations={
+        task: {"acks_late": True, "reject_on_worker_lost": True}
+        for task, queue in celery_config.task_routes.items()
+        if queue in celery_config.long_running_queues
+    },
+    task_default_priority=celery_config.default_priority,
+    worker_prefetch_multiplier=celery_config.prefetch_multiplier,
+    broker_transport_options={
+        "priority_steps": list(range(celery_config.max_priority + 1)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+        "visibility_timeout": celery_config.visibility_timeout_seconds,
+    },
+    result_expires=settings.retention.result_expires_seconds,
+)
+
+# Finished tasks are moved to the SQL archive before their Redis records expire,
+# and finished runs are appended to the Parquet history for analytics
+celery_app.conf.beat_schedule = {}
+if settings.retention.archive_enabled:
+    celery_app.conf.beat_schedule["archive-finished-tasks"] = {
+        "task": "archive_finished_tasks",
+        "schedule": settings.retention.archive_interval_seconds,
+    }
+if settings.retention.parquet_export_enabled:
+    celery_app.conf.beat_schedule["export-run-archive"] = {
+        "task": "export_run_archive",
+        "schedule": settings.retention.parquet_export_interval_seconds,
+    }
+
+
+def worker_argv(queue: str, index: int = 0) -> list:
+    """
+    Command line for a Celery worker dedicated to one queue, sized from Settings.
+    Long-running queues prefetch a single task per process so idle workers can take new jobs.
+    The first default-queue worker also runs the beat scheduler for periodic archival and export;
+    further workers on one host (`index` > 0, see the autoscaler) get distinct node names.
+    """
+    if queue not in celery_config.worker_concurrency:
+        raise ValueError(f"Unknown queue: {queue}")
+    prefetch = 1 if queue in celery_config.long_running_queues else celery_config.prefetch_multiplier
+    node = queue if index == 0 else f"{queue}-{index}"
+    beat = index == 0 and queue == celery_config.default_queue and bool(celery_app.conf.beat_schedule)
+    return [
+        "celery", "-A", "backend.fastapi_app.services.orchestrator.celery_app", "worker",
+        "--loglevel=info",
+        "-Q", queue,
+        "-n", f"{node}@%h",
+        f"--concurrency={celery_config.worker_concurrency[queue]}",
+        f"--prefetch-multiplier={prefetch}",
+        "-O", "fair",
+    ] + (["--beat"] if beat else [])
+
 # Redis for live progress updates
 redis_client = redis.Redis.from_url(client_url, decode_responses=True)
 
-# Optional: Redis-backed table for tracking tasks (used by /tasks)
-TASK_TABLE_KEY = "resimhub:tasks"
+# SQL history of finished tasks; lookups fall back to it once Redis has let go
+task_archive = TaskArchive(SessionLocal)
+
+# Redis-backed, indexed table for tracking tasks (used by /tasks)
+task_registry = TaskRegistry(
+    redis_client,
+    record_ttl_seconds=settings.retention.result_expires_seconds,
+    archive=task_archive,
+)
+
+# Local checkpoints so interrupted training resumes instead of restarting
+checkpoint_store = CheckpointStore(celery_config.checkpoint_dir)
+
+# Cancellation flags and the waiting set used for priority preemption
+task_control = TaskControl(
+    redis_client,
+    cancel_ttl_seconds=celery_config.cancel_flag_ttl_seconds,
+    stale_after_seconds=celery_config.visibility_timeout_seconds,
+)
+
+# Backpressure for client submissions: broker queue depth and per-client in-flight limits
+admission_controller = AdmissionController(
+    redis.Redis.from_url(broker_url),
+    redis_client,
+    settings.admission,
+    priority_steps=celery_app.conf.broker_transport_options["priority_steps"],
+    sep=celery_app.conf.broker_transport_options["sep"],
+)
+
+# Idempotent submissions and the per-experiment training lock
+task_dedup = TaskDeduplicator(redis_client)
 
 
 def _sync_task_to_db(task_id: str, data: dict):
     """
-    Sync or update task metadata in Redis.
+    Sync or update task metadata in Redis, keeping the listing indexes current.
     (Later can be extended to PostgreSQL or SQLAlchemy model)
     """
-    existing = redis_client.hgetall(f"{TASK_TABLE_KEY}:{task_id}") or {}
-    existing.update(data)
-    redis_client.hset(f"{TASK_TABLE_KEY}:{task_id}", mapping=existing)
+    task_registry.upsert(task_id, data)
 
 
-@celery_app.task(bind=True, name="run_training_task")
-def run_training_task(self, experiment_id: int, env_name: str, algo: str):
+def _publish_progress(task_id: str, meta: dict):
     """
-    Simulate asynchronous reinforcement learning training job.
-    Logs actual reward values per epoch for analytics integration.
-    Broadcasts updates over Redis channels for progress monitoring.
+    Append a progress event to the task's capped Redis Stream.
+    On a terminal status the stream is trimmed exactly and set to expire.
     """
-    log.info(f"Starting training job for Experiment {experiment_id} | Env={env_name} | Algo={algo}")
-    task_id = self.request.id
-    total_epochs = 5
+    key = progress_stream_key(task_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.xadd(
+        key,
+        {"data": json.dumps(meta)},
+        maxlen=cache_config.progress_stream_maxlen,
+        approximate=True,
+    )
+    if meta.get("status") in TERMINAL_STATUSES:
+        pipe.xtrim(key, maxlen=cache_config.progress_stream_maxlen, approximate=False)
+        pipe.expire(key, cache_config.progress_stream_ttl_seconds)
+    pipe.execute()
+
+
+def fetch_task_states(task_ids: list) -> list:
+    """
+    Read Celery state and metadata for many tasks in one backend round trip.
+    Returns a list of (status, info) tuples aligned with `task_ids`. Tasks
+    unknown to the result backend are looked up in the task archive and
+    otherwise reported as PENDING.
+    """
+    backend = celery_app.backend
+    if not hasattr(backend, "mget"):
+        # Non key-value backends (rpc, db) have no batched read; fall back per task
+        states = [(r.status, r.info) for r in (celery_app.AsyncResult(tid) for tid in task_ids)]
+    else:
+        raw_values = backend.mget([backend.get_key_for_task(tid) for tid in task_ids])
+        states = []
+        for raw in raw_values:
+            if raw is None:
+                states.append(("PENDING", None))
+            else:
+                # Exception states (FAILURE, REVOKED) come back as exception instances, as from AsyncResult.info
+                meta = backend.meta_from_decoded(backend.decode(raw))
+                states.append((meta["status"], meta.get("result")))
+
+    missing = [tid for tid, (status, _) in zip(task_ids, states) if status == "PENDING"]
+    if missing:
+        archived = task_archive.get_states(missing)
+        states = [archived.get(tid, state) for tid, state in zip(task_ids, states)]
+    return states
+
+
+def _forget_results(task_ids: list):
+    """Delete stored Celery results (one round trip on the Redis backend)."""
+    backend = celery_app.backend
+    if hasattr(backend, "client") and hasattr(backend, "get_key_for_task"):
+        backend.client.delete(*[backend.get_key_for_task(tid) for tid in task_ids])
+    else:
+        for tid in task_ids:
+            celery_app.AsyncResult(tid).forget()
+
 
-    # Record job start in Redis
+def compact_task_records(now: float = None) -> int:
+    """
+    Move one batch of finished tasks from Redis into the SQL archive.
+
+    Tasks registered more than `archive_after_seconds` ago with a final status
+    are written to the archive (task table entry plus Celery result) in one
+    transaction, then their hash, index entries and result are deleted from
+    Redis. Writing first means a crash in between only archives a task twice.
+    Returns the number of tasks removed from Redis.
+    """
+    retention = settings.retention
+    cutoff = (now or time.time()) - retention.archive_after_seconds
+    candidates = task_registry.finished_before(cutoff, retention.archive_batch_size)
+    if not candidates:
+        return 0
+
+    live = [(task_id, record) for task_id, _, record in candidates if record]
+    states = fetch_task_states([task_id for task_id, _ in live])
+    task_archive.store([(task_id, record, info) for (task_id, record), (_, info) in zip(live, states)])
+
+    for task_id, status, record in candidates:
+        # Expired hashes leave only their status to clean up
+        task_registry.remove(task_id, record or {"status": status})
+    _forget_results([task_id for task_id, _, _ in candidates])
+
+    log.info(f"Archived {len(live)} finished tasks ({len(candidates) - len(live)} already expired)")
+    return len(candidates)
+
+
+def submit_training_task(
+    experiment_id: int,
+    env_name: str,
+    algo: str,
+    priority: int = None,
+    total_epochs: int = None,
+    hyperparams: dict = None,
+    sweep_id: str = None,
+    client_id: str = None,
+    idempotency_key: str = None,
+    task_id: str = None,
+):
+    """
+    Register a training task as QUEUED, then enqueue it on Celery.
+    Registering first means the task is listed even before a worker picks it up.
+
+    Outside sweeps, submissions are deduplicated: a repeat of `idempotency_key`
+    within the TTL, or of the same payload while the first task is in flight,
+    returns the existing task instead of enqueuing again (compare the returned
+    id with `task_id` to tell). Such tasks also hold the experiment lock while
+    they train. Submissions on behalf of a client go through admission control
+    and raise AdmissionRejected when the queue or the client is over its limit.
+    """
+    task_id = task_id or str(uuid.uuid4())
+    if priority is None:
+        priority = celery_config.default_priority
+    queue = celery_config.task_routes.get(run_training_task.name, celery_config.default_queue)
+
+    # Sweep trials share an experiment on purpose and are never deduplicated
+    dedupe_key = None
+    exclusive = sweep_id is None
+    if exclusive:
+        dedupe_key = submission_dedupe_key(
+            experiment_id, env_name, algo, idempotency_key, client_id,
+            total_epochs=total_epochs, hyperparams=hyperparams,
+        )
+        existing = task_dedup.claim(dedupe_key, task_id, celery_config.idempotency_ttl_seconds)
+        if existing:
+            log.info(f"Duplicate submission for Experiment {experiment_id}; returning task {existing}")
+            return celery_app.AsyncResult(existing)
+
+    if client_id is not None:
+        try:
+            admission_controller.admit(queue, client_id, task_id)
+        except Exception:
+            if dedupe_key:
+                task_dedup.release(dedupe_key, task_id)
+            raise
     _sync_task_to_db(task_id, {
         "experiment_id": experiment_id,
         "algo": algo,
         "env": env_name,
-        "status": "RUNNING",
+        "status": "QUEUED",
+        "priority": priority,
+        "queue": queue,
+        "client_id": client_id,
+        "sweep_id": sweep_id,
+        # Payload-derived keys only dedupe while in flight; explicit keys live out their TTL
+        "dedupe_key": dedupe_key if dedupe_key and not idempotency_key else None,
+        "hyperparams": json.dumps(hyperparams) if hyperparams else None,
         "created_at": datetime.utcnow().isoformat(),
     })
+    task_control.mark_waiting(queue, task_id, priority)
+    kwargs = {"hyperparams": hyperparams, "exclusive": exclusive}
+    if total_epochs is not None:
+        kwargs["total_epochs"] = total_epochs
+    return run_training_task.apply_async(
+        args=(experiment_id, env_name, algo), kwargs=kwargs, task_id=task_id, priority=priority
+    )
 
-    for epoch in range(total_epochs):
-        time.sleep(2)  # Simulate training time
-        # Simulate realistic reward signal
-        reward = round(random.uniform(180, 250), 2)
 
-        meta = {
-            "experiment_id": experiment_id,
-            "env": env_name,
-            "algo": algo,
-            "epoch": epoch + 1,
-            "total_epochs": total_epochs,
-            "reward": reward,
-            "status": "PROGRESS",
-            "timestamp": datetime.utcnow().isoformat(),
-        }
+def revoke_task(task_id: str) -> str:
+    """
+    Cancel a task and return its resulting status.
+
+    Workers are told to discard the message if it has not started yet, and a
+    cancellation flag is set for tasks already running: they check it between
+    epochs and shut down cleanly, writing the final REVOKED state themselves
+    (reported here as CANCELLING). Tasks that never started are recorded as
+    REVOKED right away, with a terminal progress event so stream subscribers finish.
+    """
+    record = task_registry.get(task_id)
+    status = record.get("status")
+    if status in TERMINAL_STATUSES:
+        return status
+
+    celery_app.control.revoke(task_id)
+    task_control.request_cancel(task_id)
+    now = datetime.utcnow().isoformat()
+
+    if status == "RUNNING":
+        _sync_task_to_db(task_id, {"cancel_requested_at": now})
+        log.info(f"Cancellation requested for running task {task_id}")
+        return "CANCELLING"
 
-        # Update Celery progress state
-        self.update_state(state="PROGRESS", meta=meta)
+    if record.get("queue"):
+        task_control.mark_started(record["queue"], task_id)  # leaves the waiting set
+    _release_task_claims(task_id, record)
+    _sync_task_to_db(task_id, {"status": "REVOKED", "completed_at": now})
+    _publish_progress(task_id, {"status": "REVOKED", "timestamp": now})
+    log.info(f"Task {task_id} revoked")
+    return "REVOKED"
 
-        # Broadcast via Redis (for Server-Sent Events or WebSocket updates)
-        redis_client.publish(f"task_progress:{task_id}", json.dumps(meta))
 
-        # ✅ Log reward in analytics-compatible format
-        log.info(f"Experiment {experiment_id} | Epoch {epoch + 1}/{total_epochs} | Reward: {reward}")
+def _release_task_claims(task_id: str, record: dict):
+    """
+    Drop what a task held while in flight: the client's admission slot,
+    its payload dedupe record and the experiment lock (only if still its own).
+    """
+    if record.get("client_id"):
+        admission_controller.release(record["client_id"], task_id)
+    if record.get("dedupe_key"):
+        task_dedup.release(record["dedupe_key"], task_id)
+    if record.get("experiment_id"):
+        task_dedup.release_experiment(record["experiment_id"], task_id)
+
+
+def _record_failure(task_id: str, error):
+    """
+    Final state for a task body that raised: nothing else writes it, and
+    progress subscribers (SSE, WebSocket, sweeps) wait for a terminal event.
+    """
+    now = datetime.utcnow().isoformat()
+    _sync_task_to_db(task_id, {"status": "FAILURE", "error": repr(error), "completed_at": now})
+    _publish_progress(task_id, {"status": "FAILURE", "error": repr(error), "timestamp": now})
+    log.error(f"Task {task_id} failed: {error!r}")
+
 
-        # Persist latest epoch info in Redis
-        _sync_task_to_db(task_id, {
-            "last_epoch": epoch + 1,
-            "last_reward": reward,
-            "updated_at": datetime.utcnow().isoformat(),
+@task_postrun.connect
+def _on_task_finished(task_id=None, state=None, retval=None, **_):
+    """Record failures and release in-flight claims once a task has finished for good."""
+    if state == "RETRY":
+        return  # preempted, waiting for its experiment lock, or retried: still in flight
+    record = task_registry.get(task_id)
+    if state == "FAILURE" and record and record.get("status") not in TERMINAL_STATUSES:
+        _record_failure(task_id, retval)
+    _release_task_claims(task_id, record)
+
+
+class CeleryTaskContext(TaskContext):
+    """
+    TaskContext for a Celery worker: Celery result state, Redis progress
+    stream and task table, plus the Redis signals for cancellation,
+    preemption and the per-experiment lock.
+    """
+
+    def __init__(self, task, exclusive: bool = False):
+        self.task = task
+        self.task_id = task.request.id
+        self.exclusive = exclusive
+        delivery_info = task.request.delivery_info or {}
+        # Queue and priority of the current delivery (fall back to the configured route)
+        self.queue = delivery_info.get("routing_key") or celery_config.task_routes.get(
+            task.name, celery_config.default_queue
+        )
+        priority = delivery_info.get("priority")
+        self.priority = celery_config.default_priority if priority is None else priority
+
+    def update_state(self, state: str, meta: dict):
+        self.task.update_state(state=state, meta=meta)
+
+    def publish(self, meta: dict):
+        _publish_progress(self.task_id, meta)
+
+    def record(self, data: dict):
+        _sync_task_to_db(self.task_id, data)
+
+    def cancel_requested(self) -> bool:
+        return task_control.cancel_requested(self.task_id)
+
+    def begin(self, experiment_id: int):
+        task_control.mark_started(self.queue, self.task_id)
+        if self.exclusive and not task_dedup.acquire_experiment(
+            experiment_id, self.task_id, celery_config.experiment_lock_ttl_seconds
+        ):
+            holder = task_dedup.experiment_holder(experiment_id)
+            log.info(f"Experiment {experiment_id} is being trained by {holder}; requeueing {self.task_id}")
+            raise self.task.retry(countdown=celery_config.experiment_lock_retry_seconds, priority=self.priority)
+
+    def safe_point(self, experiment_id: int, epoch: int, total_epochs: int, checkpoint=None):
+        """Renew the experiment lock, then yield to a waiting better-priority task if there is one."""
+        if self.exclusive and not task_dedup.acquire_experiment(
+            experiment_id, self.task_id, celery_config.experiment_lock_ttl_seconds
+        ):
+            log.warning(f"Task {self.task_id} lost the lock on Experiment {experiment_id}")
+
+        preempted_by = celery_config.preemption_enabled and task_control.preemption_target(
+            self.queue, self.priority, celery_config.preemption_grace_seconds
+        )
+        if not preempted_by:
+            return
+
+        if checkpoint:
+            checkpoint()
+        now = datetime.utcnow().isoformat()
+        task_control.mark_waiting(self.queue, self.task_id, self.priority)
+        task_dedup.release_experiment(experiment_id, self.task_id)
+        self.record({
+            "status": "QUEUED",
+            "preempted_at": now,
+            "preempted_by": preempted_by,
+            "preemptions": self.task.request.retries + 1,
+        })
+        self.publish({
+            "status": "PREEMPTED",
+            "epoch": epoch,
+            "total_epochs": total_epochs,
+            "preempted_by": preempted_by,
+            "timestamp": now,
         })
+        log.info(f"Task {self.task_id} preempted at epoch {epoch} by {preempted_by}; requeued")
+        raise self.task.retry(countdown=0, priority=self.priority)
+
+
+def train_experiment(
+    ctx: TaskContext,
+    experiment_id: int,
+    env_name: str,
+    algo: str,
+    total_epochs: int = 5,
+    hyperparams: dict = None,
+):
+    """
+    Simulate a reinforcement learning training job on any executor.
+    Logs actual reward values per epoch for analytics integration and reports
+    progress through the task context. Between epochs it honours cancellation
+    requests and gives the executor a safe point to reschedule the task.
+    """
+    log.info(f"Starting training job for Experiment {experiment_id} | Env={env_name} | Algo={algo}")
+    task_id = ctx.task_id
+
+    # Resume from the last checkpoint if this delivery is a retry / redelivery
+    rng = random.Random(task_id)
+    rewards = []
+    start_epoch = 0
+    checkpoint = checkpoint_store.load(task_id)
+    if checkpoint:
+        start_epoch = checkpoint["epoch"]
+        rewards = checkpoint["rewards"]
+        rng.setstate(checkpoint["rng_state"])
+        log.info(f"Resuming Experiment {experiment_id} from checkpoint at epoch {start_epoch}/{total_epochs}")
+
+    if ctx.cancel_requested():
+        checkpoint_store.delete(task_id)
+        ctx.cancel({"experiment_id": experiment_id, "epoch": start_epoch, "total_epochs": total_epochs})
+
+    ctx.begin(experiment_id)
+
+    # Durable per-epoch metrics (training_runs / epoch_metrics), written in batches
+    run_metrics = RunMetricsWriter(
+        SessionLocal,
+        flush_epochs=celery_config.metrics_flush_epochs,
+        flush_seconds=celery_config.metrics_flush_seconds,
+    )
+    run_metrics.start_run(task_id, experiment_id, env_name, algo, total_epochs)
+
+    # Record job start in the task table
+    ctx.record({
+        "experiment_id": experiment_id,
+        "algo": algo,
+        "env": env_name,
+        "status": "RUNNING",
+        "started_at": datetime.utcnow().isoformat(),
+        "resumed_from_epoch": start_epoch if checkpoint else None,
+    })
+
+    # Result state, progress stream and task table are written at most once per interval
+    reporter = ProgressReporter(ctx, sinks=[
+        # Broadcast to stream subscribers (Server-Sent Events or WebSocket updates)
+        ctx.publish,
+        # Persist latest epoch info in the task table
+        lambda meta: ctx.record({
+            "last_epoch": meta["epoch"],
+            "last_reward": meta["reward"],
+            "updated_at": meta["timestamp"],
+        }),
+    ])
+
+    try:
+        for epoch in range(start_epoch, total_epochs):
+            time.sleep(2)  # Simulate training time
+            # Simulate realistic reward signal (task-seeded, so resumed epochs repeat identically)
+            reward = round(rng.uniform(180, 250), 2)
+            rewards.append(reward)
+
+            meta = {
+                "experiment_id": experiment_id,
+                "env": env_name,
+                "algo": algo,
+                "epoch": epoch + 1,
+                "total_epochs": total_epochs,
+                "reward": reward,
+                "status": "PROGRESS",
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+            # Update progress state (throttled; the last epoch always goes out)
+            reporter.report(meta, milestone=epoch + 1 == total_epochs)
+
+            # ✅ Log reward in analytics-compatible format
+            log.info(f"Experiment {experiment_id} | Epoch {epoch + 1}/{total_epochs} | Reward: {reward} | Task: {task_id}")
+            run_metrics.record(epoch + 1, reward)
+
+            if epoch + 1 == total_epochs:
+                break
+            if (epoch + 1) % celery_config.checkpoint_interval_epochs == 0:
+                checkpoint_store.save(task_id, epoch + 1, rewards, rng)
+
+            # Safe point: honour cancellation, then let the executor reschedule the task
+            if ctx.cancel_requested():
+                reporter.close()
+                run_metrics.finish("REVOKED")
+                checkpoint_store.delete(task_id)
+                ctx.cancel(meta)
+
+            def save_checkpoint(epoch=epoch + 1):
+                reporter.close()
+                run_metrics.flush()
+                checkpoint_store.save(task_id, epoch, rewards, rng)
+
+            ctx.safe_point(experiment_id, epoch + 1, total_epochs, checkpoint=save_checkpoint)
+    except (TaskCancelled, Retry, Ignore):
+        raise  # cancelled or requeued: the run was closed or will resume
+    except Exception:
+        run_metrics.finish("FAILURE")
+        raise
+
+    reporter.close()
 
     # Final results summary
-    final_accuracy = round(random.uniform(0.8, 0.99), 4)
+    final_accuracy = round(rng.uniform(0.8, 0.99), 4)
     result = {
         "experiment_id": experiment_id,
         "algo": algo,
@@ -110,22 +576,75 @@ def run_training_task(self, experiment_id: int, env_name: str, algo: str):
     }
 
     # Broadcast completion
-    redis_client.publish(f"task_progress:{task_id}", json.dumps(result))
+    ctx.publish(result)
     log.info(
         f"Training job for Experiment {experiment_id} completed | "
         f"Env={env_name} | Algo={algo} | Final Accuracy: {final_accuracy}"
     )
 
-    # Sync final state to Redis
-    _sync_task_to_db(task_id, {
+    # Sync final state to the task table
+    ctx.record({
         "status": "SUCCESS",
         "final_accuracy": final_accuracy,
         "completed_at": datetime.utcnow().isoformat(),
     })
+    run_metrics.finish("SUCCESS", final_accuracy)
+    checkpoint_store.delete(task_id)
 
     return result
 
 
+# Preemption requeues via retry(), so retries are not capped
+@celery_app.task(bind=True, name="run_training_task", max_retries=None)
+def run_training_task(
+    self,
+    experiment_id: int,
+    env_name: str,
+    algo: str,
+    total_epochs: int = 5,
+    hyperparams: dict = None,
+    exclusive: bool = False,
+):
+    """
+    Celery entry point for train_experiment.
+    Between epochs the task yields its worker to a waiting better-priority
+    task (checkpoint, then requeue). Exclusive tasks hold the experiment lock
+    and are requeued while another training of the same experiment is running.
+    """
+    ctx = CeleryTaskContext(self, exclusive=exclusive)
+    try:
+        return train_experiment(ctx, experiment_id, env_name, algo, total_epochs, hyperparams)
+    except TaskCancelled:
+        log.info(f"Task {ctx.task_id} cancelled")
+        # Keep the REVOKED state instead of letting Celery store a result
+        raise Ignore()
+
+
+@celery_app.task(name="archive_finished_tasks", ignore_result=True)
+def archive_finished_tasks():
+    """
+    Periodic compaction (Celery beat, every `archive_interval_seconds`).
+    Drains up to a few batches per run so a backlog shrinks steadily.
+    """
+    task_archive.ensure_table(engine)
+    compacted = 0
+    for _ in range(10):
+        count = compact_task_records()
+        compacted += count
+        if count < settings.retention.archive_batch_size:
+            break
+    return compacted
+
+
+@celery_app.task(name="export_run_archive", ignore_result=True)
+def export_run_archive():
+    """
+    Periodic Parquet export (Celery beat, every `parquet_export_interval_seconds`)
+    of runs finished and benchmarks evaluated since the previous export.
+    """
+    return run_archive.export()
+
+
 @celery_app.task(bind=True, name="long_task")
 def long_task(self, total=100):
     """
@@ -133,17 +652,27 @@ def long_task(self, total=100):
     Useful for testing orchestration pipeline.
     """
     task_id = self.request.id
+    ctx = CeleryTaskContext(self)
     _sync_task_to_db(task_id, {"status": "RUNNING", "type": "long_task"})
 
+    reporter = ProgressReporter(self, sinks=[lambda meta: _publish_progress(task_id, meta)])
+    milestone_step = max(1, total // 10)
+
     for i in range(total):
         time.sleep(0.1)
         progress = (i + 1)
-        self.update_state(state="PROGRESS", meta={"current": progress, "total": total})
-        redis_client.publish(f"task_progress:{task_id}", json.dumps({
-            "progress": progress,
-            "total": total,
-            "status": "PROGRESS"
-        }))
+        milestone = progress % milestone_step == 0
+        reporter.report(
+            {"current": progress, "total": total, "progress": progress, "status": "PROGRESS"},
+            milestone=milestone,
+        )
+        if milestone and ctx.cancel_requested():
+            try:
+                ctx.cancel({"current": progress, "total": total})
+            except TaskCancelled:
+                raise Ignore()
 
+    reporter.close()
+    _publish_progress(task_id, {"progress": total, "total": total, "status": "SUCCESS"})
     _sync_task_to_db(task_id, {"status": "SUCCESS", "completed_at": datetime.utcnow().isoformat()})
     return {"current": total, "total": total, "status": "Task completed!"}
@@ -1,5 +1,10 @@
 import asyncio
 import json
+import re
+import time
+import uuid
+from collections import deque
+from contextlib import aclosing
 #import aioredis
 from redis import asyncio as aioredis
 from backend.fastapi_app.core.config import CacheConfig
@@ -9,43 +14,361 @@ log = get_logger("ProgressBroadcastService")
 
 cache_config = CacheConfig()
 
+# Statuses after which no further progress events are emitted for a task
+TERMINAL_STATUSES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+_STREAM_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+
+def progress_stream_key(task_id: str) -> str:
+    """Redis Stream holding the replayable progress history of a task."""
+    return f"task_progress:stream:{task_id}"
+
+
+def is_terminal_event(message: str) -> bool:
+    """True if a progress payload reports a finished task."""
+    try:
+        return json.loads(message).get("status") in TERMINAL_STATUSES
+    except (ValueError, AttributeError):
+        return False
+
+
+def _stream_id(event_id: str) -> tuple:
+    ms, seq = event_id.split("-")
+    return int(ms), int(seq)
+
+
+async def _tail(queue: asyncio.Queue, delivered: tuple, heartbeat_seconds: float):
+    """
+    Live part of a subscription: yield queued (event_id, data) items newer than
+    `delivered`, or (None, None) when nothing arrived within `heartbeat_seconds`.
+    """
+    while True:
+        try:
+            event_id, data = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+        except asyncio.TimeoutError:
+            yield None, None
+            continue
+        # Live events may repeat ones already covered by the replay
+        if _stream_id(event_id) <= delivered:
+            continue
+        delivered = _stream_id(event_id)
+        yield event_id, data
+
+
 class ProgressBroadcastService:
     """
-    Redis-based broadcaster for Celery task progress updates.
-    Allows multiple clients to subscribe to a single task’s progress channel.
+    Redis Streams-based broadcaster for Celery task progress updates.
+    Each task appends to a capped stream, so clients can subscribe late or
+    reconnect with the last event id they saw and replay what they missed.
+
+    Live updates are read by a single background reader per process, which
+    issues one XREAD over every watched stream and fans events out to
+    bounded per-client queues. A slow client's queue drops its oldest
+    entries, so it always converges on the latest progress.
     """
 
-    def __init__(self, redis_url: str = cache_config.url+'2'): # "redis://localhost:6379/2"):
+    def __init__(
+        self,
+        redis_url: str = cache_config.url+'2', # "redis://localhost:6379/2"
+        block_ms: int = cache_config.progress_read_block_ms,
+        queue_size: int = cache_config.progress_client_queue_size,
+        heartbeat_seconds: float = cache_config.progress_heartbeat_seconds,
+    ):
         self.redis_url = redis_url
-        self.subscribers = {}  # {task_id: set(websocket_or_queue)}
+        self.block_ms = block_ms
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.subscribers = {}  # {task_id: set(queue)}
+        self._cursors = {}     # {task_id: last stream id read by the shared reader}
+        self._watch_changed = asyncio.Event()
+        self._reader = None
+        # Per-process stream the reader always includes in its XREAD; writing to
+        # it makes a blocked read return so newly watched streams join at once
+        self._wake_key = f"task_progress:wake:{uuid.uuid4().hex}"
+        self._wake_cursor = "0-0"
 
     async def connect(self):
         self.redis = await aioredis.from_url(self.redis_url, decode_responses=True)
         log.info("Connected to Redis for progress broadcasting")
 
+    async def close(self):
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        await self.redis.aclose()
+        log.info("Progress broadcasting stopped")
+
     async def publish(self, task_id: str, data: dict):
         """
         Called when Celery reports progress.
-        Publishes progress JSON to Redis pub/sub channel.
+        Appends progress JSON to the task's capped stream and returns its event id.
+        Terminal updates trim the stream and give it a TTL.
         """
-        channel = f"task_progress:{task_id}"
-        await self.redis.publish(channel, json.dumps(data))
-        log.debug(f"Published progress for {task_id}: {data}")
+        key = progress_stream_key(task_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xadd(
+            key,
+            {"data": json.dumps(data)},
+            maxlen=cache_config.progress_stream_maxlen,
+            approximate=True,
+        )
+        if data.get("status") in TERMINAL_STATUSES:
+            pipe.xtrim(key, maxlen=cache_config.progress_stream_maxlen, approximate=False)
+            pipe.expire(key, cache_config.progress_stream_ttl_seconds)
+        event_id = (await pipe.execute())[0]
+        log.debug(f"Published progress for {task_id} ({event_id}): {data}")
+        return event_id
 
-    async def subscribe(self, task_id: str):
+    async def subscribe(self, task_id: str, last_event_id: str = None):
         """
-        Creates an async generator that yields progress updates for a task.
+        Creates an async generator that yields (event_id, data) progress updates for a task.
+        Replays every event after `last_event_id` (or the whole stream), then tails live
+        via the shared reader. Yields (None, None) as a heartbeat whenever no update
+        arrived within `heartbeat_seconds`, so callers can check for disconnects.
         """
-        pubsub = self.redis.pubsub()
-        channel = f"task_progress:{task_id}"
-        await pubsub.subscribe(channel)
-        log.info(f"Subscribed to Redis channel: {channel}")
+        key = progress_stream_key(task_id)
+        if last_event_id and not _STREAM_ID_PATTERN.match(last_event_id):
+            log.warning(f"Ignoring malformed Last-Event-ID {last_event_id!r} for {task_id}")
+            last_event_id = None
 
+        queue = await self._register(task_id)
         try:
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    yield message["data"]
+            start = f"({last_event_id}" if last_event_id else "-"
+            delivered = _stream_id(last_event_id) if last_event_id else (0, 0)
+
+            backlog = await self.redis.xrange(key, min=start, max="+")
+            log.debug(f"Replaying {len(backlog)} progress events for {task_id}")
+            for event_id, fields in backlog:
+                delivered = _stream_id(event_id)
+                yield event_id, fields["data"]
+
+            async with aclosing(_tail(queue, delivered, self.heartbeat_seconds)) as live:
+                async for item in live:
+                    yield item
         finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-            log.info(f"Unsubscribed from {channel}")
+            self._unregister(task_id, queue)
+
+    # -----------------------------
+    # Shared reader
+    # -----------------------------
+    async def _register(self, task_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        first_watcher = task_id not in self.subscribers
+        self.subscribers.setdefault(task_id, set()).add(queue)
+        if first_watcher:
+            # Start tailing from the current end; earlier events come from the replay
+            latest = await self.redis.xrevrange(progress_stream_key(task_id), count=1)
+            self._cursors[task_id] = latest[0][0] if latest else "0-0"
+            self._watch_changed.set()
+            if self._reader is not None and not self._reader.done():
+                await self._wake()
+
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop())
+        log.debug(f"Subscribed to progress for {task_id} ({len(self.subscribers[task_id])} local clients)")
+        return queue
+
+    def _unregister(self, task_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(task_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[task_id]
+            self._cursors.pop(task_id, None)
+        log.debug(f"Unsubscribed from progress for {task_id}")
+
+    async def _wake(self):
+        """Interrupt the reader's blocking XREAD so it re-reads with the current watch list."""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xadd(self._wake_key, {"wake": "1"}, maxlen=1, approximate=False)
+        pipe.expire(self._wake_key, max(60, 2 * self.block_ms // 1000))
+        await pipe.execute()
+
+    async def _read_loop(self):
+        """
+        Single XREAD across all watched task streams, fanned out to client queues.
+        """
+        while True:
+            if not self._cursors:
+                self._watch_changed.clear()
+                await self._watch_changed.wait()
+                continue
+
+            streams = {progress_stream_key(tid): cursor for tid, cursor in self._cursors.items()}
+            streams[self._wake_key] = self._wake_cursor
+            try:
+                response = await self.redis.xread(streams, block=self.block_ms, count=100)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                log.error(f"Progress reader failed: {exc}")
+                await asyncio.sleep(1)
+                continue
+
+            for key, entries in response or []:
+                if key == self._wake_key:
+                    self._wake_cursor = entries[-1][0]
+                    continue
+                task_id = key.split(":", 2)[2]
+                if task_id not in self._cursors:
+                    continue  # every client left while we were blocked
+                for event_id, fields in entries:
+                    self._cursors[task_id] = event_id
+                    for queue in list(self.subscribers.get(task_id, ())):
+                        self._offer(queue, (event_id, fields["data"]))
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, item):
+        """Enqueue without blocking; a full queue drops its oldest pending update."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+
+class LocalProgressBroadcaster:
+    """
+    In-process counterpart of ProgressBroadcastService for the local executor.
+
+    Keeps the last `maxlen` events of each task in memory under stream-style
+    ids, so replay from Last-Event-ID, heartbeats and bounded per-client
+    queues behave exactly as with Redis Streams. Must be used from the event
+    loop thread; other threads hand events over with `call_soon_threadsafe`.
+    """
+
+    def __init__(
+        self,
+        maxlen: int = cache_config.progress_stream_maxlen,
+        ttl_seconds: int = cache_config.progress_stream_ttl_seconds,
+        queue_size: int = cache_config.progress_client_queue_size,
+        heartbeat_seconds: float = cache_config.progress_heartbeat_seconds,
+    ):
+        self.maxlen = maxlen
+        self.ttl_seconds = ttl_seconds
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.streams = {}      # {task_id: deque((event_id, data))}
+        self.subscribers = {}  # {task_id: set(queue)}
+        self._last_id = (0, 0)
+        self._loop = None
+
+    async def connect(self):
+        self._loop = asyncio.get_running_loop()
+        log.info("Using in-process progress broadcasting")
+
+    async def close(self):
+        self.subscribers.clear()
+
+    def _next_id(self) -> str:
+        ms = int(time.time() * 1000)
+        last_ms, last_seq = self._last_id
+        self._last_id = (last_ms, last_seq + 1) if ms <= last_ms else (ms, 0)
+        return "%d-%d" % self._last_id
+
+    def publish_nowait(self, task_id: str, data: dict) -> str:
+        event_id = self._next_id()
+        item = (event_id, json.dumps(data))
+        self.streams.setdefault(task_id, deque(maxlen=self.maxlen)).append(item)
+        for queue in list(self.subscribers.get(task_id, ())):
+            ProgressBroadcastService._offer(queue, item)
+        if data.get("status") in TERMINAL_STATUSES and self._loop:
+            self._loop.call_later(self.ttl_seconds, self.streams.pop, task_id, None)
+        log.debug(f"Published progress for {task_id} ({event_id}): {data}")
+        return event_id
+
+    async def publish(self, task_id: str, data: dict):
+        return self.publish_nowait(task_id, data)
+
+    async def subscribe(self, task_id: str, last_event_id: str = None):
+        """Same contract as ProgressBroadcastService.subscribe."""
+        if last_event_id and not _STREAM_ID_PATTERN.match(last_event_id):
+            log.warning(f"Ignoring malformed Last-Event-ID {last_event_id!r} for {task_id}")
+            last_event_id = None
+
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(task_id, set()).add(queue)
+        try:
+            delivered = _stream_id(last_event_id) if last_event_id else (0, 0)
+            for event_id, data in list(self.streams.get(task_id, ())):
+                if _stream_id(event_id) <= delivered:
+                    continue
+                delivered = _stream_id(event_id)
+                yield event_id, data
+
+            async with aclosing(_tail(queue, delivered, self.heartbeat_seconds)) as live:
+                async for item in live:
+                    yield item
+        finally:
+            queues = self.subscribers.get(task_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self.subscribers[task_id]
+
+
+class ProgressMultiplexer:
+    """
+    Watches many tasks on behalf of one client (e.g. a WebSocket).
+    Each subscribed task is tailed through ProgressBroadcastService; updates are
+    coalesced per task so every batch carries only the latest event per task
+    seen during the last `interval` seconds.
+    """
+
+    def __init__(self, service: ProgressBroadcastService, interval: float = cache_config.progress_coalesce_seconds):
+        self.service = service
+        self.interval = interval
+        self._pumps = {}   # {task_id: asyncio.Task}
+        self._latest = {}  # {task_id: (event_id, data)}
+        self._ready = asyncio.Event()
+
+    @property
+    def task_ids(self) -> list:
+        return list(self._pumps)
+
+    def subscribe(self, task_ids: list):
+        for task_id in task_ids:
+            if task_id not in self._pumps:
+                self._pumps[task_id] = asyncio.create_task(self._pump(task_id))
+
+    def unsubscribe(self, task_ids: list):
+        for task_id in task_ids:
+            pump = self._pumps.pop(task_id, None)
+            if pump:
+                pump.cancel()
+            self._latest.pop(task_id, None)
+
+    async def close(self):
+        pumps = list(self._pumps.values())
+        self.unsubscribe(self.task_ids)
+        await asyncio.gather(*pumps, return_exceptions=True)
+
+    async def batches(self):
+        """
+        Async generator of update batches: [{"task_id", "event_id", "data"}, ...].
+        The first update after an idle period is sent immediately; later ones
+        accumulate for `interval` seconds and only the newest per task is kept.
+        """
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            latest, self._latest = self._latest, {}
+            if not latest:
+                continue
+            yield [
+                {"task_id": task_id, "event_id": event_id, "data": json.loads(data)}
+                for task_id, (event_id, data) in latest.items()
+            ]
+            await asyncio.sleep(self.interval)
+
+    async def _pump(self, task_id: str):
+        async with aclosing(self.service.subscribe(task_id)) as updates:
+            async for event_id, data in updates:
+                if event_id is None:
+                    continue  # heartbeat
+                self._latest[task_id] = (event_id, data)
+                self._ready.set()
+                if is_terminal_event(data):
+                    break
+        if self._pumps.get(task_id) is asyncio.current_task():
+            del self._pumps[task_id]
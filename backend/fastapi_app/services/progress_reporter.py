@@ -0,0 +1,60 @@
+# backend/fastapi_app/services/progress_reporter.py
+import time
+from typing import Callable, Iterable, Optional
+from backend.fastapi_app.core.config import CacheConfig
+from shared.utils.logger import get_logger
+
+log = get_logger("ProgressReporter")
+
+cache_config = CacheConfig()
+
+
+class ProgressReporter:
+    """
+    Time-based throttle for progress updates from a running Celery task.
+
+    `report` may be called on every step; the Celery state and each sink
+    (stream publish, task table sync, ...) are written at most once per
+    `interval` seconds with the newest pending update. Milestone updates and
+    `close()` always write, so milestone and final states are never lost.
+    """
+
+    def __init__(
+        self,
+        task,
+        sinks: Iterable[Callable[[dict], None]] = (),
+        interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.task = task
+        self.sinks = list(sinks)
+        self.interval = cache_config.progress_min_interval_seconds if interval is None else interval
+        self.clock = clock
+        self._pending = None
+        self._last_write = None
+        self.reported = 0
+        self.written = 0
+
+    def report(self, meta: dict, milestone: bool = False):
+        """Record a progress update; write it now if due or if it is a milestone."""
+        self.reported += 1
+        self._pending = meta
+        now = self.clock()
+        if milestone or self._last_write is None or now - self._last_write >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Write the newest pending update, if any."""
+        if self._pending is None:
+            return
+        meta, self._pending = self._pending, None
+        self.task.update_state(state="PROGRESS", meta=meta)
+        for sink in self.sinks:
+            sink(meta)
+        self._last_write = self.clock()
+        self.written += 1
+
+    def close(self):
+        """Flush whatever is still pending; call before the task returns."""
+        self.flush()
+        log.debug(f"Progress reporter closed: {self.reported} updates reported, {self.written} written")
@@ -0,0 +1,325 @@
+# backend/fastapi_app/services/run_archive.py
+import json
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Optional
+import pyarrow as pa
+import pyarrow.dataset as ds
+from sqlalchemy import select, tuple_
+from shared.models.experiment_model import EpochMetric, TrainingRun
+from shared.utils.logger import get_logger
+
+log = get_logger("RunArchive")
+
+PARTITION_FIELDS = [("date", pa.string()), ("env", pa.string()), ("algo", pa.string())]
+
+# Columns of each dataset, partition keys last; partition values are the directory names
+SCHEMAS = {
+    "runs": pa.schema([
+        ("run_id", pa.int64()),
+        ("task_id", pa.string()),
+        ("experiment_id", pa.int64()),
+        ("status", pa.string()),
+        ("total_epochs", pa.int64()),
+        ("final_accuracy", pa.float64()),
+        ("started_at", pa.timestamp("us")),
+        ("completed_at", pa.timestamp("us")),
+        *PARTITION_FIELDS,
+    ]),
+    "epochs": pa.schema([
+        ("run_id", pa.int64()),
+        ("experiment_id", pa.int64()),
+        ("epoch", pa.int64()),
+        ("reward", pa.float64()),
+        ("recorded_at", pa.timestamp("us")),
+        *PARTITION_FIELDS,
+    ]),
+    "benchmarks": pa.schema([
+        ("model_id", pa.string()),
+        ("mean_reward", pa.float64()),
+        ("std_reward", pa.float64()),
+        ("median_reward", pa.float64()),
+        ("latency_ms", pa.float64()),
+        ("total_episodes", pa.int64()),
+        ("status", pa.string()),
+        ("evaluated_at", pa.timestamp("us")),
+        *PARTITION_FIELDS[:2],
+    ]),
+}
+PARTITIONS = {
+    "runs": ["date", "env", "algo"],
+    "epochs": ["date", "env", "algo"],
+    "benchmarks": ["date", "env"],
+}
+# Rows are sorted by these before writing so row-group min/max statistics stay narrow
+SORT_KEYS = {
+    "runs": ["experiment_id", "run_id"],
+    "epochs": ["experiment_id", "run_id", "epoch"],
+    "benchmarks": ["model_id", "evaluated_at"],
+}
+
+UNKNOWN = "unknown"
+
+
+class RunArchive:
+    """
+    Columnar history of finished training runs, their per-epoch rewards and
+    benchmark results, for analytics that would otherwise scan SQL or logs.
+
+    Each dataset is a directory of Parquet files under `root`, hive-partitioned
+    as date=YYYY-MM-DD/env=.../algo=... (benchmarks by date/env). `export()`
+    appends what finished since the last export, tracked by a watermark file.
+    `scan()` reads only the requested columns; filters on partition keys skip
+    whole directories and filters on other columns skip row groups whose
+    min/max statistics cannot match.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        session_factory,
+        row_group_size: int = 50000,
+        benchmark_source: Optional[Callable[[Optional[str]], list]] = None,
+    ):
+        self.root = Path(root)
+        self.session_factory = session_factory
+        self.row_group_size = row_group_size
+        self.benchmark_source = benchmark_source
+        self.state_path = self.root / "_watermarks.json"
+
+    # -----------------------------
+    # Export
+    # -----------------------------
+    def export(self, batch_size: int = 1000) -> dict:
+        """Append runs finished (and benchmarks evaluated) since the last export. Returns rows written per dataset."""
+        state = self._load_state()
+        written = {"runs": 0, "epochs": 0, "benchmarks": 0}
+
+        while True:
+            runs, epochs, watermark = self._finished_runs(state.get("runs"), batch_size)
+            if not runs:
+                break
+            # Files are named after the batch's starting watermark: a crash before the
+            # new watermark is saved replaces the same batch instead of duplicating rows
+            batch = self._batch_name(state.get("runs"))
+            self._write("runs", runs, batch)
+            self._write("epochs", epochs, batch)
+            state["runs"] = watermark
+            self._save_state(state)
+            written["runs"] += len(runs)
+            written["epochs"] += len(epochs)
+            if len(runs) < batch_size:
+                break
+
+        if self.benchmark_source is not None:
+            # Watermark: [last evaluated_at, results exported with exactly that timestamp]
+            watermark = state.get("benchmarks") or [None, []]
+            if isinstance(watermark, str):
+                watermark = [watermark, None]  # older state file: everything at that instant was exported
+            after, exported = watermark
+            results = [
+                r for r in self.benchmark_source(after)
+                if r.get("evaluated_at")
+                and not (r["evaluated_at"] == after and (exported is None or self._result_key(r) in exported))
+            ]
+            if results:
+                batch = self._batch_name([after, len(exported or ())]) if after else self._batch_name(None)
+                self._write("benchmarks", [self._benchmark_row(r) for r in results], batch)
+                last = max(r["evaluated_at"] for r in results)
+                if last != after:
+                    exported = []
+                exported = exported + [self._result_key(r) for r in results if r["evaluated_at"] == last]
+                state["benchmarks"] = [last, exported]
+                self._save_state(state)
+                written["benchmarks"] = len(results)
+
+        log.info(f"Exported {written} to {self.root}")
+        return written
+
+    def _finished_runs(self, watermark: Optional[list], limit: int) -> tuple:
+        """Next batch of runs in (completed_at, id) order after `watermark`, with their epochs."""
+        with self.session_factory() as db:
+            stmt = select(TrainingRun).where(TrainingRun.completed_at.isnot(None))
+            if watermark:
+                after = (datetime.fromisoformat(watermark[0]), watermark[1])
+                stmt = stmt.where(tuple_(TrainingRun.completed_at, TrainingRun.id) > tuple_(*after))
+            runs = db.scalars(stmt.order_by(TrainingRun.completed_at, TrainingRun.id).limit(limit)).all()
+            if not runs:
+                return [], [], watermark
+
+            by_id = {run.id: run for run in runs}
+            epochs = db.scalars(select(EpochMetric).where(EpochMetric.run_id.in_(by_id))).all()
+            run_rows = [
+                {
+                    "run_id": run.id,
+                    "task_id": run.task_id,
+                    "experiment_id": run.experiment_id,
+                    "status": run.status,
+                    "total_epochs": run.total_epochs,
+                    "final_accuracy": run.final_accuracy,
+                    "started_at": run.started_at,
+                    "completed_at": run.completed_at,
+                    **self._partition(run.completed_at, run.env, run.algo),
+                }
+                for run in runs
+            ]
+            epoch_rows = [
+                {
+                    "run_id": m.run_id,
+                    "experiment_id": m.experiment_id,
+                    "epoch": m.epoch,
+                    "reward": m.reward,
+                    "recorded_at": m.recorded_at,
+                    # Epochs live next to their run so one partition filter covers both
+                    **self._partition(by_id[m.run_id].completed_at, by_id[m.run_id].env, by_id[m.run_id].algo),
+                }
+                for m in epochs
+            ]
+            last = runs[-1]
+            return run_rows, epoch_rows, [last.completed_at.isoformat(), last.id]
+
+    @staticmethod
+    def _batch_name(after) -> str:
+        """File name stem of the batch exported after watermark `after` (same on every retry)."""
+        if not after:
+            return "initial"
+        parts = after if isinstance(after, list) else [after]
+        return "after-" + "-".join(re.sub(r"[^0-9A-Za-z]+", "", str(part)) for part in parts)
+
+    @staticmethod
+    def _result_key(result: dict) -> str:
+        return f"{result.get('model_id')}:{result.get('env_name')}"
+
+    @staticmethod
+    def _partition(when: datetime, env: Optional[str], algo: Optional[str]) -> dict:
+        return {"date": when.date().isoformat(), "env": env or UNKNOWN, "algo": algo or UNKNOWN}
+
+    @staticmethod
+    def _benchmark_row(result: dict) -> dict:
+        evaluated_at = datetime.fromisoformat(result["evaluated_at"])
+        row = {name: result.get(name) for name in SCHEMAS["benchmarks"].names}
+        row.update(
+            evaluated_at=evaluated_at,
+            date=evaluated_at.date().isoformat(),
+            env=result.get("env_name") or UNKNOWN,
+        )
+        return row
+
+    def _write(self, dataset: str, rows: list, batch: str):
+        if not rows:
+            return
+        # A retried batch may spread over its partitions differently; drop what an
+        # interrupted attempt left behind (always under the same dates) first
+        for day in {row["date"] for row in rows}:
+            for stale in (self.root / dataset / f"date={day}").glob(f"**/part-{batch}-*.parquet"):
+                stale.unlink()
+        table = pa.Table.from_pylist(rows, schema=SCHEMAS[dataset])
+        table = table.sort_by([(key, "ascending") for key in SORT_KEYS[dataset]])
+        ds.write_dataset(
+            table,
+            self.root / dataset,
+            format="parquet",
+            partitioning=self._partitioning(dataset),
+            basename_template=f"part-{batch}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd", write_statistics=True),
+            max_rows_per_group=self.row_group_size,
+        )
+
+    def _load_state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state: dict):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.state_path)
+
+    # -----------------------------
+    # Query
+    # -----------------------------
+    @staticmethod
+    def _partitioning(dataset: str):
+        schema = SCHEMAS[dataset]
+        return ds.partitioning(pa.schema([schema.field(name) for name in PARTITIONS[dataset]]), flavor="hive")
+
+    def scan(
+        self,
+        dataset: str,
+        columns: Optional[list] = None,
+        env: Optional[str] = None,
+        algo: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        where: Optional[ds.Expression] = None,
+    ) -> pa.Table:
+        """
+        Rows of `dataset` with only `columns` (all if None). `env`, `algo` and
+        the inclusive `since`/`until` dates select partitions; `where` is any
+        further pyarrow expression, e.g. ds.field("experiment_id") == 7.
+        """
+        if dataset not in SCHEMAS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        if algo is not None and "algo" not in PARTITIONS[dataset]:
+            raise ValueError(f"Dataset {dataset} is not partitioned by algo")
+
+        conditions = [] if where is None else [where]
+        if env is not None:
+            conditions.append(ds.field("env") == env)
+        if algo is not None:
+            conditions.append(ds.field("algo") == algo)
+        if since is not None:
+            conditions.append(ds.field("date") >= since.isoformat())
+        if until is not None:
+            conditions.append(ds.field("date") <= until.isoformat())
+
+        path = self.root / dataset
+        if not path.exists():
+            schema = SCHEMAS[dataset]
+            return schema.empty_table().select(columns or schema.names)
+
+        data = ds.dataset(path, schema=SCHEMAS[dataset], format="parquet", partitioning=self._partitioning(dataset))
+        condition = None
+        for c in conditions:
+            condition = c if condition is None else condition & c
+        return data.to_table(columns=columns, filter=condition)
+
+    def leaderboard(
+        self,
+        env: Optional[str] = None,
+        algo: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        limit: int = 10,
+    ) -> list:
+        """Experiments ranked by their best successful run's final accuracy."""
+        table = self.scan(
+            "runs",
+            columns=["experiment_id", "env", "algo", "final_accuracy"],
+            env=env, algo=algo, since=since, until=until,
+            where=(ds.field("status") == "SUCCESS") & ds.field("final_accuracy").is_valid(),
+        )
+        if table.num_rows == 0:
+            return []
+        ranked = (
+            table.group_by(["experiment_id", "env", "algo"])
+            .aggregate([("final_accuracy", "max"), ("final_accuracy", "mean"), ("final_accuracy", "count")])
+            .sort_by([("final_accuracy_max", "descending"), ("experiment_id", "ascending")])
+            .slice(0, limit)
+        )
+        return [
+            {
+                "experiment_id": row["experiment_id"],
+                "env": row["env"],
+                "algo": row["algo"],
+                "best_accuracy": row["final_accuracy_max"],
+                "mean_accuracy": row["final_accuracy_mean"],
+                "runs": row["final_accuracy_count"],
+            }
+            for row in ranked.to_pylist()
+        ]
@@ -0,0 +1,108 @@
+# backend/fastapi_app/services/run_metrics.py
+import time
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from backend.fastapi_app.core.db import insert_updating_conflicts
+from shared.models.experiment_model import EpochMetric, TrainingRun
+from shared.utils.logger import get_logger
+
+log = get_logger("RunMetrics")
+
+
+class RunMetricsWriter:
+    """
+    Durable per-epoch metrics for one training task (tables training_runs / epoch_metrics).
+
+    Epochs are buffered and written with one multi-row upsert every
+    `flush_epochs` epochs or `flush_seconds`, whichever comes first, and on
+    `flush()` / `finish()`. Database errors are logged and never fail the
+    task; unwritten epochs stay buffered for the next attempt.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        flush_epochs: int = 10,
+        flush_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.session_factory = session_factory
+        self.flush_epochs = flush_epochs
+        self.flush_seconds = flush_seconds
+        self.clock = clock
+        self.run_id: Optional[int] = None
+        self.experiment_id: Optional[int] = None
+        self._buffer = {}  # {epoch: (reward, recorded_at)}
+        self._last_flush = clock()
+
+    def start_run(self, task_id: str, experiment_id: int, env: str, algo: str, total_epochs: int):
+        """Create the run row, or reopen it when the task resumes after a retry or redelivery."""
+        self.experiment_id = experiment_id
+        row = {
+            "task_id": task_id,
+            "experiment_id": experiment_id,
+            "env": env,
+            "algo": algo,
+            "status": "RUNNING",
+            "total_epochs": total_epochs,
+            "started_at": datetime.utcnow(),
+        }
+        try:
+            with self.session_factory() as db:
+                stmt = insert_updating_conflicts(
+                    TrainingRun.__table__, db.get_bind().dialect.name, ["task_id"], ["status"], [row]
+                )
+                db.execute(stmt)
+                self.run_id = db.scalar(select(TrainingRun.id).where(TrainingRun.task_id == task_id))
+                db.commit()
+        except SQLAlchemyError as e:
+            log.warning(f"Could not record training run {task_id}: {e}")
+
+    def record(self, epoch: int, reward: float):
+        self._buffer[epoch] = (reward, datetime.utcnow())
+        if len(self._buffer) >= self.flush_epochs or self.clock() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """Write buffered epochs in one statement."""
+        self._last_flush = self.clock()
+        if self.run_id is None or not self._buffer:
+            return
+        rows = [
+            {
+                "run_id": self.run_id,
+                "experiment_id": self.experiment_id,
+                "epoch": epoch,
+                "reward": reward,
+                "recorded_at": recorded_at,
+            }
+            for epoch, (reward, recorded_at) in sorted(self._buffer.items())
+        ]
+        try:
+            with self.session_factory() as db:
+                db.execute(insert_updating_conflicts(
+                    EpochMetric.__table__, db.get_bind().dialect.name,
+                    ["run_id", "epoch"], ["reward", "recorded_at"], rows,
+                ))
+                db.commit()
+            self._buffer.clear()
+        except SQLAlchemyError as e:
+            log.warning(f"Could not write {len(rows)} epoch metrics for run {self.run_id}: {e}")
+
+    def finish(self, status: str, final_accuracy: Optional[float] = None):
+        """Flush remaining epochs and close the run with its final status."""
+        self.flush()
+        if self.run_id is None:
+            return
+        try:
+            with self.session_factory() as db:
+                db.execute(
+                    update(TrainingRun)
+                    .where(TrainingRun.id == self.run_id)
+                    .values(status=status, final_accuracy=final_accuracy, completed_at=datetime.utcnow())
+                )
+                db.commit()
+        except SQLAlchemyError as e:
+            log.warning(f"Could not close training run {self.run_id}: {e}")
@@ -0,0 +1,331 @@
+# backend/fastapi_app/services/sweep_scheduler.py
+import asyncio
+import itertools
+import json
+import math
+import time
+import uuid
+from contextlib import aclosing
+from datetime import datetime
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from backend.fastapi_app.services.progress_broadcast import ProgressBroadcastService, TERMINAL_STATUSES
+from shared.utils.logger import get_logger
+
+log = get_logger("SweepScheduler")
+
+SWEEP_KEY = "resimhub:sweeps"
+SWEEP_LEASE_SECONDS = 60
+
+
+def expand_grid(grid: dict) -> list:
+    """{"lr": [1e-3, 1e-4], "gamma": [0.9]} → [{"lr": 1e-3, "gamma": 0.9}, {"lr": 1e-4, "gamma": 0.9}]"""
+    if not grid:
+        return [{}]
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+class SuccessiveHalving:
+    """
+    Asynchronous successive halving (ASHA-style) over trials that train continuously.
+
+    Rungs sit at min_epochs * eta**k below max_epochs. When a trial reaches a rung
+    its score (mean reward so far) is ranked against every trial that reached that
+    rung before it; it keeps training only if it ranks in the top 1/eta of them,
+    otherwise it is stopped. Trials cannot pause at a rung, so decisions are made
+    on arrival; in expectation 1/eta of each rung's entrants are promoted.
+    """
+
+    def __init__(self, trial_ids: list, min_epochs: int, max_epochs: int, eta: int = 3):
+        self.eta = eta
+        self.max_epochs = max_epochs
+        self.rungs = []
+        epoch = min_epochs
+        while epoch < max_epochs:
+            self.rungs.append(epoch)
+            epoch *= eta
+
+        self.trials = {
+            tid: {"status": "RUNNING", "rung": -1, "epoch": 0, "rewards": [], "score": None}
+            for tid in trial_ids
+        }
+        # Per rung: [(trial_id, score)] in arrival order, plus promoted trial ids
+        self.rung_results = [[] for _ in self.rungs]
+        self.rung_promoted = [[] for _ in self.rungs]
+
+    def _quota(self, rung: int) -> int:
+        """Expected trials past `rung`: the cohort size divided by eta once per rung."""
+        quota = len(self.trials)
+        for _ in range(rung + 1):
+            quota = max(1, math.ceil(quota / self.eta))
+        return quota
+
+    def record(self, trial_id: str, epoch: int, reward: float) -> Optional[str]:
+        """
+        Feed one progress update. Returns "promote" or "stop" when the trial
+        crosses a rung, otherwise None. Epochs skipped by throttled reporting
+        are fine: the first update at or past a rung epoch triggers the decision.
+        """
+        trial = self.trials.get(trial_id)
+        if trial is None or trial["status"] != "RUNNING" or epoch <= trial["epoch"]:
+            return None
+        trial["epoch"] = epoch
+        trial["rewards"].append(reward)
+        trial["score"] = round(sum(trial["rewards"]) / len(trial["rewards"]), 4)
+
+        next_rung = trial["rung"] + 1
+        if next_rung >= len(self.rungs) or epoch < self.rungs[next_rung]:
+            return None
+
+        trial["rung"] = next_rung
+        results = self.rung_results[next_rung]
+        results.append((trial_id, trial["score"]))
+        rank = sorted((s for _, s in results), reverse=True).index(trial["score"])
+        keep = max(1, math.ceil(len(results) / self.eta))
+
+        if rank < keep:
+            self.rung_promoted[next_rung].append(trial_id)
+            return "promote"
+        trial["status"] = "STOPPED"
+        return "stop"
+
+    def finish(self, trial_id: str, status: str):
+        trial = self.trials.get(trial_id)
+        if trial and trial["status"] == "RUNNING":
+            trial["status"] = status
+
+    @property
+    def done(self) -> bool:
+        return all(t["status"] != "RUNNING" for t in self.trials.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "eta": self.eta,
+            "max_epochs": self.max_epochs,
+            "rungs": [
+                {
+                    "epoch": epoch,
+                    "quota": self._quota(i),
+                    "results": [{"task_id": tid, "score": score} for tid, score in self.rung_results[i]],
+                    "promoted": list(self.rung_promoted[i]),
+                }
+                for i, epoch in enumerate(self.rungs)
+            ],
+            "trials": {
+                tid: {k: v for k, v in t.items() if k != "rewards"}
+                for tid, t in self.trials.items()
+            },
+        }
+
+
+class LocalSweepStore:
+    """
+    In-memory stand-in for the Redis commands SweepScheduler uses, for the
+    local executor where sweeps live and die with the single API process.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._sets = {}
+        self._expires = {}
+
+    def _alive(self, key: str) -> bool:
+        if key in self._expires and self._expires[key] <= time.monotonic():
+            self._values.pop(key, None)
+            del self._expires[key]
+        return key in self._values
+
+    async def get(self, key: str):
+        return self._values.get(key) if self._alive(key) else None
+
+    async def set(self, key: str, value, nx: bool = False, ex: Optional[int] = None):
+        if nx and self._alive(key):
+            return None
+        self._values[key] = value
+        self._expires.pop(key, None)
+        if ex:
+            self._expires[key] = time.monotonic() + ex
+        return True
+
+    async def expire(self, key: str, seconds: int):
+        if self._alive(key):
+            self._expires[key] = time.monotonic() + seconds
+
+    async def delete(self, key: str):
+        self._values.pop(key, None)
+        self._expires.pop(key, None)
+
+    async def sadd(self, key: str, member: str):
+        self._sets.setdefault(key, set()).add(member)
+
+    async def srem(self, key: str, member: str):
+        self._sets.get(key, set()).discard(member)
+
+    async def smembers(self, key: str) -> set:
+        return set(self._sets.get(key, ()))
+
+
+class SweepScheduler:
+    """
+    Runs successive-halving sweeps on top of the training executor.
+
+    A sweep submits one training task per hyperparameter config, follows each
+    task's progress stream, and stops trials that fall below the rung cut.
+    Sweep state is stored in Redis (or `store`) so any API process can report
+    it; the process holding the sweep's lease drives it. Every process polls
+    for active sweeps whose lease has expired (`watch`), so a sweep whose
+    driver died is taken over by a surviving or restarted process.
+    """
+
+    def __init__(self, broadcast: ProgressBroadcastService, submit, stop, store=None):
+        self.broadcast = broadcast
+        self.submit = submit  # sync, returns the task id; see TaskExecutor.submit_training
+        self.stop = stop      # sync, see TaskExecutor.cancel
+        self._store = store   # defaults to the broadcast service's Redis connection
+        self._running = {}    # {sweep_id: asyncio.Task}
+        self._watcher = None
+        self.owner = uuid.uuid4().hex
+
+    @property
+    def store(self):
+        return self._store if self._store is not None else self.broadcast.redis
+
+    @staticmethod
+    def _key(sweep_id: str) -> str:
+        return f"{SWEEP_KEY}:{sweep_id}"
+
+    async def start(self, experiment_id: int, env_name: str, algo: str, configs: list,
+                    min_epochs: int, max_epochs: int, eta: int, priority: Optional[int] = None) -> dict:
+        sweep_id = f"swp_{uuid.uuid4().hex[:8]}"
+        trials = []
+        for hyperparams in configs:
+            task_id = await run_in_threadpool(
+                self.submit, experiment_id, env_name, algo,
+                priority=priority, total_epochs=max_epochs, hyperparams=hyperparams, sweep_id=sweep_id,
+            )
+            trials.append({"task_id": task_id, "hyperparams": hyperparams})
+
+        sweep = {
+            "sweep_id": sweep_id,
+            "experiment_id": experiment_id,
+            "env_name": env_name,
+            "algo": algo,
+            "min_epochs": min_epochs,
+            "max_epochs": max_epochs,
+            "eta": eta,
+            "status": "RUNNING",
+            "created_at": datetime.utcnow().isoformat(),
+            "trials": trials,
+        }
+        halving = SuccessiveHalving([t["task_id"] for t in trials], min_epochs, max_epochs, eta)
+        await self._save(sweep, halving)
+        await self.store.sadd(f"{SWEEP_KEY}:active", sweep_id)
+        log.info(f"Sweep {sweep_id} started with {len(trials)} trials (eta={eta}, epochs {min_epochs}..{max_epochs})")
+
+        await self._attach(sweep, halving)
+        return await self.get(sweep_id)
+
+    async def get(self, sweep_id: str) -> Optional[dict]:
+        raw = await self.store.get(self._key(sweep_id))
+        return json.loads(raw) if raw else None
+
+    async def resume(self):
+        """Pick up active sweeps whose driving process went away (lease expired)."""
+        for sweep_id in await self.store.smembers(f"{SWEEP_KEY}:active"):
+            sweep = await self.get(sweep_id)
+            if not sweep or sweep_id in self._running:
+                continue
+            halving = SuccessiveHalving(
+                [t["task_id"] for t in sweep["trials"]],
+                sweep["min_epochs"],
+                sweep["max_epochs"],
+                sweep["eta"],
+            )
+            stopped = {
+                tid for tid, t in sweep.get("halving", {}).get("trials", {}).items()
+                if t["status"] == "STOPPED"
+            }
+            # Progress streams replay from the start, so rung decisions are rebuilt from events
+            await self._attach(sweep, halving, already_stopped=stopped)
+
+    def watch(self, interval: float = SWEEP_LEASE_SECONDS):
+        """Run `resume` now and then every `interval` seconds in the background."""
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch(interval))
+
+    async def _watch(self, interval: float):
+        while True:
+            try:
+                await self.resume()
+            except Exception as exc:
+                log.warning(f"Resuming sweeps failed: {exc}")
+            await asyncio.sleep(interval)
+
+    async def close(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+        running = list(self._running.values())
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        self._running.clear()
+
+    async def _attach(self, sweep: dict, halving: SuccessiveHalving, already_stopped=()):
+        lease = await self.store.set(
+            f"{self._key(sweep['sweep_id'])}:lease", self.owner, nx=True, ex=SWEEP_LEASE_SECONDS
+        )
+        if not lease:
+            return
+        self._running[sweep["sweep_id"]] = asyncio.create_task(self._drive(sweep, halving, set(already_stopped)))
+
+    async def _drive(self, sweep: dict, halving: SuccessiveHalving, already_stopped: set):
+        sweep_id = sweep["sweep_id"]
+        events = asyncio.Queue()
+
+        async def follow(task_id: str):
+            async with aclosing(self.broadcast.subscribe(task_id)) as updates:
+                async for event_id, data in updates:
+                    await events.put((task_id, event_id, data))
+                    if event_id and json.loads(data).get("status") in TERMINAL_STATUSES:
+                        break
+
+        followers = [asyncio.create_task(follow(t["task_id"])) for t in sweep["trials"]]
+        try:
+            while not halving.done:
+                task_id, event_id, data = await events.get()
+                await self.store.expire(f"{self._key(sweep_id)}:lease", SWEEP_LEASE_SECONDS)
+                if event_id is None:
+                    continue  # heartbeat
+
+                meta = json.loads(data)
+                status = meta.get("status")
+                if status in TERMINAL_STATUSES:
+                    halving.finish(task_id, status)
+                elif "epoch" in meta and "reward" in meta:
+                    decision = halving.record(task_id, int(meta["epoch"]), float(meta["reward"]))
+                    if decision == "stop" and task_id not in already_stopped:
+                        log.info(f"Sweep {sweep_id}: stopping {task_id} at epoch {meta['epoch']}")
+                        await run_in_threadpool(self.stop, task_id)
+                    elif decision == "promote":
+                        log.info(f"Sweep {sweep_id}: promoting {task_id} past epoch {meta['epoch']}")
+                else:
+                    continue
+                await self._save(sweep, halving)
+
+            sweep["status"] = "COMPLETED"
+            await self._save(sweep, halving)
+            await self.store.srem(f"{SWEEP_KEY}:active", sweep_id)
+            log.info(f"Sweep {sweep_id} completed")
+        finally:
+            for follower in followers:
+                follower.cancel()
+            await self.store.delete(f"{self._key(sweep_id)}:lease")
+            self._running.pop(sweep_id, None)
+
+    async def _save(self, sweep: dict, halving: SuccessiveHalving):
+        sweep["halving"] = halving.to_dict()
+        sweep["updated_at"] = datetime.utcnow().isoformat()
+        await self.store.set(self._key(sweep["sweep_id"]), json.dumps(sweep))
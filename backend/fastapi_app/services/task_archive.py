@@ -0,0 +1,128 @@
+# backend/fastapi_app/services/task_archive.py
+import json
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from backend.fastapi_app.core.db import insert_updating_conflicts
+from shared.models.task_archive_model import ArchivedTask
+from shared.utils.logger import get_logger
+
+log = get_logger("TaskArchive")
+
+# Columns replaced when a task is archived again
+UPSERT_COLUMNS = [c.name for c in ArchivedTask.__table__.columns if c.name != "task_id"]
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _parse_int(value) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TaskArchive:
+    """
+    SQL history of finished tasks (table `task_archive`).
+
+    The archival job moves task table entries and final results here before
+    their Redis copies expire; lookups that miss Redis fall back to it.
+    Stored records are the Redis hashes verbatim, so callers cannot tell
+    where a record came from.
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    def ensure_table(self, engine):
+        ArchivedTask.__table__.create(bind=engine, checkfirst=True)
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def store(self, entries: list) -> int:
+        """
+        Insert or replace archived tasks with one multi-row upsert.
+        `entries` holds (task_id, record, result) tuples; archiving a task twice is harmless.
+        """
+        if not entries:
+            return 0
+        rows = {}
+        for task_id, record, result in entries:
+            rows[task_id] = {
+                "task_id": task_id,
+                "experiment_id": _parse_int(record.get("experiment_id")),
+                "status": record.get("status"),
+                "env": record.get("env"),
+                "algo": record.get("algo"),
+                "queue": record.get("queue"),
+                "client_id": record.get("client_id"),
+                "sweep_id": record.get("sweep_id"),
+                "created_at": _parse_timestamp(record.get("created_at")),
+                "completed_at": _parse_timestamp(record.get("completed_at")),
+                "record": json.dumps(record),
+                "result": json.dumps(result, default=str) if result is not None else None,
+                "archived_at": datetime.utcnow(),
+            }
+        with self.session_factory() as db:
+            db.execute(insert_updating_conflicts(
+                ArchivedTask.__table__, db.get_bind().dialect.name,
+                ["task_id"], UPSERT_COLUMNS, list(rows.values()),
+            ))
+            db.commit()
+        return len(rows)
+
+    # -----------------------------
+    # Reads (fallback for Redis misses)
+    # -----------------------------
+    def get(self, task_id: str) -> dict:
+        try:
+            with self.session_factory() as db:
+                row = db.get(ArchivedTask, task_id)
+        except SQLAlchemyError as e:
+            log.warning(f"Task archive unavailable: {e}")
+            return {}
+        return json.loads(row.record) if row else {}
+
+    def get_states(self, task_ids: list) -> dict:
+        """Final (status, result) of archived tasks, keyed by task id; unknown ids are omitted."""
+        if not task_ids:
+            return {}
+        try:
+            with self.session_factory() as db:
+                rows = (
+                    db.query(ArchivedTask.task_id, ArchivedTask.status, ArchivedTask.result)
+                    .filter(ArchivedTask.task_id.in_(task_ids))
+                    .all()
+                )
+        except SQLAlchemyError as e:
+            log.warning(f"Task archive unavailable: {e}")
+            return {}
+        return {
+            task_id: (status, json.loads(result) if result else None)
+            for task_id, status, result in rows
+        }
+
+    def iter_records(self, batch_size: int = 500):
+        """
+        Every archived task as {"task_id", "record", "result"}, in task id order,
+        yielded in lists of up to `batch_size` read through a server-side cursor.
+        """
+        with self.session_factory() as db:
+            result = db.execute(
+                select(ArchivedTask.task_id, ArchivedTask.record, ArchivedTask.result)
+                .order_by(ArchivedTask.task_id)
+                .execution_options(yield_per=batch_size)
+            )
+            for rows in result.partitions():
+                yield [
+                    {"task_id": task_id, "record": json.loads(record), "result": json.loads(res) if res else None}
+                    for task_id, record, res in rows
+                ]
@@ -0,0 +1,54 @@
+# backend/fastapi_app/services/task_context.py
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task body once it has recorded its own cancellation."""
+
+
+class TaskContext(ABC):
+    """
+    What a task body needs from the executor running it.
+
+    Training code talks only to this interface, so the same loop runs on a
+    Celery worker (CeleryTaskContext, Redis-backed) or in the local process
+    pool (LocalTaskContext, reporting back to the API process).
+    """
+
+    task_id: str
+
+    @abstractmethod
+    def update_state(self, state: str, meta: dict):
+        """Latest status/info as reported by status lookups (Celery result state)."""
+
+    @abstractmethod
+    def publish(self, meta: dict):
+        """Append a progress event for stream subscribers."""
+
+    @abstractmethod
+    def record(self, data: dict):
+        """Merge fields into the task table entry."""
+
+    @abstractmethod
+    def cancel_requested(self) -> bool:
+        """True once cancellation of this task has been requested."""
+
+    def begin(self, experiment_id: int):
+        """Called before the first unit of work; may requeue the task."""
+
+    def safe_point(self, experiment_id: int, epoch: int, total_epochs: int, checkpoint: Optional[callable] = None):
+        """
+        Called between units of work, after the cancellation check. Executors
+        that can reschedule work use it to yield the slot (after `checkpoint()`).
+        """
+
+    def cancel(self, meta: dict):
+        """Record the task as REVOKED everywhere and stop the task body."""
+        now = datetime.utcnow().isoformat()
+        meta = {**meta, "status": "REVOKED", "timestamp": now}
+        self.update_state("REVOKED", meta)
+        self.publish(meta)
+        self.record({"status": "REVOKED", "completed_at": now})
+        raise TaskCancelled(self.task_id)
@@ -0,0 +1,112 @@
+# backend/fastapi_app/services/task_control.py
+import time
+from typing import Optional
+from shared.utils.logger import get_logger
+
+log = get_logger("TaskControl")
+
+CONTROL_KEY = "resimhub:control"
+
+
+class TaskControl:
+    """
+    Redis signals that running tasks poll between units of work.
+
+      - resimhub:control:cancel:{task_id}       → cooperative cancellation flag
+      - resimhub:control:waiting:{queue}        → queued tasks, score = priority (0 first)
+      - resimhub:control:waiting:{queue}:since  → same tasks, score = enqueue time
+      - resimhub:control:preempt:{task_id}      → claim so one waiting task frees one slot
+
+    A running task checks `cancel_requested` and `preemption_target` at safe
+    points (between epochs), checkpoints, and exits or requeues itself.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        cancel_ttl_seconds: int = 86400,
+        stale_after_seconds: int = 3600,
+        claim_ttl_seconds: int = 60,
+    ):
+        self.redis = redis_client
+        self.cancel_ttl_seconds = cancel_ttl_seconds
+        # A claimed waiting task that has not started after this may claim another slot
+        self.claim_ttl_seconds = claim_ttl_seconds
+        # Waiting entries older than this belong to lost messages and are ignored
+        self.stale_after_seconds = stale_after_seconds
+
+    # -----------------------------
+    # Key helpers
+    # -----------------------------
+    @staticmethod
+    def cancel_key(task_id: str) -> str:
+        return f"{CONTROL_KEY}:cancel:{task_id}"
+
+    @staticmethod
+    def waiting_key(queue: str) -> str:
+        return f"{CONTROL_KEY}:waiting:{queue}"
+
+    # -----------------------------
+    # Cancellation
+    # -----------------------------
+    def request_cancel(self, task_id: str):
+        self.redis.set(self.cancel_key(task_id), 1, ex=self.cancel_ttl_seconds)
+
+    def cancel_requested(self, task_id: str) -> bool:
+        return bool(self.redis.exists(self.cancel_key(task_id)))
+
+    # -----------------------------
+    # Waiting set (preemption)
+    # -----------------------------
+    def mark_waiting(self, queue: str, task_id: str, priority: int):
+        key = self.waiting_key(queue)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zadd(key, {task_id: priority})
+        pipe.zadd(f"{key}:since", {task_id: time.time()})
+        pipe.execute()
+
+    def mark_started(self, queue: str, task_id: str):
+        key = self.waiting_key(queue)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zrem(key, task_id)
+        pipe.zrem(f"{key}:since", task_id)
+        pipe.execute()
+
+    def oldest_wait_seconds(self, queue: str) -> float:
+        """How long the longest-waiting (non-stale) task on `queue` has been queued; 0 if none."""
+        now = time.time()
+        oldest = self.redis.zrangebyscore(
+            f"{self.waiting_key(queue)}:since", now - self.stale_after_seconds, "+inf",
+            start=0, num=1, withscores=True,
+        )
+        return max(0.0, now - oldest[0][1]) if oldest else 0.0
+
+    def preemption_target(self, queue: str, priority: int, grace_seconds: float) -> Optional[str]:
+        """
+        Return a waiting task on `queue` that should take this task's slot, or None.
+
+        Candidates have a strictly better priority (lower number) and have waited
+        at least `grace_seconds`, i.e. no free worker picked them up. The candidate
+        is claimed atomically, so concurrent running tasks never all yield to it.
+        """
+        key = self.waiting_key(queue)
+        now = time.time()
+
+        read = self.redis.pipeline(transaction=False)
+        read.zremrangebyscore(f"{key}:since", "-inf", now - self.stale_after_seconds)
+        read.zrangebyscore(key, "-inf", f"({priority}", start=0, num=10)
+        _, candidates = read.execute()
+        if not candidates:
+            return None
+
+        enqueued = self.redis.zmscore(f"{key}:since", candidates)
+        for task_id, since in zip(candidates, enqueued):
+            if since is None:
+                self.redis.zrem(key, task_id)  # pruned as stale above
+                continue
+            if now - since < grace_seconds:
+                continue
+            claimed = self.redis.set(f"{CONTROL_KEY}:preempt:{task_id}", 1, nx=True, ex=self.claim_ttl_seconds)
+            if claimed:
+                return task_id
+        return None
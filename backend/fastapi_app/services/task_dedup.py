@@ -0,0 +1,109 @@
+# backend/fastapi_app/services/task_dedup.py
+import hashlib
+import json
+from typing import Optional
+import redis
+from shared.utils.logger import get_logger
+
+log = get_logger("TaskDedup")
+
+DEDUP_KEY = "resimhub:dedup"
+
+
+def derive_idempotency_key(experiment_id: int, env_name: str, algo: str, **params) -> str:
+    """Stable key for a submission payload, used when the client sends no Idempotency-Key."""
+    payload = {"experiment_id": experiment_id, "env": env_name, "algo": algo, **params}
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    return f"payload:{digest[:32]}"
+
+
+def submission_dedupe_key(
+    experiment_id: int,
+    env_name: str,
+    algo: str,
+    idempotency_key: Optional[str] = None,
+    client_id: Optional[str] = None,
+    **params,
+) -> str:
+    """Explicit keys are scoped to the client; otherwise the key is derived from the payload."""
+    if idempotency_key:
+        return f"client:{client_id}:{idempotency_key}" if client_id else f"key:{idempotency_key}"
+    return derive_idempotency_key(experiment_id, env_name, algo, **params)
+
+
+class TaskDeduplicator:
+    """
+    Redis records that keep duplicate training work off the workers.
+
+      - resimhub:dedup:submission:{key}       → task id first submitted under the key
+      - resimhub:dedup:experiment:{id}:lock   → task id currently training the experiment
+
+    Submissions are claimed with SET NX, so concurrent duplicates agree on a single
+    task id. The experiment lock is a lease owned by one task id and renewed while
+    it trains; releases only delete records still owned by the caller.
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    @staticmethod
+    def submission_key(key: str) -> str:
+        return f"{DEDUP_KEY}:submission:{key}"
+
+    @staticmethod
+    def lock_key(experiment_id) -> str:
+        return f"{DEDUP_KEY}:experiment:{experiment_id}:lock"
+
+    # -----------------------------
+    # Idempotent submissions
+    # -----------------------------
+    def claim(self, key: str, task_id: str, ttl_seconds: int) -> Optional[str]:
+        """
+        Record `task_id` under `key`. Returns None if the claim succeeded,
+        otherwise the id of the task already submitted under the key.
+        """
+        name = self.submission_key(key)
+        for _ in range(2):
+            if self.redis.set(name, task_id, nx=True, ex=ttl_seconds):
+                return None
+            existing = self.redis.get(name)
+            if existing is not None:
+                return existing
+            # The record expired between SET and GET; try once more
+        return None
+
+    def release(self, key: str, task_id: str):
+        self._delete_if_owner(self.submission_key(key), task_id)
+
+    # -----------------------------
+    # Per-experiment lock
+    # -----------------------------
+    def acquire_experiment(self, experiment_id, task_id: str, ttl_seconds: int) -> bool:
+        """Take, renew or re-take (after a redelivery) the experiment lease for `task_id`."""
+        name = self.lock_key(experiment_id)
+        if self.redis.set(name, task_id, nx=True, ex=ttl_seconds):
+            return True
+        if self.redis.get(name) == task_id:
+            self.redis.expire(name, ttl_seconds)
+            return True
+        return False
+
+    def experiment_holder(self, experiment_id) -> Optional[str]:
+        return self.redis.get(self.lock_key(experiment_id))
+
+    def release_experiment(self, experiment_id, task_id: str):
+        self._delete_if_owner(self.lock_key(experiment_id), task_id)
+
+    def _delete_if_owner(self, name: str, owner: str) -> bool:
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(name)
+                if pipe.get(name) != owner:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.delete(name)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
@@ -0,0 +1,360 @@
+# backend/fastapi_app/services/task_registry.py
+import json
+import threading
+import time
+from typing import Optional
+from shared.utils.logger import get_logger
+from shared.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+log = get_logger("TaskRegistry")
+
+# Task hashes live under resimhub:tasks:{task_id}
+TASK_TABLE_KEY = "resimhub:tasks"
+
+# Sorted-set indexes (score = registration time) so listings never SCAN the keyspace
+TASK_INDEX_KEY = "resimhub:task_index"
+
+# Filterable fields → index facet name. Order is the preferred primary index
+# when several filters are combined (most selective first).
+INDEXED_FIELDS = {
+    "experiment_id": "experiment",
+    "status": "status",
+    "env": "env",
+    "algo": "algo",
+}
+
+
+# Statuses after which a task record no longer changes
+FINISHED_STATUSES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+
+def _final_result(status: str, info):
+    """A finished task's result as the archive stores it (non-JSON values as strings)."""
+    if status not in FINISHED_STATUSES or info is None:
+        return None
+    return json.loads(json.dumps(info, default=str))
+
+
+def _batch_states(tasks: list, task_states) -> list:
+    if task_states is None or not tasks:
+        return [(None, None)] * len(tasks)
+    return task_states([task["task_id"] for task in tasks])
+
+
+def _listing_filters(status, experiment_id, env, algo) -> dict:
+    """Non-empty listing filters as stored strings, most selective first."""
+    filters = {
+        "experiment_id": experiment_id,
+        "status": status.upper() if status else None,
+        "env": env,
+        "algo": algo,
+    }
+    return {k: str(v) for k, v in filters.items() if v is not None}
+
+
+class TaskRegistry:
+    """
+    Redis-backed task table with time-ordered and per-field indexes.
+
+    Every write goes through `upsert`, which keeps the hash and its indexes
+    in step:
+      - resimhub:task_index                     → all tasks, newest last
+      - resimhub:task_index:status:{STATUS}     → moved when status changes
+      - resimhub:task_index:{facet}:{value}     → experiment / env / algo
+
+    Finished tasks expire after `record_ttl_seconds`; the archival job moves
+    them to `archive` (a TaskArchive) first, and `get` falls back to it.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        max_scan_factor: int = 10,
+        record_ttl_seconds: Optional[int] = None,
+        archive=None,
+    ):
+        self.redis = redis_client
+        # Upper bound on index entries inspected per page when filters are combined
+        self.max_scan_factor = max_scan_factor
+        self.record_ttl_seconds = record_ttl_seconds
+        self.archive = archive
+
+    # -----------------------------
+    # Key helpers
+    # -----------------------------
+    @staticmethod
+    def task_key(task_id: str) -> str:
+        return f"{TASK_TABLE_KEY}:{task_id}"
+
+    @staticmethod
+    def index_key(field: Optional[str] = None, value=None) -> str:
+        if field is None:
+            return TASK_INDEX_KEY
+        return f"{TASK_INDEX_KEY}:{INDEXED_FIELDS[field]}:{value}"
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def upsert(self, task_id: str, data: dict):
+        """
+        Merge `data` into the task hash and update its indexes.
+        The hash is WATCHed while its previous status is read, so two writers
+        changing the status concurrently retry instead of leaving the task in
+        two status indexes.
+        """
+        key = self.task_key(task_id)
+        data = {k: v for k, v in data.items() if v is not None}
+
+        def write(pipe):
+            previous_status = pipe.hget(key, "status")
+            score = pipe.zscore(TASK_INDEX_KEY, task_id)
+            if score is None:
+                score = time.time()
+
+            pipe.multi()
+            pipe.hset(key, mapping=data)
+            pipe.zadd(TASK_INDEX_KEY, {task_id: score}, nx=True)
+
+            new_status = data.get("status")
+            if new_status and new_status != previous_status:
+                if previous_status:
+                    pipe.zrem(self.index_key("status", previous_status), task_id)
+                pipe.zadd(self.index_key("status", new_status), {task_id: score})
+                if self.record_ttl_seconds and new_status in FINISHED_STATUSES:
+                    pipe.expire(key, self.record_ttl_seconds)
+
+            for field in ("experiment_id", "env", "algo"):
+                if field in data:
+                    pipe.zadd(self.index_key(field, data[field]), {task_id: score}, nx=True)
+
+        self.redis.transaction(write, key)
+
+    def remove(self, task_id: str, record: dict):
+        """Delete a task hash and its index entries (`record` names the facets it was indexed under)."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(self.task_key(task_id))
+        pipe.zrem(TASK_INDEX_KEY, task_id)
+        for field in INDEXED_FIELDS:
+            if record.get(field) is not None:
+                pipe.zrem(self.index_key(field, record[field]), task_id)
+        pipe.execute()
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def get(self, task_id: str) -> dict:
+        record = self.redis.hgetall(self.task_key(task_id))
+        if not record and self.archive is not None:
+            return self.archive.get(task_id)
+        return record or {}
+
+    def finished_before(self, cutoff: float, limit: int) -> list:
+        """
+        Up to `limit` finished tasks registered before `cutoff` (epoch seconds),
+        as (task_id, status, record) tuples. A task whose hash already expired
+        comes back with an empty record.
+        """
+        found = []
+        for status in sorted(FINISHED_STATUSES):
+            remaining = limit - len(found)
+            if remaining <= 0:
+                break
+            ids = self.redis.zrangebyscore(
+                self.index_key("status", status), "-inf", cutoff, start=0, num=remaining
+            )
+            found.extend((task_id, status) for task_id in ids)
+
+        pipe = self.redis.pipeline(transaction=False)
+        for task_id, _ in found:
+            pipe.hgetall(self.task_key(task_id))
+        records = pipe.execute() if found else []
+        return [(task_id, status, record) for (task_id, status), record in zip(found, records)]
+
+    def list_tasks(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        experiment_id: Optional[int] = None,
+        env: Optional[str] = None,
+        algo: Optional[str] = None,
+    ) -> dict:
+        """
+        Return one page of tasks, newest first.
+
+        The most selective filter picks the index that is paged; any remaining
+        filters are checked against the task hashes fetched in the same
+        pipeline. At most `limit * max_scan_factor` index entries are inspected
+        per call, so a page may come back short with a `next_cursor` when the
+        combined filters are sparse.
+        """
+        # Tasks registered in the same instant share a score: the cursor carries the
+        # task id too, and ties come back in descending member order
+        bound, after_id = ("+inf", None) if cursor is None else self._decode_cursor(cursor)
+        offset = 0
+
+        filters = _listing_filters(status, experiment_id, env, algo)
+
+        primary = next(iter(filters), None)
+        index = self.index_key(primary, filters[primary]) if primary else self.index_key()
+        residual = {k: v for k, v in filters.items() if k != primary}
+
+        tasks = []
+        last = None
+        exhausted = False
+        budget = limit if not residual else limit * self.max_scan_factor
+
+        while len(tasks) < limit and budget > 0:
+            requested = min(budget, limit)
+            batch = self.redis.zrevrangebyscore(
+                index, bound, "-inf", start=offset, num=requested, withscores=True
+            )
+            exhausted = len(batch) < requested
+            # Ties at or before the cursor were returned already
+            fresh = [
+                (task_id, score) for task_id, score in batch
+                if after_id is None or score != float(bound) or task_id < after_id
+            ]
+            budget -= len(fresh)
+
+            pipe = self.redis.pipeline(transaction=False)
+            for task_id, _ in fresh:
+                pipe.hgetall(self.task_key(task_id))
+            records = pipe.execute()
+
+            for (task_id, score), record in zip(fresh, records):
+                last = (score, task_id)
+                if not record:
+                    continue  # hash expired or archived; index entry is stale
+                if any(record.get(k) != v for k, v in residual.items()):
+                    continue
+                tasks.append({"task_id": task_id, **record})
+                if len(tasks) == limit:
+                    exhausted = False
+                    break
+            if exhausted or len(tasks) == limit:
+                break
+
+            # Continue from the last entry inclusively, offset past the ties already read
+            last_id, last_score = batch[-1]
+            if last_score == float(bound):
+                offset += len(batch)
+                after_id = last_id if after_id is None else min(after_id, last_id)
+            else:
+                offset = sum(1 for _, score in batch if score == last_score)
+                bound, after_id = last_score, last_id
+
+        next_cursor = None
+        if not exhausted and last is not None:
+            next_cursor = self._encode_cursor(*last)
+
+        return {"count": len(tasks), "tasks": tasks, "next_cursor": next_cursor}
+
+    def iter_records(self, batch_size: int = 500, task_states=None):
+        """
+        Every task as {"task_id", "record", "result"}: live tasks newest first,
+        then archived ones whose Redis copy is gone. One batch in memory at a time.
+        `task_states` (TaskExecutor.task_states) supplies the results of finished
+        live tasks, one call per batch; without it their result is None.
+        """
+        cursor = None
+        while True:
+            page = self.list_tasks(limit=batch_size, cursor=cursor)
+            states = _batch_states(page["tasks"], task_states)
+            for task, (status, info) in zip(page["tasks"], states):
+                task_id = task.pop("task_id")
+                yield {"task_id": task_id, "record": task, "result": _final_result(status, info)}
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        if self.archive is None:
+            return
+        for batch in self.archive.iter_records(batch_size):
+            pipe = self.redis.pipeline(transaction=False)
+            for entry in batch:
+                pipe.exists(self.task_key(entry["task_id"]))
+            for entry, live in zip(batch, pipe.execute()):
+                if not live:
+                    yield entry
+
+    # -----------------------------
+    # Cursor encoding
+    # -----------------------------
+    @staticmethod
+    def _encode_cursor(score: float, task_id: str) -> str:
+        return encode_cursor([float(score), task_id])
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        score, task_id = decode_cursor(cursor, ("score", "task_id"))
+        if not isinstance(score, (int, float)) or not isinstance(task_id, str):
+            raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+        return float(score), task_id
+
+
+class LocalTaskRegistry:
+    """
+    In-memory task table with the TaskRegistry interface, used by the local
+    executor. Values are stored as strings, as they come back from Redis.
+    """
+
+    archive = None
+
+    def __init__(self):
+        self._tasks = {}   # {task_id: {field: value}}
+        self._scores = {}  # {task_id: registration time}
+        self._lock = threading.Lock()
+
+    def upsert(self, task_id: str, data: dict):
+        data = {k: str(v) for k, v in data.items() if v is not None}
+        with self._lock:
+            self._tasks.setdefault(task_id, {}).update(data)
+            self._scores.setdefault(task_id, time.time())
+
+    def get(self, task_id: str) -> dict:
+        with self._lock:
+            return dict(self._tasks.get(task_id, {}))
+
+    def list_tasks(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        experiment_id: Optional[int] = None,
+        env: Optional[str] = None,
+        algo: Optional[str] = None,
+    ) -> dict:
+        """Same paging contract as TaskRegistry.list_tasks (newest first, (score, task id) cursor)."""
+        after = (float("inf"), "") if cursor is None else TaskRegistry._decode_cursor(cursor)
+        filters = _listing_filters(status, experiment_id, env, algo)
+
+        with self._lock:
+            candidates = sorted(
+                ((score, task_id) for task_id, score in self._scores.items() if (score, task_id) < after),
+                reverse=True,
+            )
+            tasks = []
+            next_cursor = None
+            for position, (score, task_id) in enumerate(candidates):
+                record = self._tasks[task_id]
+                if any(record.get(k) != v for k, v in filters.items()):
+                    continue
+                tasks.append({"task_id": task_id, **record})
+                if len(tasks) == limit:
+                    if position + 1 < len(candidates):
+                        next_cursor = TaskRegistry._encode_cursor(score, task_id)
+                    break
+
+        return {"count": len(tasks), "tasks": tasks, "next_cursor": next_cursor}
+
+    def iter_records(self, batch_size: int = 500, task_states=None):
+        """Every task as {"task_id", "record", "result"}, newest first (TaskRegistry.iter_records)."""
+        with self._lock:
+            ordered = sorted(self._scores, key=self._scores.get, reverse=True)
+        for start in range(0, len(ordered), batch_size):
+            records = [(task_id, self.get(task_id)) for task_id in ordered[start:start + batch_size]]
+            tasks = [{"task_id": task_id, **record} for task_id, record in records if record]
+            for task, (status, info) in zip(tasks, _batch_states(tasks, task_states)):
+                task_id = task.pop("task_id")
+                yield {"task_id": task_id, "record": task, "result": _final_result(status, info)}
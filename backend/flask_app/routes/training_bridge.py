@@ -22,9 +22,21 @@ def handle_proxy_call(coro):
     except Exception as exc:
         return jsonify({"error": f"Failed to connect to FastAPI backend: {str(exc)}"}), 503
 
+def training_headers():
+    """
+    Identify the UI user to FastAPI. Without X-Client-ID it would fall back to
+    this bridge's address, putting every user in one in-flight budget; the
+    browser's own id is forwarded, else its address.
+    """
+    user_address = request.access_route[0] if request.access_route else request.remote_addr
+    headers = {"X-Client-ID": request.headers.get("X-Client-ID") or f"ui:{user_address}"}
+    if request.headers.get("Idempotency-Key"):
+        headers["Idempotency-Key"] = request.headers["Idempotency-Key"]
+    return headers
+
 @bridge_bp.route("/start_training", methods=["POST"])
 def start_training():
-    return handle_proxy_call(FastAPIProxy.post_train(request.json))
+    return handle_proxy_call(FastAPIProxy.post_train(request.json, training_headers()))
 
 @bridge_bp.route("/task_status/<task_id>", methods=["GET"])
 def task_status(task_id):
@@ -80,3 +92,8 @@ def benchmark_compare():
     model_ids = request.args.get("model_ids", "")
     env = request.args.get("env", None)
     return handle_proxy_call(FastAPIProxy.get_benchmark_compare(model_ids, env))
+
+@bridge_bp.route("/dashboard/summary", methods=["GET"])
+def dashboard_summary():
+    # Experiments, analytics, benchmarks and tasks in one backend call
+    return handle_proxy_call(FastAPIProxy.get_dashboard_summary(request.args.to_dict()))
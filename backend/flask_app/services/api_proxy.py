@@ -10,9 +10,10 @@ class FastAPIProxy:
     """
 
     @staticmethod
-    async def post_train(payload: Dict):
+    async def post_train(payload: Dict, headers: Optional[Dict] = None):
+        # headers: X-Client-ID / Idempotency-Key of the UI user, for per-client admission limits
         async with httpx.AsyncClient() as client:
-            response = await client.post(f"{FASTAPI_BASE_URL}/orchestrate/train", json=payload)
+            response = await client.post(f"{FASTAPI_BASE_URL}/orchestrate/train", json=payload, headers=headers)
             response.raise_for_status()
             return response.json()
 
@@ -97,3 +98,10 @@ class FastAPIProxy:
             response = await client.get(url)
             response.raise_for_status()
             return response.json()
+
+    @staticmethod
+    async def get_dashboard_summary(params: Optional[Dict] = None):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{FASTAPI_BASE_URL}/dashboard/summary", params=params)
+            response.raise_for_status()
+            return response.json()
@@ -0,0 +1,52 @@
+"""
+Run the worker autoscaler on this host: one pool of Celery worker processes
+per queue, resized within Settings.autoscale.worker_bounds from broker depth
+and queue wait time. Metrics are served on Settings.autoscale.metrics_port.
+
+    python scripts/run_autoscaler.py [queue ...]
+"""
+import os
+import signal
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from prometheus_client import start_http_server
+from backend.fastapi_app.core.config import settings
+from backend.fastapi_app.services.autoscaler import Autoscaler, LocalWorkerPool, ScalingPolicy
+from backend.fastapi_app.services.orchestrator import admission_controller, task_control, worker_argv
+
+
+def sample(queue: str) -> tuple:
+    return admission_controller.queue_depth(queue), task_control.oldest_wait_seconds(queue)
+
+
+if __name__ == "__main__":
+    config = settings.autoscale
+    queues = sys.argv[1:] or list(config.worker_bounds)
+
+    pools = {queue: LocalWorkerPool(queue, worker_argv) for queue in queues}
+    policies = {
+        queue: ScalingPolicy(
+            min_workers=config.worker_bounds[queue][0],
+            max_workers=config.worker_bounds[queue][1],
+            target_depth_per_worker=config.target_queue_depth_per_worker,
+            max_wait_seconds=config.max_queue_wait_seconds,
+            cooldown_seconds=config.scale_down_cooldown_seconds,
+        )
+        for queue in queues
+    }
+    autoscaler = Autoscaler(pools, policies, sample)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    start_http_server(config.metrics_port)
+    print(f"Autoscaling {', '.join(queues)} every {config.interval_seconds}s (metrics on :{config.metrics_port})")
+    try:
+        autoscaler.run(config.interval_seconds, stop)
+    finally:
+        for pool in pools.values():
+            pool.stop_all()
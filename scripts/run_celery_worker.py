@@ -0,0 +1,18 @@
+"""
+Start a Celery worker dedicated to one queue, sized from Settings.celery.
+
+    python scripts/run_celery_worker.py training
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.fastapi_app.services.orchestrator import celery_config, worker_argv
+
+
+if __name__ == "__main__":
+    queue = sys.argv[1] if len(sys.argv) > 1 else celery_config.default_queue
+    argv = worker_argv(queue)
+    print(f"Starting worker: {' '.join(argv)}")
+    os.execvp(argv[0], argv)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -14,6 +14,13 @@ class Experiment(Base):
     environment_id = Column(Integer, ForeignKey("environments.id"), nullable=True)
     environment = relationship("Environment", back_populates="experiments")
 
+    # Keyset pagination (newest first by id) within each listing filter
+    __table_args__ = (
+        Index("ix_experiments_status_id", "status", "id"),
+        Index("ix_experiments_algo_id", "algo", "id"),
+        Index("ix_experiments_env_id", "environment_id", "id"),
+    )
+
 
 class Environment(Base):
     __tablename__ = "environments"
@@ -24,3 +31,47 @@ class Environment(Base):
     registered_at = Column(DateTime, default=func.now())
 
     experiments = relationship("Experiment", back_populates="environment")
+
+
+class TrainingRun(Base):
+    """One training task; experiment ids come from /orchestrate/train and are not enforced as keys."""
+
+    __tablename__ = "training_runs"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(String(64), unique=True, nullable=False)
+    experiment_id = Column(Integer, nullable=False, index=True)
+    env = Column(String, nullable=True)
+    algo = Column(String, nullable=True)
+    status = Column(String, default="RUNNING")
+    total_epochs = Column(Integer, nullable=True)
+    final_accuracy = Column(Float, nullable=True)
+    started_at = Column(DateTime, default=func.now())
+    completed_at = Column(DateTime, nullable=True)
+
+    epochs = relationship("EpochMetric", back_populates="run")
+
+    __table_args__ = (
+        # Incremental exports walk finished runs in (completed_at, id) order
+        Index("ix_training_runs_completed_id", "completed_at", "id"),
+    )
+
+
+class EpochMetric(Base):
+    """Per-epoch reward of a run; epochs re-run after a resume overwrite the earlier row."""
+
+    __tablename__ = "epoch_metrics"
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("training_runs.id"), nullable=False)
+    experiment_id = Column(Integer, nullable=False)
+    epoch = Column(Integer, nullable=False)
+    reward = Column(Float, nullable=False)
+    recorded_at = Column(DateTime, nullable=False)
+
+    run = relationship("TrainingRun", back_populates="epochs")
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "epoch", name="uq_epoch_metrics_run_epoch"),
+        Index("ix_epoch_metrics_experiment_epoch", "experiment_id", "epoch"),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, func
+from .base import Base
+
+
+class Model(Base):
+    """Uploaded model file registered for benchmarking."""
+
+    __tablename__ = "models"
+
+    id = Column(Integer, primary_key=True)
+    model_id = Column(String(32), unique=True, nullable=False)
+    filename = Column(String, nullable=False)
+    path = Column(String, nullable=False)
+    format = Column(String(32), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    uploaded_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        # Listing filters, each paired with the keyset order (id)
+        Index("ix_models_format_id", "format", "id"),
+        Index("ix_models_filename_id", "filename", "id"),
+        Index("ix_models_sha256", "sha256"),
+    )
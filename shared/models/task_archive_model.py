@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, func
+from .base import Base
+
+
+class ArchivedTask(Base):
+    """Finished task moved out of Redis by the archival job."""
+
+    __tablename__ = "task_archive"
+
+    task_id = Column(String(64), primary_key=True)
+    experiment_id = Column(Integer, nullable=True)
+    status = Column(String(32), nullable=False)
+    env = Column(String, nullable=True)
+    algo = Column(String, nullable=True)
+    queue = Column(String, nullable=True)
+    client_id = Column(String, nullable=True, index=True)
+    sweep_id = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    # Task table entry as it was in Redis (JSON object of strings)
+    record = Column(Text, nullable=False)
+    # Final Celery result / info (JSON)
+    result = Column(Text, nullable=True)
+    archived_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_task_archive_status_created", "status", "created_at"),
+        Index("ix_task_archive_experiment_created", "experiment_id", "created_at"),
+    )
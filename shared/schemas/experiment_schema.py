@@ -1,17 +1,19 @@
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ExperimentCreate(BaseModel):
     name: str = Field(..., description="Unique name of the experiment")
     algo: str = Field(..., description="Reinforcement learning algorithm used")
+    environment_id: Optional[int] = Field(default=None, description="Registered environment the experiment runs on")
 
 class ExperimentResponse(BaseModel):
     id: int
     name: str
     algo: str
     status: str
+    environment_id: Optional[int] = None
     created_at: datetime
 
     class Config:
@@ -31,3 +33,36 @@ class EnvironmentResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+# Bulk registration (one request, one transaction)
+MAX_BULK_ITEMS = 5000
+
+class ExperimentBulkCreate(BaseModel):
+    experiments: List[ExperimentCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class EnvironmentBulkCreate(BaseModel):
+    environments: List[EnvironmentCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class BulkCreateResponse(BaseModel):
+    created: List[int] = Field(..., description="Ids of rows inserted by this request")
+    existing: List[int] = Field(..., description="Ids of rows that were already registered under the same name")
+
+
+class ExperimentImport(ExperimentCreate):
+    """One line of an /experiments/import body; ids and timestamps are kept when given."""
+    id: Optional[int] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class EnvironmentImport(EnvironmentCreate):
+    """One line of an /environments/import body; ids and timestamps are kept when given."""
+    id: Optional[int] = None
+    registered_at: Optional[datetime] = None
+
+
+class ImportResponse(BaseModel):
+    received: int = Field(..., description="Lines read from the request body")
+    inserted: int = Field(..., description="Rows stored")
+    skipped: int = Field(..., description="Rows left out because their key was already present")
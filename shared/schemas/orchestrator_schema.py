@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, List, Optional
 from datetime import datetime
 
 class TaskQueueResponse(BaseModel):
@@ -10,12 +10,75 @@ class TaskQueueResponse(BaseModel):
 
 
 
+class TaskProgress(BaseModel):
+    current: int
+    total: int
+    percentage: float
+
+
 class TaskStatusResponse(BaseModel):
     task_id: str
     status: str
+    progress: Optional[TaskProgress] = None
+    result: Optional[Any] = None
+
+
+class BulkTaskStatusRequest(BaseModel):
+    task_ids: List[str] = Field(..., min_length=1, max_length=500, description="Task ids to look up")
+
+
+class BulkTaskStatusResponse(BaseModel):
+    count: int
+    tasks: List[TaskStatusResponse]
 
 
 class TrainingRequest(BaseModel):
     experiment_id: int
     env_name: str
     algo: str
+    priority: Optional[int] = Field(
+        None, ge=0, description="Broker priority, 0 is served first, up to Settings.celery.max_priority"
+    )
+
+
+class TaskRecord(BaseModel):
+    task_id: str
+    status: Optional[str] = None
+    experiment_id: Optional[int] = None
+    env: Optional[str] = None
+    algo: Optional[str] = None
+    type: Optional[str] = None
+    priority: Optional[int] = None
+    queue: Optional[str] = None
+    client_id: Optional[str] = None
+    sweep_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    cancel_requested_at: Optional[datetime] = None
+    preempted_at: Optional[datetime] = None
+    preempted_by: Optional[str] = None
+    preemptions: Optional[int] = None
+    last_epoch: Optional[int] = None
+    resumed_from_epoch: Optional[int] = None
+    last_reward: Optional[float] = None
+    final_accuracy: Optional[float] = None
+
+
+class TaskCancelResponse(BaseModel):
+    task_id: str
+    status: str = Field(..., description="REVOKED if it never ran, CANCELLING while a running task winds down")
+
+
+class TaskListResponse(BaseModel):
+    count: int
+    tasks: List[TaskRecord]
+    next_cursor: Optional[str] = Field(None, description="Pass back as `cursor` to fetch the next page")
+
+
+class TaskRecordExport(BaseModel):
+    """One line of /orchestrate/tasks/export and /orchestrate/tasks/import."""
+    task_id: str = Field(..., min_length=1)
+    record: dict = Field(..., description="Task table entry (string fields, as stored in Redis)")
+    result: Optional[Any] = Field(None, description="Final task result, for finished tasks")
@@ -0,0 +1,56 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
+
+
+class SweepRequest(BaseModel):
+    experiment_id: int
+    env_name: str
+    algo: str
+    grid: Optional[Dict[str, List[Any]]] = Field(None, description="Hyperparameter grid, expanded to its cartesian product")
+    configs: Optional[List[Dict[str, Any]]] = Field(None, description="Explicit hyperparameter configs (alternative to grid)")
+    min_epochs: int = Field(1, ge=1, description="Epoch of the first rung")
+    max_epochs: int = Field(9, ge=1, description="Epochs for trials that survive every rung")
+    reduction_factor: int = Field(3, ge=2, description="Keep the top 1/reduction_factor at each rung")
+    priority: Optional[int] = Field(None, ge=0, description="Up to Settings.celery.max_priority")
+
+    @model_validator(mode="after")
+    def check_search_space(self):
+        if not self.grid and not self.configs:
+            raise ValueError("Provide either `grid` or `configs`")
+        if self.max_epochs < self.min_epochs:
+            raise ValueError("max_epochs must be >= min_epochs")
+        return self
+
+
+class SweepTrial(BaseModel):
+    task_id: str
+    hyperparams: Dict[str, Any]
+
+
+class SweepRung(BaseModel):
+    epoch: int
+    quota: int
+    results: List[Dict[str, Any]]
+    promoted: List[str]
+
+
+class SweepHalvingState(BaseModel):
+    eta: int
+    max_epochs: int
+    rungs: List[SweepRung]
+    trials: Dict[str, Dict[str, Any]]
+
+
+class SweepResponse(BaseModel):
+    sweep_id: str
+    experiment_id: int
+    env_name: str
+    algo: str
+    min_epochs: int
+    max_epochs: int
+    eta: int
+    status: str
+    created_at: str
+    updated_at: Optional[str] = None
+    trials: List[SweepTrial]
+    halving: Optional[SweepHalvingState] = None
@@ -1,5 +1,6 @@
 # exceptions.py
 from fastapi import Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from shared.utils.logger import get_logger
 import uuid
@@ -9,11 +10,15 @@ error_id = str(uuid.uuid4())
 log = get_logger("ExceptionHandler")
 
 async def http_exception_handler(request: Request, exc):
+    # Also registered for RequestValidationError, which has errors() instead of status/detail
+    status_code = getattr(exc, "status_code", 422)
+    detail = exc.detail if hasattr(exc, "detail") else jsonable_encoder(exc.errors())
     #log.warning(f"HTTP Exception: {exc.detail}")
-    log.warning(f"HTTP Exception on {request.url.path}: {exc.detail}")
+    log.warning(f"HTTP Exception on {request.url.path}: {detail}")
     return JSONResponse(
-        status_code=exc.status_code,
-        content={"error": exc.detail},
+        status_code=status_code,
+        content={"error": detail},
+        headers=getattr(exc, "headers", None),
     )
 
 async def unhandled_exception_handler(request: Request, exc):
@@ -0,0 +1,95 @@
+"""
+Keyset (cursor) pagination helpers shared by listing endpoints.
+
+Cursors are opaque URL-safe strings encoding the sort key of the last row
+returned; the next page starts strictly after it, so each page costs one
+index range scan however deep the client has paged.
+"""
+
+import base64
+import json
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, tuple_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    """Decode `cursor` into one value per sort column."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong arity")
+        return values
+    except (ValueError, TypeError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+
+
+def keyset_page(stmt, key_columns: Sequence, cursor: Optional[str], limit: int):
+    """
+    Restrict `stmt` to one page, descending by `key_columns` (together unique,
+    e.g. ending with the primary key). Fetches `limit + 1` rows so the caller
+    can tell whether another page follows; see `split_page`.
+    """
+    if cursor is not None:
+        values = decode_cursor(cursor, key_columns)
+        if len(key_columns) == 1:
+            stmt = stmt.where(key_columns[0] < values[0])
+        else:
+            stmt = stmt.where(tuple_(*key_columns) < tuple_(*values))
+    return stmt.order_by(*(col.desc() for col in key_columns)).limit(limit + 1)
+
+
+def split_page(rows: list, key_names: Sequence, limit: int) -> tuple:
+    """Return (rows of this page, next cursor or None) from a `keyset_page` result."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([last[name] for name in key_names])
+
+
+# -----------------------------
+# Listing endpoints
+# -----------------------------
+def select_fields(model, response_model, fields: Optional[str], key_columns: Sequence):
+    """
+    SELECT of the columns named in the comma-separated `fields` (every field of
+    `response_model` if omitted) plus the sort key. Returns (statement, field names).
+    Unknown names are rejected with a 400.
+    """
+    available = list(response_model.model_fields)
+    names = available if not fields else list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    extra = [col for col in key_columns if col.key not in names]
+    return select(*(getattr(model, name) for name in names), *extra), names
+
+
+def page_response(request: Request, response: Response, rows: list, names: list, next_cursor: Optional[str], partial: bool):
+    """
+    Listing bodies stay plain JSON arrays; the next page is advertised in the
+    `X-Next-Cursor` header and a `Link: rel="next"` header.
+    """
+    items = [{name: row[name] for name in names} for row in rows]
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    if partial:
+        # Field subsets do not match the response model; serialize them as they are
+        return JSONResponse(jsonable_encoder(items), headers=headers)
+    response.headers.update(headers)
+    return items
@@ -7,15 +7,26 @@ This ensures:
   - Redis (if running) is cleared between test sessions.
   - The local storage/models directory is reset.
   - Test logging is initialised.
+  - In-memory SQLite databases (sync, or async behind get_async_db) are at hand.
 """
 
+import asyncio
 import os
 import pytest
 import shutil
+import fakeredis
 import redis
 from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 from backend.fastapi_app.core.config import CacheConfig
+from backend.fastapi_app.core.db import get_async_db
+from backend.fastapi_app.main import app
+from shared.models.base import Base
+# Registers every table with Base.metadata
+from shared.models import experiment_model, model_registry_model, task_archive_model  # noqa: F401
 
 cache_config = CacheConfig()
 
@@ -61,3 +72,85 @@ def clean_test_environment():
 
     # Post-test cleanup (optional)
     print("\n🧩 Tests completed — environment teardown done.")
+
+
+@pytest.fixture
+def redis_client():
+    """
+    Live Redis client on the test DB (db=3), flushed before each test.
+    Tests depending on it are skipped when Redis is not running.
+    """
+    client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    try:
+        client.ping()
+    except Exception as e:
+        pytest.skip(f"Redis unavailable: {e}")
+    client.flushdb()
+    yield client
+    client.flushdb()
+
+
+@pytest.fixture
+def fake_redis_server():
+    """
+    In-memory Redis shared by the sync and asyncio clients below, for tests
+    of stream and index logic that must run without a Redis server.
+    """
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def fake_redis(fake_redis_server):
+    return fakeredis.FakeRedis(server=fake_redis_server, decode_responses=True)
+
+
+@pytest.fixture
+def fake_async_redis(fake_redis_server):
+    return fakeredis.FakeAsyncRedis(server=fake_redis_server, decode_responses=True)
+
+
+def _tables(request):
+    """Tables of the models passed by indirect parametrization, or None for all of them."""
+    models = getattr(request, "param", None)
+    return [model.__table__ for model in models] if models else None
+
+
+@pytest.fixture
+def sqlite_engine(request):
+    """
+    Sync in-memory SQLite engine with the schema created. One connection is
+    shared by every session (StaticPool), so all of them see the same data.
+    Creates every table, or only the models given by
+    @pytest.mark.parametrize("sqlite_engine", [[Model, ...]], indirect=True).
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=_tables(request))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_db(request):
+    """
+    Serve get_async_db from a fresh in-memory SQLite (aiosqlite) for one test
+    and yield its session factory. Tables as for `sqlite_engine`.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=_tables(request))
+
+    asyncio.run(create_schema())
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override
+    try:
+        yield sessions
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        asyncio.run(engine.dispose())
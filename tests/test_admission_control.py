@@ -0,0 +1,44 @@
+"""
+# tests/test_admission_control.py
+------------------------------------------
+Validates queue-depth and per-client in-flight limits
+applied before training tasks are enqueued.
+"""
+
+import pytest
+
+from backend.fastapi_app.core.config import AdmissionConfig
+from backend.fastapi_app.services.admission_control import AdmissionController, AdmissionRejected
+
+
+@pytest.fixture
+def controller(redis_client):
+    config = AdmissionConfig(max_queue_depth=5, max_inflight_per_client=2, retry_after_seconds=7)
+    return AdmissionController(redis_client, redis_client, config, priority_steps=list(range(10)))
+
+
+def test_queue_depth_sums_priority_levels(controller, redis_client):
+    redis_client.rpush("training", "m1", "m2")
+    redis_client.rpush("training:5", "m3")
+    assert controller.queue_depth("training") == 3
+
+
+def test_full_queue_rejected(controller, redis_client):
+    redis_client.rpush("training:5", *[f"m{i}" for i in range(5)])
+    with pytest.raises(AdmissionRejected) as exc:
+        controller.admit("training", "client-a", "t1")
+    assert exc.value.retry_after == 7
+    assert controller.inflight("client-a") == 0
+
+
+def test_client_inflight_limit_and_release(controller):
+    controller.admit("training", "client-a", "t1")
+    controller.admit("training", "client-a", "t2")
+    with pytest.raises(AdmissionRejected):
+        controller.admit("training", "client-a", "t3")
+    # Other clients are unaffected
+    controller.admit("training", "client-b", "t4")
+
+    controller.release("client-a", "t1")
+    controller.admit("training", "client-a", "t3")
+    assert controller.inflight("client-a") == 2
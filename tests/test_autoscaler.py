@@ -0,0 +1,74 @@
+"""
+# tests/test_autoscaler.py
+------------------------------------------
+Validates the worker autoscaler: scaling rules, the control
+loop with its metrics, and real local worker processes.
+"""
+
+import sys
+
+from prometheus_client import REGISTRY
+
+from backend.fastapi_app.services.autoscaler import Autoscaler, LocalWorkerPool, ScalingPolicy
+
+
+def policy(**overrides):
+    params = dict(min_workers=1, max_workers=4, target_depth_per_worker=4, max_wait_seconds=60, cooldown_seconds=300)
+    return ScalingPolicy(**{**params, **overrides})
+
+
+def test_policy_rules():
+    p = policy()
+    assert p.desired(0, 0, 0, 0) == (1, "min_workers")
+    assert p.desired(1, 9, 0, 0) == (3, "queue_depth")
+    assert p.desired(2, 100, 0, 0) == (4, "queue_depth")
+    assert p.desired(2, 3, 90, 0) == (3, "queue_wait")
+    assert p.desired(4, 3, 90, 0) == (4, "steady")
+    # Waiting work below the target never shrinks a busy pool
+    assert p.desired(3, 2, 0, 1000) == (3, "steady")
+    assert p.desired(3, 0, 0, 10) == (3, "steady")
+    assert p.desired(3, 0, 0, 1000) == (2, "idle")
+    assert p.desired(1, 0, 0, 1000) == (1, "steady")
+
+
+class CountingPool:
+    def __init__(self, size):
+        self.size = size
+
+    def scale_to(self, count):
+        self.size = count
+
+
+def test_step_scales_pools_and_exports_metrics():
+    now = [0.0]
+    load = {"training": (12, 0.0)}
+    pool = CountingPool(1)
+    autoscaler = Autoscaler({"training": pool}, {"training": policy()}, lambda q: load[q], clock=lambda: now[0])
+
+    assert autoscaler.step() == {"training": (1, 3, "queue_depth")}
+    assert pool.size == 3
+    assert REGISTRY.get_sample_value("resimhub_autoscaler_workers", {"queue": "training"}) == 3
+    up = {"queue": "training", "direction": "up", "reason": "queue_depth"}
+    assert REGISTRY.get_sample_value("resimhub_autoscaler_decisions_total", up) >= 1
+
+    # Drained queue: shrink one step per cooldown
+    load["training"] = (0, 0.0)
+    now[0] = 100
+    assert autoscaler.step()["training"] == (3, 3, "steady")
+    now[0] = 400
+    assert autoscaler.step()["training"] == (3, 2, "idle")
+    assert REGISTRY.get_sample_value("resimhub_autoscaler_desired_workers", {"queue": "training"}) == 2
+
+
+def test_local_pool_starts_and_stops_processes():
+    argv = lambda queue, index: [sys.executable, "-c", "import time; time.sleep(30)"]
+    pool = LocalWorkerPool("training", argv)
+    try:
+        pool.scale_to(3)
+        assert pool.size == 3
+        pool.scale_to(1)
+        assert pool.size == 1
+        assert list(pool._procs) == [0]
+    finally:
+        pool.stop_all(timeout=5)
+    assert pool.size == 0
@@ -6,22 +6,33 @@ Validates upload, run, list, and compare endpoints for
 the ReSimHub Benchmark module.
 """
 
+import asyncio
+import fakeredis
+import hashlib
 import io
 import json
 import pytest
+import uuid
 
 from fastapi.testclient import TestClient
 from pathlib import Path
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
 
 # Import FastAPI app
 from backend.fastapi_app.main import app
+from backend.fastapi_app.services import benchmark_service
+from shared.models.model_registry_model import Model
 
 client = TestClient(app)
 
 STORAGE_DIR = Path("storage/models")
 STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Model registry on a fresh in-memory SQLite for every test
+pytestmark = pytest.mark.usefixtures("async_db")
+
 
 @pytest.fixture(scope="session")
 def dummy_model_file():
@@ -49,6 +60,30 @@ def test_upload_model(dummy_model_file):
     print(f"\n✅ Uploaded model_id={MODEL_ID}")
 
 
+def test_list_models(dummy_model_file):
+    """Uploads are registered with size, hash and format and listed newest first."""
+    with open(dummy_model_file, "rb") as f:
+        first = client.post("/benchmark/upload_model", files={"file": ("dqn.pkl", f, "application/octet-stream")}).json()
+        f.seek(0)
+        second = client.post("/benchmark/upload_model", files={"file": ("policy.onnx", f, "application/octet-stream")}).json()
+
+    response = client.get("/benchmark/models", params={"limit": 1})
+    assert response.status_code == 200
+    assert [m["model_id"] for m in response.json()] == [second["model_id"]]
+    next_page = client.get("/benchmark/models", params={"limit": 1, "cursor": response.headers["X-Next-Cursor"]})
+    assert [m["model_id"] for m in next_page.json()] == [first["model_id"]]
+    assert "X-Next-Cursor" not in next_page.headers
+
+    digest = hashlib.sha256(dummy_model_file.read_bytes()).hexdigest()
+    models = client.get("/benchmark/models", params={"sha256": digest, "fields": "model_id,format,size_bytes"}).json()
+    assert models == [
+        {"model_id": second["model_id"], "format": "onnx", "size_bytes": dummy_model_file.stat().st_size},
+        {"model_id": first["model_id"], "format": "pkl", "size_bytes": dummy_model_file.stat().st_size},
+    ]
+    assert [m["model_id"] for m in client.get("/benchmark/models", params={"format": "pkl"}).json()] == [first["model_id"]]
+    assert client.get("/benchmark/models", params={"cursor": "!!"}).status_code == 400
+
+
 def test_run_benchmark():
     """Test running a benchmark simulation for uploaded model."""
     payload = {
@@ -85,6 +120,93 @@ def test_list_recent_results():
     print(f"✅ Retrieved {data['count']} recent results")
 
 
+def test_results_export_and_import():
+    """Results round-trip through NDJSON; imported ones become comparable."""
+    response = client.get("/benchmark/results/export")
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert MODEL_ID in {r["model_id"] for r in exported}
+
+    model_id = f"mdl_imported_{uuid.uuid4().hex[:8]}"
+    imported = {**exported[0], "model_id": model_id, "mean_reward": 999.0}
+    response = client.post("/benchmark/results/import", content=json.dumps(imported) + "\n")
+    assert response.json() == {"received": 1, "inserted": 1, "skipped": 0}
+    # Re-sending the same results stores nothing twice
+    response = client.post("/benchmark/results/import", content=json.dumps(imported) + "\n")
+    assert response.json() == {"received": 1, "inserted": 0, "skipped": 1}
+
+    comparison = client.get(f"/benchmark/compare?model_ids={model_id}&env=CartPole-v1").json()
+    assert comparison["comparison_summary"]["best_score"] == 999.0
+    assert client.post("/benchmark/results/import", content='{"model_id": "x"}').status_code == 422
+
+
+def test_import_restores_every_run(monkeypatch):
+    """Export then import into an empty Redis store keeps each run and the latest lookup."""
+    service = benchmark_service.BenchmarkService
+    monkeypatch.setattr(benchmark_service, "USE_REDIS", True)
+    monkeypatch.setattr(benchmark_service, "redis_client", fakeredis.FakeRedis(decode_responses=True))
+    first = service.run_benchmark_simulation("mdl_x", "CartPole-v1", episodes=5)
+    second = {**first, "mean_reward": first["mean_reward"] + 1, "evaluated_at": "9999-01-01T00:00:00"}
+    assert service.store_results([second]) == 1
+    exported = list(service.iter_results())
+
+    restored = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(benchmark_service, "redis_client", restored)
+    assert service.store_results(exported) == 2
+    assert service.store_results(exported) == 0
+    assert restored.llen("benchmark:recent_results") == 2
+    assert float(restored.hget("benchmark:result:mdl_x:CartPole-v1", "mean_reward")) == second["mean_reward"]
+
+
+def test_legacy_models_are_registered(sqlite_engine, tmp_path, monkeypatch):
+    """Uploads recorded only in .meta.json files or Redis hashes are backfilled once."""
+    sessions = sessionmaker(bind=sqlite_engine)
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(benchmark_service, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(benchmark_service, "USE_REDIS", True)
+    monkeypatch.setattr(benchmark_service, "redis_client", redis)
+
+    (tmp_path / "mdl_file.pkl").write_bytes(b"weights")
+    (tmp_path / "mdl_file.meta.json").write_text(json.dumps({
+        "model_id": "mdl_file", "filename": "dqn.pkl", "path": str(tmp_path / "mdl_file.pkl"),
+        "uploaded_at": "2026-01-02T03:04:05",
+    }))
+    (tmp_path / "mdl_redis.onnx").write_bytes(b"graph")
+    redis.hset("benchmark:meta:mdl_redis", mapping={
+        "model_id": "mdl_redis", "filename": "ppo.onnx", "path": str(tmp_path / "mdl_redis.onnx"),
+        "uploaded_at": "2026-01-03T00:00:00",
+    })
+    redis.hset("benchmark:meta:mdl_gone", mapping={"model_id": "mdl_gone", "path": str(tmp_path / "missing.pkl")})
+
+    service = benchmark_service.BenchmarkService
+    assert service.register_legacy_models(sessions) == 2
+    assert service.register_legacy_models(sessions) == 0
+    with sessions() as db:
+        models = {m.model_id: m for m in db.scalars(select(Model))}
+    assert models["mdl_file"].size_bytes == 7
+    assert models["mdl_file"].sha256 == hashlib.sha256(b"weights").hexdigest()
+    assert models["mdl_file"].uploaded_at == datetime(2026, 1, 2, 3, 4, 5)
+    assert (models["mdl_redis"].format, models["mdl_redis"].filename) == ("onnx", "ppo.onnx")
+
+
+def test_failed_registration_removes_the_file(tmp_path, monkeypatch):
+    class FailingSession:
+        def add(self, model):
+            pass
+
+        async def commit(self):
+            raise RuntimeError("database is locked")
+
+    class Upload:
+        filename = "dqn.pkl"
+        file = io.BytesIO(b"weights")
+
+    monkeypatch.setattr(benchmark_service, "UPLOAD_DIR", tmp_path)
+    with pytest.raises(RuntimeError):
+        asyncio.run(benchmark_service.BenchmarkService.save_model_file(Upload(), FailingSession()))
+    assert list(tmp_path.iterdir()) == []
+
+
 def test_compare_models():
     """Compare same model twice (mocking multi-model comparison)."""
     # Use the same model twice for simulation
@@ -0,0 +1,51 @@
+"""
+# tests/test_checkpoint_store.py
+------------------------------------------
+Validates atomic training checkpoints and deterministic
+resume of the reward stream.
+"""
+
+import random
+
+from backend.fastapi_app.services.checkpoint_store import CheckpointStore
+
+
+def test_resume_reproduces_remaining_epochs(tmp_path):
+    """Epochs drawn after restoring a checkpoint match the uninterrupted run."""
+    store = CheckpointStore(tmp_path)
+
+    rng = random.Random("task-1")
+    uninterrupted = [rng.uniform(180, 250) for _ in range(5)]
+
+    rng = random.Random("task-1")
+    rewards = [rng.uniform(180, 250) for _ in range(2)]
+    store.save("task-1", 2, rewards, rng)
+
+    checkpoint = store.load("task-1")
+    resumed = random.Random()
+    resumed.setstate(checkpoint["rng_state"])
+    rewards = checkpoint["rewards"] + [resumed.uniform(180, 250) for _ in range(3)]
+
+    assert checkpoint["epoch"] == 2
+    assert rewards == uninterrupted
+
+
+def test_save_replaces_atomically_and_delete(tmp_path):
+    store = CheckpointStore(tmp_path)
+    rng = random.Random(0)
+
+    store.save("task-2", 1, [1.0], rng)
+    store.save("task-2", 2, [1.0, 2.0], rng)
+
+    assert store.load("task-2")["epoch"] == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["task-2.json"]
+
+    store.delete("task-2")
+    assert store.load("task-2") is None
+
+
+def test_corrupt_checkpoint_is_ignored(tmp_path):
+    store = CheckpointStore(tmp_path)
+    (tmp_path / "task-3.json").write_text("{not json")
+
+    assert store.load("task-3") is None
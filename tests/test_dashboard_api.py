@@ -0,0 +1,53 @@
+"""
+# tests/test_dashboard_api.py
+------------------------------------------
+Validates the combined dashboard summary: section
+selection, limits and isolation of failing sources.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.fastapi_app.main import app
+from backend.fastapi_app.routers import dashboard
+from backend.fastapi_app.services.task_registry import LocalTaskRegistry
+
+
+@pytest.fixture
+def client(async_db, monkeypatch):
+    registry = LocalTaskRegistry()
+    for i in range(3):
+        registry.upsert(f"task-{i}", {"status": "SUCCESS", "experiment_id": i})
+    monkeypatch.setattr(dashboard.executor, "registry", registry)
+    monkeypatch.setattr(
+        dashboard.AnalyticsService, "list_recent_experiments",
+        staticmethod(lambda limit: [{"experiment_id": 1, "final_accuracy": 0.9}][:limit]),
+    )
+    return TestClient(app)
+
+
+def test_summary_sections_and_limits(client):
+    for i in range(3):
+        client.post("/experiments/", json={"name": f"exp-{i}", "algo": "DQN"})
+
+    body = client.get("/dashboard/summary", params={"experiments_limit": 2, "tasks_limit": 2}).json()
+    assert set(body) == {"generated_at", "errors", "experiments", "analytics", "benchmarks", "tasks"}
+    assert body["errors"] == {}
+    assert [e["name"] for e in body["experiments"]] == ["exp-2", "exp-1"]
+    assert body["analytics"] == [{"experiment_id": 1, "final_accuracy": 0.9}]
+    assert [t["task_id"] for t in body["tasks"]["tasks"]] == ["task-2", "task-1"]
+
+    body = client.get("/dashboard/summary", params={"sections": "tasks, analytics"}).json()
+    assert set(body) == {"generated_at", "errors", "tasks", "analytics"}
+    assert client.get("/dashboard/summary", params={"sections": "tasks,secrets"}).status_code == 400
+
+
+def test_failing_section_does_not_fail_summary(client, monkeypatch):
+    def unavailable(**_):
+        raise ConnectionError("task registry unavailable")
+
+    monkeypatch.setattr(dashboard.executor.registry, "list_tasks", unavailable)
+    body = client.get("/dashboard/summary", params={"sections": "tasks,analytics"}).json()
+    assert body["tasks"] is None
+    assert body["errors"] == {"tasks": "task registry unavailable"}
+    assert body["analytics"]
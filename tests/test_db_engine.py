@@ -0,0 +1,49 @@
+"""
+# tests/test_db_engine.py
+------------------------------------------
+Validates engine construction from DatabaseConfig:
+pool settings, SQLite pragmas and pool metrics.
+"""
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+
+from backend.fastapi_app.core.config import DatabaseConfig
+from backend.fastapi_app.core.db import TimedQueuePool, configure_engine, engine_options
+
+
+def test_sqlite_file_engine_uses_pool_and_wal(tmp_path):
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    config = DatabaseConfig(url=url, pool_size=2, max_overflow=1, sqlite_busy_timeout_ms=1234)
+    engine = create_engine(url, **engine_options(url, config))
+    configure_engine(engine, config, "test-file")
+
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == 2
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert REGISTRY.get_sample_value("resimhub_db_pool_checked_out", {"engine": "test-file"}) == 1
+    engine.dispose()
+
+
+def test_in_memory_sqlite_is_not_pooled():
+    options = engine_options("sqlite://", DatabaseConfig())
+    assert "poolclass" not in options and "pool_size" not in options
+
+
+def test_pool_exhaustion_is_counted(tmp_path):
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    config = DatabaseConfig(url=url, pool_size=1, max_overflow=0, pool_timeout_seconds=0.05)
+    engine = create_engine(url, **engine_options(url, config))
+    before = REGISTRY.get_sample_value("resimhub_db_pool_timeouts_total", {"engine": "sync"}) or 0
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert REGISTRY.get_sample_value("resimhub_db_pool_timeouts_total", {"engine": "sync"}) == before + 1
+    assert REGISTRY.get_sample_value("resimhub_db_pool_checkout_seconds_count", {"engine": "sync"}) >= 2
+    engine.dispose()
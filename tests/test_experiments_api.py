@@ -0,0 +1,150 @@
+"""
+# tests/test_experiments_api.py
+------------------------------------------
+Validates the experiments and environments endpoints
+on an AsyncSession (in-memory SQLite through aiosqlite).
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.fastapi_app.core.db import async_database_url
+from backend.fastapi_app.main import app
+
+
+@pytest.fixture
+def client(async_db):
+    return TestClient(app)
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./resimhub.db") == "sqlite+aiosqlite:///./resimhub.db"
+    assert (
+        async_database_url("postgresql://user:password@db:5432/resimhub")
+        == "postgresql+asyncpg://user:password@db:5432/resimhub"
+    )
+    assert async_database_url("postgresql+psycopg2://db/resimhub") == "postgresql+asyncpg://db/resimhub"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://db/resimhub")
+
+
+def test_create_and_list(client):
+    response = client.post("/environments/", json={"env_name": "CartPole-v1"})
+    assert response.status_code == 200
+    assert response.json()["version"] == "v1"
+    assert client.post("/environments/", json={"env_name": "CartPole-v1"}).status_code == 400
+
+    response = client.post("/experiments/", json={"name": "dqn-baseline", "algo": "DQN"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "created"
+    assert response.json()["created_at"]
+    assert client.post("/experiments/", json={"name": "dqn-baseline", "algo": "PPO"}).status_code == 400
+
+    assert [e["name"] for e in client.get("/experiments/").json()] == ["dqn-baseline"]
+    assert [e["env_name"] for e in client.get("/environments/").json()] == ["CartPole-v1"]
+
+
+def test_keyset_pages_filters_and_fields(client):
+    for i in range(7):
+        client.post("/experiments/", json={"name": f"exp-{i}", "algo": "DQN" if i % 2 else "PPO"})
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/experiments/", params=params)
+        assert response.status_code == 200
+        seen.extend(e["name"] for e in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert 'rel="next"' in response.headers["Link"]
+    assert seen == [f"exp-{i}" for i in reversed(range(7))]
+
+    response = client.get("/experiments/", params={"algo": "DQN", "fields": "id,name"})
+    assert response.json() == [
+        {"id": 6, "name": "exp-5"}, {"id": 4, "name": "exp-3"}, {"id": 2, "name": "exp-1"}
+    ]
+
+    assert client.get("/experiments/", params={"fields": "id,secret"}).status_code == 400
+    assert client.get("/experiments/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/environments/", params={"fields": "env_name"}).json() == []
+
+
+def test_bulk_create_ignores_existing_names(client):
+    first = client.post("/experiments/", json={"name": "exp-0", "algo": "DQN"}).json()
+
+    payload = {"experiments": [{"name": f"exp-{i}", "algo": "PPO"} for i in range(4)]}
+    payload["experiments"].append({"name": "exp-1", "algo": "A2C"})  # repeated in the payload
+    response = client.post("/experiments/bulk", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["existing"] == [first["id"]]
+    assert len(body["created"]) == 3
+
+    listed = {e["name"]: e for e in client.get("/experiments/").json()}
+    assert listed["exp-0"]["algo"] == "DQN"
+    assert listed["exp-1"]["algo"] == "PPO"
+    assert listed["exp-3"]["status"] == "created" and listed["exp-3"]["created_at"]
+
+    again = client.post("/experiments/bulk", json=payload).json()
+    assert again["created"] == [] and len(again["existing"]) == 4
+
+    response = client.post("/environments/bulk", json={"environments": [{"env_name": "CartPole-v1"}]})
+    assert len(response.json()["created"]) == 1
+    assert client.post("/environments/bulk", json={"environments": []}).status_code == 422
+
+    env_id = response.json()["created"][0]
+    linked = [{"name": "exp-env", "algo": "DQN", "environment_id": env_id}]
+    unknown = linked + [{"name": "exp-bad", "algo": "DQN", "environment_id": env_id + 99}]
+    response = client.post("/experiments/bulk", json={"experiments": unknown})
+    assert response.status_code == 400 and str(env_id + 99) in response.text
+    assert len(client.post("/experiments/bulk", json={"experiments": linked}).json()["created"]) == 1
+
+
+def test_ndjson_export_and_import(client):
+    for i in range(3):
+        client.post("/experiments/", json={"name": f"exp-{i}", "algo": "DQN"})
+
+    response = client.get("/experiments/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(e["id"], e["name"]) for e in lines] == [(1, "exp-0"), (2, "exp-1"), (3, "exp-2")]
+    assert lines[0]["created_at"]
+
+    # Re-importing an export changes nothing; new rows keep their ids and status
+    body = response.text + json.dumps({"id": 42, "name": "restored", "algo": "PPO", "status": "completed"}) + "\n\n"
+    response = client.post("/experiments/import", content=body)
+    assert response.json() == {"received": 4, "inserted": 1, "skipped": 3}
+    newest = client.get("/experiments/", params={"limit": 1}).json()[0]
+    assert (newest["id"], newest["name"], newest["status"]) == (42, "restored", "completed")
+
+    response = client.post("/experiments/import", content='{"name": "x", "algo": "DQN"}\n{"name": "y"}\n')
+    assert response.status_code == 422
+    assert response.json()["error"]["line"] == 2
+    assert client.post("/experiments/import", content="[1, 2]").status_code == 422
+
+    # Several import batches
+    body = "\n".join(json.dumps({"env_name": f"Env-{i}-v0"}) for i in range(2500))
+    assert client.post("/environments/import", content=body).json()["inserted"] == 2500
+    exported = client.get("/environments/export").text.splitlines()
+    assert len(exported) == 2500 and json.loads(exported[-1])["env_name"] == "Env-2499-v0"
+
+
+def test_environment_listing_revalidates_with_etag(client):
+    client.post("/environments/", json={"env_name": "CartPole-v1"})
+    first = client.get("/environments/")
+    etag = first.headers["ETag"]
+    assert client.get("/environments/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/environments/", json={"env_name": "Acrobot-v1"})
+    response = client.get("/environments/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [e["env_name"] for e in response.json()] == ["Acrobot-v1", "CartPole-v1"]
+
+    page = client.get("/environments/", params={"limit": 1})
+    assert page.headers["X-Next-Cursor"]
+    cached = client.get("/environments/", params={"limit": 1})
+    assert cached.headers["X-Next-Cursor"] == page.headers["X-Next-Cursor"]
@@ -0,0 +1,73 @@
+"""
+# tests/test_http_cache.py
+------------------------------------------
+Validates ETag revalidation, read-through hits and
+invalidation of the shared GET response cache.
+"""
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from backend.fastapi_app.core.http_cache import ResponseCache
+
+
+def make_client(cache, state):
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(request: Request, response: Response):
+        async def produce():
+            state["calls"] += 1
+            if state["missing"]:
+                return JSONResponse(status_code=404, content={"error": "missing"})
+            response.headers["X-Next-Cursor"] = "abc"
+            return {"items": state["items"]}
+
+        return await cache.respond(request, "items", state["version"], produce, response)
+
+    return TestClient(app)
+
+
+def test_revalidation_hits_and_invalidation():
+    cache = ResponseCache(max_entries=1)
+    state = {"calls": 0, "version": 1, "items": [1], "missing": False}
+    client = make_client(cache, state)
+
+    first = client.get("/items")
+    etag = first.headers["ETag"]
+    assert first.json() == {"items": [1]} and first.headers["X-Next-Cursor"] == "abc"
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    # Unchanged version: 304 without producing, or the stored body
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+    again = client.get("/items")
+    assert again.json() == {"items": [1]} and again.headers["X-Next-Cursor"] == "abc"
+    assert state["calls"] == 1
+
+    # New version, invalidation, another URL evicting the only entry: recomputed
+    state.update(version=2, items=[1, 2])
+    assert client.get("/items", headers={"If-None-Match": etag}).json() == {"items": [1, 2]}
+    cache.invalidate("items")
+    client.get("/items")
+    client.get("/items?page=2")
+    client.get("/items")
+    assert state["calls"] == 5
+
+    # Errors are passed through and never stored
+    state["missing"] = True
+    cache.invalidate("items")
+    assert client.get("/items").status_code == 404
+    assert client.get("/items").status_code == 404
+    assert state["calls"] == 7
+
+
+def test_etag_is_shared_across_processes():
+    """Two processes serving the same version agree on the ETag, even after one invalidated."""
+    state = {"calls": 0, "version": 3, "items": [1], "missing": False}
+    writer, reader = ResponseCache(), ResponseCache()
+    writer.invalidate("items")
+    etag = make_client(writer, state).get("/items").headers["ETag"]
+
+    assert make_client(reader, state).get("/items", headers={"If-None-Match": etag}).status_code == 304
+    assert state["calls"] == 1
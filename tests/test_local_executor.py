@@ -0,0 +1,58 @@
+"""
+# tests/test_local_executor.py
+------------------------------------------
+Runs training through the in-process executor backend:
+submit, progress replay, status and cancellation without Redis.
+"""
+
+import asyncio
+import json
+from contextlib import aclosing
+
+from backend.fastapi_app.services.executor import LocalExecutor
+
+
+async def _follow(executor, task_id):
+    events = []
+    async with aclosing(executor.progress.subscribe(task_id)) as updates:
+        async for event_id, data in updates:
+            if event_id is None:
+                continue
+            events.append(json.loads(data))
+            if events[-1]["status"] in ("SUCCESS", "FAILURE", "REVOKED"):
+                return events
+
+
+def test_local_executor_runs_and_cancels(monkeypatch, tmp_path):
+    # Pool workers are spawned and load their settings afresh: keep their run metrics out of ./resimhub.db
+    monkeypatch.setenv("DATABASE", json.dumps({"url": f"sqlite:///{tmp_path / 'runs.db'}"}))
+
+    async def scenario():
+        executor = LocalExecutor(max_workers=1)
+        await executor.start()
+        try:
+            first = executor.submit_training(1, "CartPole-v1", "DQN", total_epochs=1, client_id="c")
+            duplicate = executor.submit_training(1, "CartPole-v1", "DQN", total_epochs=1, client_id="c")
+            queued = executor.submit_training(2, "CartPole-v1", "DQN", total_epochs=1)
+
+            assert duplicate == first
+            # The pool may already have handed the call to a worker (CANCELLING);
+            # either way the task never trains
+            assert executor.cancel(queued) in ("REVOKED", "CANCELLING")
+
+            events = await asyncio.wait_for(_follow(executor, first), timeout=60)
+            revoked = await asyncio.wait_for(_follow(executor, queued), timeout=10)
+            return executor, first, queued, events, revoked
+        finally:
+            await executor.close()
+
+    executor, first, queued, events, revoked = asyncio.run(scenario())
+
+    assert [e["status"] for e in events] == ["PROGRESS", "SUCCESS"]
+    assert executor.task_states([first])[0][0] == "SUCCESS"
+    assert executor.registry.get(first)["status"] == "SUCCESS"
+    assert executor.registry.get(first)["last_epoch"] == "1"
+
+    assert revoked[-1]["status"] == "REVOKED"
+    assert executor.task_states([queued])[0][0] == "REVOKED"
+    assert executor.registry.list_tasks(status="revoked")["tasks"][0]["task_id"] == queued
@@ -0,0 +1,228 @@
+"""
+# tests/test_orchestrator_api.py
+------------------------------------------
+Validates the orchestration endpoints that can run
+without a live Celery worker.
+"""
+
+import asyncio
+import json
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.fastapi_app.main import app
+from backend.fastapi_app.routers import orchestrator as orchestrator_router
+from backend.fastapi_app.routers import status as status_router
+from backend.fastapi_app.services import orchestrator
+from backend.fastapi_app.services.admission_control import AdmissionRejected
+from backend.fastapi_app.services.executor import LocalExecutor
+
+client = TestClient(app)
+
+
+def test_bulk_task_status(monkeypatch):
+    """One request returns the per-task progress structure for every id, deduplicated."""
+    states = {
+        "t-pending": ("PENDING", None),
+        "t-progress": ("PROGRESS", {"current": 3, "total": 4}),
+        "t-done": ("SUCCESS", {"total": 5, "final_accuracy": 0.9}),
+        "t-failed": ("FAILURE", ValueError("boom")),
+    }
+    calls = []
+
+    def fake_fetch(task_ids):
+        calls.append(list(task_ids))
+        return [states[tid] for tid in task_ids]
+
+    monkeypatch.setattr(orchestrator_router.executor, "task_states", fake_fetch)
+
+    response = client.post(
+        "/orchestrate/tasks/status",
+        json={"task_ids": ["t-pending", "t-progress", "t-done", "t-failed", "t-progress"]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert len(calls) == 1, "Expected a single batched backend read"
+    assert data["count"] == 4
+    by_id = {t["task_id"]: t for t in data["tasks"]}
+    assert by_id["t-pending"]["progress"]["percentage"] == 0
+    assert by_id["t-progress"]["progress"] == {"current": 3, "total": 4, "percentage": 75.0}
+    assert by_id["t-done"]["progress"]["percentage"] == 100
+    assert by_id["t-done"]["result"]["final_accuracy"] == 0.9
+    assert by_id["t-failed"]["progress"] is None
+    assert by_id["t-failed"]["result"] == "boom"
+
+
+def test_status_uses_the_executor(monkeypatch):
+    """/status answers from whichever executor is configured, without Redis for the local one."""
+    executor = LocalExecutor(max_workers=1)
+    executor._states["t-local"] = ("SUCCESS", {"final_accuracy": 0.8})
+    monkeypatch.setattr(status_router, "executor", executor)
+
+    assert client.get("/status/t-local").json() == {
+        "task_id": "t-local", "state": "SUCCESS", "result": {"final_accuracy": 0.8},
+    }
+    assert client.get("/status/unknown").json()["state"] == "PENDING"
+
+
+def test_fetch_task_states_matches_async_result(monkeypatch):
+    """The batched read decodes stored exceptions exactly like AsyncResult.info."""
+    backend = orchestrator.celery_app.backend
+    monkeypatch.setitem(backend.__dict__, "client", fakeredis.FakeRedis())
+    monkeypatch.setattr(orchestrator.task_archive, "get_states", lambda task_ids: {})
+    backend.store_result("t-done", {"final_accuracy": 0.9}, "SUCCESS")
+    backend.store_result("t-failed", ValueError("boom"), "FAILURE")
+
+    task_ids = ["t-done", "t-failed", "t-unknown"]
+    states = orchestrator.fetch_task_states(task_ids)
+
+    assert [status for status, _ in states] == ["SUCCESS", "FAILURE", "PENDING"]
+    assert isinstance(states[1][1], ValueError) and states[1][1].args == ("boom",)
+    for task_id, (status, info) in zip(task_ids, states):
+        result = orchestrator.celery_app.AsyncResult(task_id)
+        assert (result.status, repr(result.info)) == (status, repr(info))
+
+
+def test_progress_websocket_coalesces_updates(monkeypatch):
+    """Events arriving within one interval reach the client as a single frame carrying only the latest."""
+    async def fake_subscribe(task_id, last_event_id=None):
+        for epoch in range(1, 4):
+            yield f"{epoch}-0", json.dumps({"epoch": epoch, "status": "PROGRESS"})
+            await asyncio.sleep(0.01)
+        yield "4-0", json.dumps({"epoch": 3, "status": "SUCCESS"})
+
+    monkeypatch.setattr(orchestrator_router.broadcast_service, "subscribe", fake_subscribe)
+
+    with client.websocket_connect("/orchestrate/ws/progress?interval=0.5") as ws:
+        ws.send_json({"action": "subscribe", "task_ids": ["a", "b"]})
+        assert ws.receive_json()["type"] == "subscriptions"
+
+        received = {"a": [], "b": []}
+        while not all(events and events[-1]["data"]["status"] == "SUCCESS" for events in received.values()):
+            frame = ws.receive_json()
+            assert frame["type"] == "progress"
+            task_ids = [update["task_id"] for update in frame["updates"]]
+            assert len(task_ids) == len(set(task_ids)), "One update per task per frame"
+            for update in frame["updates"]:
+                received[update["task_id"]].append(update)
+
+        for events in received.values():
+            # The first event goes out at once; the other three fall within one interval
+            assert [e["event_id"] for e in events] in (["1-0", "4-0"], ["4-0"])
+
+        ws.send_json({"action": "bogus", "task_ids": []})
+        assert ws.receive_json()["type"] == "error"
+
+
+def test_progress_websocket_caps_subscriptions(monkeypatch):
+    async def idle_subscribe(task_id, last_event_id=None):
+        await asyncio.sleep(60)
+        yield None, None
+
+    monkeypatch.setattr(orchestrator_router.broadcast_service, "subscribe", idle_subscribe)
+    monkeypatch.setattr(orchestrator_router.settings.cache, "progress_ws_max_subscriptions", 3)
+
+    with client.websocket_connect("/orchestrate/ws/progress") as ws:
+        ws.send_json({"action": "subscribe", "task_ids": ["a", "b"]})
+        assert ws.receive_json() == {"type": "subscriptions", "task_ids": ["a", "b"]}
+
+        ws.send_json({"action": "subscribe", "task_ids": ["b", "c", "d"]})
+        frame = ws.receive_json()
+        assert frame["type"] == "error" and "at most 3" in frame["detail"]
+
+        ws.send_json({"action": "subscribe", "task_ids": ["b", "c"]})
+        assert ws.receive_json() == {"type": "subscriptions", "task_ids": ["a", "b", "c"]}
+
+
+def test_cancel_task(monkeypatch):
+    """DELETE revokes known tasks and returns 404 for unknown ids."""
+    registry = {"queued": {"status": "QUEUED"}, "running": {"status": "RUNNING"}}
+    outcome = {"queued": "REVOKED", "running": "CANCELLING"}
+
+    monkeypatch.setattr(orchestrator_router.executor.registry, "get", lambda task_id: registry.get(task_id, {}))
+    monkeypatch.setattr(orchestrator_router.executor, "cancel", lambda task_id: outcome[task_id])
+
+    assert client.delete("/orchestrate/tasks/queued").json() == {"task_id": "queued", "status": "REVOKED"}
+    assert client.delete("/orchestrate/tasks/running").json()["status"] == "CANCELLING"
+    assert client.delete("/orchestrate/tasks/missing").status_code == 404
+
+
+def test_train_rejected_with_retry_after(monkeypatch):
+    """Admission rejections surface as 429 with a Retry-After header."""
+    def reject(*args, **kwargs):
+        assert kwargs["client_id"] == "ui-1"
+        raise AdmissionRejected("Queue 'training' is full (1000 tasks waiting)", retry_after=10)
+
+    monkeypatch.setattr(orchestrator_router.executor, "submit_training", reject)
+
+    response = client.post(
+        "/orchestrate/train",
+        json={"experiment_id": 1, "env_name": "CartPole-v1", "algo": "DQN"},
+        headers={"X-Client-ID": "ui-1"},
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
+
+
+def test_train_duplicate_returns_existing_task(monkeypatch):
+    """A repeated Idempotency-Key returns the first task id with status "duplicate"."""
+    submitted = {}
+
+    def fake_submit(*args, idempotency_key=None, task_id=None, **kwargs):
+        return submitted.setdefault(idempotency_key, task_id)
+
+    monkeypatch.setattr(orchestrator_router.executor, "submit_training", fake_submit)
+
+    payload = {"experiment_id": 1, "env_name": "CartPole-v1", "algo": "DQN"}
+    first = client.post("/orchestrate/train", json=payload, headers={"Idempotency-Key": "abc"}).json()
+    second = client.post("/orchestrate/train", json=payload, headers={"Idempotency-Key": "abc"}).json()
+
+    assert first["status"] == "queued"
+    assert second == {**second, "task_id": first["task_id"], "status": "duplicate"}
+
+
+def test_train_priority_bounded_by_config(monkeypatch):
+    """Priorities are validated against Settings.celery.max_priority, not a fixed range."""
+    monkeypatch.setattr(orchestrator_router.settings.celery, "max_priority", 3)
+    monkeypatch.setattr(orchestrator_router.executor, "submit_training", lambda *args, task_id=None, **kwargs: task_id)
+
+    payload = {"experiment_id": 1, "env_name": "CartPole-v1", "algo": "DQN"}
+    assert client.post("/orchestrate/train", json={**payload, "priority": 3}).status_code == 200
+    response = client.post("/orchestrate/train", json={**payload, "priority": 4})
+    assert response.status_code == 422
+    assert "between 0 and 3" in response.json()["error"]
+    assert client.post("/orchestrate/train", json={**payload, "priority": -1}).status_code == 422
+
+
+def test_worker_argv_per_queue(monkeypatch):
+    """Each queue's worker gets its prefetch, a distinct node name, and beat only on the first default worker."""
+    config = orchestrator.celery_config
+    monkeypatch.setattr(orchestrator.celery_app.conf, "beat_schedule", {"archive-finished-tasks": {}})
+
+    def flag(argv, name):
+        return next(arg.split("=", 1)[1] for arg in argv if arg.startswith(f"--{name}="))
+
+    short = orchestrator.worker_argv(config.default_queue)
+    assert short[short.index("-Q") + 1] == config.default_queue
+    assert short[short.index("-n") + 1] == f"{config.default_queue}@%h"
+    assert flag(short, "prefetch-multiplier") == str(config.prefetch_multiplier)
+    assert flag(short, "concurrency") == str(config.worker_concurrency[config.default_queue])
+    assert short[-1] == "--beat"
+
+    second = orchestrator.worker_argv(config.default_queue, index=2)
+    assert second[second.index("-n") + 1] == f"{config.default_queue}-2@%h"
+    assert "--beat" not in second
+
+    for queue in config.long_running_queues:
+        argv = orchestrator.worker_argv(queue)
+        assert flag(argv, "prefetch-multiplier") == "1"
+        assert "--beat" not in argv
+
+    monkeypatch.setattr(orchestrator.celery_app.conf, "beat_schedule", {})
+    assert "--beat" not in orchestrator.worker_argv(config.default_queue)
+
+    with pytest.raises(ValueError):
+        orchestrator.worker_argv("no-such-queue")
@@ -0,0 +1,167 @@
+"""
+# tests/test_progress_broadcast.py
+------------------------------------------
+Validates the Redis Streams progress broadcaster: replay from
+Last-Event-ID, stream trimming, and the shared reader's fan-out,
+drop-oldest queues, heartbeats and replay-to-live handover.
+"""
+
+import asyncio
+import json
+from contextlib import aclosing
+
+from backend.fastapi_app.services import orchestrator
+from backend.fastapi_app.services.progress_broadcast import ProgressBroadcastService, progress_stream_key
+
+
+def make_service(fake_async_redis, **kwargs) -> ProgressBroadcastService:
+    kwargs.setdefault("block_ms", 50)
+    kwargs.setdefault("heartbeat_seconds", 5)
+    service = ProgressBroadcastService(**kwargs)
+    service.redis = fake_async_redis
+    return service
+
+
+async def take(updates, count: int, timeout: float = 2) -> list:
+    """The next `count` non-heartbeat (event_id, epoch) pairs from a subscription."""
+    events = []
+    while len(events) < count:
+        event_id, data = await asyncio.wait_for(updates.__anext__(), timeout)
+        if event_id is not None:
+            events.append((event_id, json.loads(data)["epoch"]))
+    return events
+
+
+def test_replay_from_last_event_id(fake_async_redis):
+    async def scenario():
+        service = make_service(fake_async_redis)
+        ids = [await service.publish("t1", {"epoch": epoch, "status": "PROGRESS"}) for epoch in range(1, 5)]
+        async with aclosing(service.subscribe("t1", last_event_id=ids[1])) as updates:
+            resumed = await take(updates, 2)
+        async with aclosing(service.subscribe("t1", last_event_id="bogus")) as updates:
+            everything = await take(updates, 4)
+        return ids, resumed, everything
+
+    ids, resumed, everything = asyncio.run(scenario())
+    assert resumed == [(ids[2], 3), (ids[3], 4)]
+    assert [epoch for _, epoch in everything] == [1, 2, 3, 4], "A malformed id replays the whole stream"
+
+
+def test_stream_is_capped(fake_redis, fake_async_redis, monkeypatch):
+    """XADD trims approximately while running; the terminal event trims exactly and sets a TTL."""
+    monkeypatch.setattr(orchestrator, "redis_client", fake_redis)
+    monkeypatch.setattr(orchestrator.cache_config, "progress_stream_maxlen", 5)
+    key = progress_stream_key("t1")
+
+    for epoch in range(1, 201):
+        orchestrator._publish_progress("t1", {"epoch": epoch, "status": "PROGRESS"})
+    # Approximate trimming only drops whole radix-tree nodes (up to 100 entries each)
+    assert 5 <= fake_redis.xlen(key) <= 5 + 100
+    assert fake_redis.ttl(key) == -1
+
+    orchestrator._publish_progress("t1", {"epoch": 200, "status": "SUCCESS"})
+    assert fake_redis.xlen(key) == 5
+    assert json.loads(fake_redis.xrevrange(key, count=1)[0][1]["data"])["status"] == "SUCCESS"
+    assert 0 < fake_redis.ttl(key) <= orchestrator.cache_config.progress_stream_ttl_seconds
+
+
+def test_one_reader_fans_out_to_every_subscriber(fake_async_redis):
+    async def scenario():
+        service = make_service(fake_async_redis)
+        reads = []
+        xread = fake_async_redis.xread
+
+        async def counting_xread(streams, **kwargs):
+            reads.append(sorted(streams))
+            return await xread(streams, **kwargs)
+
+        service.redis.xread = counting_xread
+        async with aclosing(service.subscribe("t1")) as a, aclosing(service.subscribe("t1")) as b, \
+                aclosing(service.subscribe("t2")) as c:
+            # Replays are empty; the first anext registers each subscriber and waits for live events
+            pending = [asyncio.ensure_future(updates.__anext__()) for updates in (a, b, c)]
+            await asyncio.sleep(0.1)
+            await service.publish("t1", {"epoch": 1, "status": "PROGRESS"})
+            await service.publish("t2", {"epoch": 7, "status": "PROGRESS"})
+            first = [await asyncio.wait_for(p, 2) for p in pending]
+            return [json.loads(data)["epoch"] for _, data in first], reads, service
+
+    epochs, reads, service = asyncio.run(scenario())
+    assert epochs == [1, 1, 7]
+    # Every XREAD covers all watched streams at once
+    assert any({progress_stream_key("t1"), progress_stream_key("t2")} <= set(streams) for streams in reads)
+    assert service.subscribers == {}
+
+
+def test_slow_subscriber_keeps_the_latest_events(fake_async_redis):
+    async def scenario():
+        service = make_service(fake_async_redis, queue_size=2)
+        async with aclosing(service.subscribe("t1")) as updates:
+            waiting = asyncio.ensure_future(updates.__anext__())
+            await asyncio.sleep(0.1)
+            ids = [await service.publish("t1", {"epoch": epoch, "status": "PROGRESS"}) for epoch in range(1, 7)]
+            await asyncio.sleep(0.2)  # the reader fans everything out while nobody consumes
+            received = [(await waiting)[0]]
+            while received[-1] != ids[-1]:
+                received += [event_id for event_id, _ in await take(updates, 1)]
+            return ids, received
+
+    ids, received = asyncio.run(scenario())
+    # The full queue dropped its oldest entries: only the newest events arrive, in order
+    assert received == sorted(received, key=lambda event_id: tuple(map(int, event_id.split("-"))))
+    assert len(received) <= 3, "At most the queue size plus the one already handed out"
+    assert received[-2:] == ids[-2:]
+
+
+def test_idle_subscription_heartbeats(fake_async_redis):
+    async def scenario():
+        service = make_service(fake_async_redis, heartbeat_seconds=0.05)
+        async with aclosing(service.subscribe("idle")) as updates:
+            return await asyncio.wait_for(updates.__anext__(), 1)
+
+    assert asyncio.run(scenario()) == (None, None)
+
+
+def test_replay_and_live_handover_has_no_duplicates(fake_async_redis):
+    """An event published between registration and replay is delivered once."""
+    async def scenario():
+        service = make_service(fake_async_redis)
+        await service.publish("t1", {"epoch": 1, "status": "PROGRESS"})
+        register = service._register
+
+        async def register_then_publish(task_id):
+            queue = await register(task_id)
+            await service.publish(task_id, {"epoch": 2, "status": "PROGRESS"})  # seen by replay and reader
+            await asyncio.sleep(0.1)
+            return queue
+
+        service._register = register_then_publish
+        async with aclosing(service.subscribe("t1")) as updates:
+            events = await take(updates, 2)
+            await service.publish("t1", {"epoch": 3, "status": "PROGRESS"})
+            events += await take(updates, 1)
+        return events
+
+    events = asyncio.run(scenario())
+    assert [epoch for _, epoch in events] == [1, 2, 3]
+    assert len({event_id for event_id, _ in events}) == 3
+
+
+def test_new_subscription_wakes_blocked_reader(fake_async_redis):
+    """A task watched while the reader is blocked in XREAD gets its events without waiting out block_ms."""
+    async def scenario():
+        service = make_service(fake_async_redis, block_ms=10000)
+        async with aclosing(service.subscribe("t1")) as first:
+            waiting = asyncio.ensure_future(first.__anext__())
+            await asyncio.sleep(0.1)  # reader now blocked on t1 only
+            async with aclosing(service.subscribe("t2")) as second:
+                pending = asyncio.ensure_future(second.__anext__())
+                await asyncio.sleep(0.1)
+                await service.publish("t2", {"epoch": 1, "status": "PROGRESS"})
+                event = await asyncio.wait_for(pending, 1)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            return event
+
+    event_id, data = asyncio.run(scenario())
+    assert json.loads(data)["epoch"] == 1
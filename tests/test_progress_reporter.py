@@ -0,0 +1,61 @@
+"""
+# tests/test_progress_reporter.py
+------------------------------------------
+Validates time-based throttling of progress writes
+from long-running Celery tasks.
+"""
+
+from backend.fastapi_app.services.progress_reporter import ProgressReporter
+
+
+class FakeTask:
+    def __init__(self):
+        self.states = []
+
+    def update_state(self, state, meta):
+        self.states.append((state, meta))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_writes_are_bounded_by_interval():
+    """1000 steps at 10 Hz with a 1s interval produce ~100 writes, not 1000."""
+    task, clock, published = FakeTask(), FakeClock(), []
+    reporter = ProgressReporter(task, sinks=[published.append], interval=1.0, clock=clock)
+
+    for step in range(1, 1001):
+        clock.now = step * 0.1
+        reporter.report({"current": step, "total": 1000})
+    reporter.close()
+
+    assert reporter.reported == 1000
+    assert 95 <= len(task.states) <= 105
+    assert published == [meta for _, meta in task.states]
+    assert task.states[-1][1]["current"] == 1000, "Final state must always be flushed"
+
+
+def test_milestones_bypass_throttle():
+    task, clock = FakeTask(), FakeClock()
+    reporter = ProgressReporter(task, interval=60.0, clock=clock)
+
+    for step in range(1, 21):
+        reporter.report({"current": step}, milestone=step % 5 == 0)
+
+    written = [meta["current"] for _, meta in task.states]
+    assert written == [1, 5, 10, 15, 20]
+
+
+def test_close_without_pending_writes_nothing():
+    task, clock = FakeTask(), FakeClock()
+    reporter = ProgressReporter(task, interval=1.0, clock=clock)
+
+    reporter.report({"current": 1})
+    reporter.close()
+
+    assert len(task.states) == 1
@@ -0,0 +1,120 @@
+"""
+# tests/test_run_archive.py
+------------------------------------------
+Validates the incremental Parquet export of finished runs and
+benchmarks, and partition/column-pruned queries against it.
+"""
+
+from datetime import date, datetime
+
+import pyarrow.dataset as ds
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.fastapi_app.services.run_archive import RunArchive
+from shared.models.experiment_model import EpochMetric, TrainingRun
+
+
+@pytest.fixture
+def sessions(sqlite_engine):
+    return sessionmaker(bind=sqlite_engine)
+
+
+def add_run(sessions, task_id, experiment_id, env, algo, accuracy, completed_at, status="SUCCESS"):
+    with sessions() as db:
+        run = TrainingRun(
+            task_id=task_id, experiment_id=experiment_id, env=env, algo=algo, status=status,
+            total_epochs=2, final_accuracy=accuracy, completed_at=completed_at,
+        )
+        db.add(run)
+        db.flush()
+        for epoch in (1, 2):
+            db.add(EpochMetric(
+                run_id=run.id, experiment_id=experiment_id, epoch=epoch,
+                reward=100.0 * epoch, recorded_at=completed_at,
+            ))
+        db.commit()
+
+
+BENCHMARKS = [
+    {"model_id": "m1", "env_name": "CartPole-v1", "mean_reward": 190.0, "std_reward": 4.0,
+     "median_reward": 191.0, "latency_ms": 2.5, "total_episodes": 10, "status": "completed",
+     "evaluated_at": "2026-03-01T09:00:00"},
+]
+
+
+def test_export_is_partitioned_and_incremental(sessions, tmp_path):
+    def benchmark_source(after):
+        return [r for r in BENCHMARKS if not after or r["evaluated_at"] >= after]
+
+    archive = RunArchive(tmp_path, sessions, row_group_size=2, benchmark_source=benchmark_source)
+    add_run(sessions, "t1", 1, "CartPole-v1", "DQN", 0.80, datetime(2026, 3, 1, 10))
+    add_run(sessions, "t2", 2, "CartPole-v1", "PPO", 0.95, datetime(2026, 3, 1, 11))
+    add_run(sessions, "t3", 1, "CartPole-v1", "DQN", 0.85, datetime(2026, 3, 2, 8))
+    add_run(sessions, "t4", 3, "MountainCar-v0", "DQN", None, datetime(2026, 3, 2, 9), status="REVOKED")
+
+    assert archive.export(batch_size=3) == {"runs": 4, "epochs": 8, "benchmarks": 1}
+    assert (tmp_path / "runs" / "date=2026-03-01" / "env=CartPole-v1" / "algo=PPO").is_dir()
+    assert (tmp_path / "benchmarks" / "date=2026-03-01" / "env=CartPole-v1").is_dir()
+
+    # Nothing new: nothing written twice
+    assert archive.export() == {"runs": 0, "epochs": 0, "benchmarks": 0}
+    add_run(sessions, "t5", 2, "CartPole-v1", "PPO", 0.97, datetime(2026, 3, 3, 8))
+    assert archive.export()["runs"] == 1
+    assert archive.scan("runs", columns=["task_id"]).num_rows == 5
+
+    assert archive.leaderboard() == [
+        {"experiment_id": 2, "env": "CartPole-v1", "algo": "PPO", "best_accuracy": 0.97,
+         "mean_accuracy": pytest.approx(0.96), "runs": 2},
+        {"experiment_id": 1, "env": "CartPole-v1", "algo": "DQN", "best_accuracy": 0.85,
+         "mean_accuracy": pytest.approx(0.825), "runs": 2},
+    ]
+    assert [r["experiment_id"] for r in archive.leaderboard(algo="DQN", until=date(2026, 3, 1))] == [1]
+
+
+def test_scan_projects_columns_and_filters(sessions, tmp_path):
+    archive = RunArchive(tmp_path, sessions, row_group_size=2)
+    assert archive.scan("epochs", columns=["reward"]).num_rows == 0  # before any export
+    for i in range(6):
+        add_run(sessions, f"t{i}", i, "CartPole-v1", "DQN", 0.5, datetime(2026, 3, 1, i))
+    archive.export()
+
+    table = archive.scan(
+        "epochs", columns=["experiment_id", "reward"], env="CartPole-v1",
+        since=date(2026, 3, 1), where=ds.field("experiment_id") == 4,
+    )
+    assert table.column_names == ["experiment_id", "reward"]
+    assert table.to_pydict() == {"experiment_id": [4, 4], "reward": [100.0, 200.0]}
+    assert archive.scan("epochs", env="Acrobot-v1").num_rows == 0
+
+    with pytest.raises(ValueError):
+        archive.scan("benchmarks", algo="DQN")
+
+
+def test_export_retry_and_timestamp_ties_do_not_duplicate(sessions, tmp_path, monkeypatch):
+    results = [dict(BENCHMARKS[0])]
+    archive = RunArchive(
+        tmp_path, sessions,
+        benchmark_source=lambda after: [r for r in results if not after or r["evaluated_at"] >= after],
+    )
+    add_run(sessions, "t1", 1, "CartPole-v1", "DQN", 0.80, datetime(2026, 3, 1, 10))
+
+    def crash(state):
+        raise OSError("disk full")
+
+    # Crash after the files are written but before the watermark is saved
+    monkeypatch.setattr(archive, "_save_state", crash)
+    with pytest.raises(OSError):
+        archive.export()
+    monkeypatch.undo()
+    add_run(sessions, "t2", 2, "CartPole-v1", "PPO", 0.90, datetime(2026, 3, 1, 11))
+    assert archive.export() == {"runs": 2, "epochs": 4, "benchmarks": 1}
+    assert archive.scan("runs", columns=["task_id"]).column("task_id").to_pylist() == ["t1", "t2"]
+
+    # Stored later with the timestamp the watermark stopped at
+    results.append({**BENCHMARKS[0], "model_id": "m2"})
+    assert archive.export()["benchmarks"] == 1
+    results.append({**BENCHMARKS[0], "model_id": "m3"})
+    assert archive.export()["benchmarks"] == 1
+    assert archive.export()["benchmarks"] == 0
+    assert sorted(archive.scan("benchmarks", columns=["model_id"]).column("model_id").to_pylist()) == ["m1", "m2", "m3"]
@@ -0,0 +1,125 @@
+"""
+# tests/test_run_metrics.py
+------------------------------------------
+Validates batched epoch-metric writes from training tasks
+and the analytics queries served from those tables.
+"""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.fastapi_app.services import analytics_service, orchestrator
+from backend.fastapi_app.services.analytics_service import AnalyticsService
+from backend.fastapi_app.services.checkpoint_store import CheckpointStore
+from backend.fastapi_app.services.run_metrics import RunMetricsWriter
+from backend.fastapi_app.services.task_context import TaskContext
+from shared.models.experiment_model import EpochMetric, TrainingRun
+
+
+def count_epochs(sessions):
+    with sessions() as db:
+        return db.scalar(select(func.count()).select_from(EpochMetric))
+
+
+def test_epochs_are_written_in_batches(sqlite_engine):
+    sessions = sessionmaker(bind=sqlite_engine)
+    now = [0.0]
+    writer = RunMetricsWriter(sessions, flush_epochs=3, flush_seconds=60, clock=lambda: now[0])
+    writer.start_run("task-1", 7, "CartPole-v1", "DQN", total_epochs=5)
+
+    writer.record(1, 200.0)
+    writer.record(2, 210.0)
+    assert count_epochs(sessions) == 0
+    writer.record(3, 220.0)
+    assert count_epochs(sessions) == 3
+
+    now[0] = 61
+    writer.record(4, 230.0)  # interval elapsed
+    assert count_epochs(sessions) == 4
+
+    # Resumed delivery: the run is reopened and re-run epochs overwrite the earlier rows
+    resumed = RunMetricsWriter(sessions, flush_epochs=3, flush_seconds=60)
+    resumed.start_run("task-1", 7, "CartPole-v1", "DQN", total_epochs=5)
+    assert resumed.run_id == writer.run_id
+    resumed.record(4, 231.0)
+    resumed.record(5, 240.0)
+    resumed.finish("SUCCESS", final_accuracy=0.93)
+
+    with sessions() as db:
+        rewards = dict(db.execute(select(EpochMetric.epoch, EpochMetric.reward)).all())
+        run = db.get(TrainingRun, writer.run_id)
+        assert rewards == {1: 200.0, 2: 210.0, 3: 220.0, 4: 231.0, 5: 240.0}
+        assert run.status == "SUCCESS" and run.final_accuracy == 0.93 and run.completed_at
+
+
+class CrashingContext(TaskContext):
+    """Task context whose progress write fails, as a lost result backend would."""
+
+    task_id = "task-crash"
+
+    def update_state(self, state, meta):
+        raise RuntimeError("result backend unreachable")
+
+    def publish(self, meta):
+        pass
+
+    def record(self, data):
+        pass
+
+    def cancel_requested(self):
+        return False
+
+
+def test_failed_training_closes_its_run(sqlite_engine, tmp_path, monkeypatch):
+    sessions = sessionmaker(bind=sqlite_engine)
+    monkeypatch.setattr(orchestrator, "SessionLocal", sessions)
+    monkeypatch.setattr(orchestrator, "checkpoint_store", CheckpointStore(str(tmp_path)))
+    monkeypatch.setattr(orchestrator.time, "sleep", lambda seconds: None)
+
+    with pytest.raises(RuntimeError):
+        orchestrator.train_experiment(CrashingContext(), 7, "CartPole-v1", "DQN", total_epochs=3)
+
+    with sessions() as db:
+        run = db.scalar(select(TrainingRun).where(TrainingRun.task_id == "task-crash"))
+        assert run.status == "FAILURE" and run.completed_at is not None
+
+
+def test_analytics_reads_metric_tables(sqlite_engine, monkeypatch):
+    sessions = sessionmaker(bind=sqlite_engine)
+    monkeypatch.setattr(analytics_service, "SessionLocal", sessions)
+    monkeypatch.setattr(analytics_service, "engine", sqlite_engine)
+    monkeypatch.setattr(analytics_service, "_metrics_tables_ready", False)
+
+    for task_id, experiment_id in (("a", 1), ("b", 2)):
+        writer = RunMetricsWriter(sessions)
+        writer.start_run(task_id, experiment_id, "CartPole-v1", "PPO", total_epochs=3)
+        for epoch in (1, 2, 3):
+            writer.record(epoch, 100.0 * experiment_id + epoch)
+        writer.finish("SUCCESS", final_accuracy=0.9)
+
+    df = AnalyticsService.experiment_rewards(2)
+    assert df["epoch"].tolist() == [1, 2, 3]
+    assert df["reward"].tolist() == [201.0, 202.0, 203.0]
+
+    recent = AnalyticsService.list_recent_experiments(limit=1)
+    assert recent == [{"experiment_id": 2, "env": "CartPole-v1", "algorithm": "PPO", "final_accuracy": 0.9}]
+
+
+def test_log_rewards_drop_only_resumed_epochs(tmp_path, monkeypatch):
+    """Two runs of one experiment are both kept; a resumed task's re-run epochs replace its earlier lines."""
+    log_file = tmp_path / "resimhub.log"
+    log_file.write_text("".join(
+        f"2026-03-01 | INFO | TrainingService | Experiment 7 | Epoch {epoch}/3 | Reward: {reward}{task}\n"
+        for epoch, reward, task in [
+            (1, 100.0, ""), (2, 110.0, ""),                        # older log format
+            (1, 200.0, " | Task: a"), (2, 210.0, " | Task: a"),  # worker lost after epoch 2
+            (2, 210.0, " | Task: a"), (3, 220.0, " | Task: a"),  # resumed from epoch 1
+            (1, 300.0, " | Task: b"),
+        ]
+    ))
+    monkeypatch.setattr(analytics_service, "LOG_FILE", log_file)
+
+    df = AnalyticsService.parse_experiment_logs(7)
+    assert df["epoch"].tolist() == [1, 2, 1, 2, 3, 1]
+    assert df["reward"].tolist() == [100.0, 110.0, 200.0, 210.0, 220.0, 300.0]
@@ -0,0 +1,129 @@
+"""
+# tests/test_sweep_scheduler.py
+------------------------------------------
+Validates successive-halving rung decisions used by
+the /orchestrate/sweeps scheduler.
+"""
+
+import asyncio
+
+from backend.fastapi_app.services import orchestrator
+from backend.fastapi_app.services.progress_broadcast import ProgressBroadcastService
+from backend.fastapi_app.services.sweep_scheduler import SuccessiveHalving, SweepScheduler, expand_grid
+from backend.fastapi_app.services.task_registry import TaskRegistry
+
+
+def test_expand_grid():
+    configs = expand_grid({"lr": [0.1, 0.01], "gamma": [0.9, 0.99]})
+    assert len(configs) == 4
+    assert {"lr": 0.01, "gamma": 0.99} in configs
+
+
+def test_rungs_follow_reduction_factor():
+    sh = SuccessiveHalving(["a"], min_epochs=1, max_epochs=27, eta=3)
+    assert sh.rungs == [1, 3, 9]
+
+
+def test_only_top_fraction_is_promoted():
+    """Trials arriving worse than the top 1/eta of their rung are stopped."""
+    trials = [f"t{i}" for i in range(9)]
+    sh = SuccessiveHalving(trials, min_epochs=1, max_epochs=9, eta=3)
+    scores = {"t0": 200, "t1": 250, "t2": 190, "t3": 180, "t4": 240,
+              "t5": 185, "t6": 195, "t7": 170, "t8": 175}
+
+    decisions = {tid: sh.record(tid, 1, scores[tid]) for tid in trials}
+
+    promoted = {tid for tid, d in decisions.items() if d == "promote"}
+    assert promoted == {"t0", "t1", "t4"}
+    assert sh.trials["t2"]["status"] == "STOPPED"
+    assert len(promoted) == sh._quota(0)
+
+
+def test_intermediate_epochs_and_completion():
+    sh = SuccessiveHalving(["a", "b"], min_epochs=2, max_epochs=4, eta=2)
+
+    assert sh.record("a", 1, 100.0) is None
+    assert sh.record("a", 2, 120.0) == "promote"
+    # Throttled reporting may skip the rung epoch itself
+    assert sh.record("b", 3, 90.0) == "stop"
+    assert sh.record("b", 4, 500.0) is None, "Stopped trials are ignored"
+
+    sh.finish("a", "SUCCESS")
+    assert sh.done
+    assert sh.to_dict()["rungs"][0]["promoted"] == ["a"]
+
+
+def test_sweep_completes_when_a_trial_fails(monkeypatch, fake_redis, fake_async_redis):
+    """A trial whose Celery task raises is reported FAILURE and no longer holds the sweep open."""
+    registry = TaskRegistry(fake_redis)
+    monkeypatch.setattr(orchestrator, "redis_client", fake_redis)
+    monkeypatch.setattr(orchestrator, "task_registry", registry)
+    trial_ids = iter(["ok", "broken"])
+
+    def submit(*args, **kwargs):
+        task_id = next(trial_ids)
+        registry.upsert(task_id, {"status": "RUNNING", "type": "training"})
+        return task_id
+
+    async def scenario():
+        broadcast = ProgressBroadcastService(block_ms=50, heartbeat_seconds=0.1)
+        broadcast.redis = fake_async_redis
+        scheduler = SweepScheduler(broadcast, submit, stop=lambda task_id: None)
+        sweep = await scheduler.start(1, "CartPole-v1", "DQN", [{"lr": 0.1}, {"lr": 0.01}], 1, 2, eta=2)
+
+        orchestrator._publish_progress("ok", {"status": "SUCCESS"})
+        # task_postrun as sent by the worker after the task body raised
+        orchestrator._on_task_finished(task_id="broken", state="FAILURE", retval=RuntimeError("boom"))
+
+        await asyncio.wait_for(scheduler._running[sweep["sweep_id"]], timeout=5)
+        return await scheduler.get(sweep["sweep_id"])
+
+    sweep = asyncio.run(scenario())
+
+    assert sweep["status"] == "COMPLETED"
+    assert sweep["halving"]["trials"]["broken"]["status"] == "FAILURE"
+    assert registry.get("broken")["status"] == "FAILURE"
+    assert "boom" in registry.get("broken")["error"]
+
+
+def test_expired_lease_is_taken_over(monkeypatch, fake_redis, fake_async_redis):
+    """A sweep whose driving process died is resumed by another process once its lease expires."""
+    registry = TaskRegistry(fake_redis)
+    monkeypatch.setattr(orchestrator, "redis_client", fake_redis)
+    monkeypatch.setattr(orchestrator, "task_registry", registry)
+    trial_ids = iter(["a", "b"])
+
+    def submit(*args, **kwargs):
+        task_id = next(trial_ids)
+        registry.upsert(task_id, {"status": "RUNNING", "type": "training"})
+        return task_id
+
+    def make_scheduler():
+        broadcast = ProgressBroadcastService(block_ms=50, heartbeat_seconds=0.1)
+        broadcast.redis = fake_async_redis
+        return SweepScheduler(broadcast, submit, stop=lambda task_id: None)
+
+    async def scenario():
+        dead = make_scheduler()
+        sweep = await dead.start(1, "CartPole-v1", "DQN", [{"lr": 0.1}, {"lr": 0.01}], 1, 2, eta=2)
+        sweep_id = sweep["sweep_id"]
+        # The driver vanishes without releasing its lease, which then runs out
+        await dead.close()
+        await fake_async_redis.set(f"resimhub:sweeps:{sweep_id}:lease", dead.owner, px=300)
+
+        survivor = make_scheduler()
+        survivor.watch(interval=0.05)
+        await asyncio.sleep(0.1)
+        held_back = sweep_id in survivor._running
+        await asyncio.sleep(0.4)
+        taken_over = sweep_id in survivor._running
+
+        for task_id in ("a", "b"):
+            orchestrator._publish_progress(task_id, {"status": "SUCCESS"})
+        await asyncio.wait_for(survivor._running[sweep_id], timeout=5)
+        await survivor.close()
+        return held_back, taken_over, await survivor.get(sweep_id)
+
+    held_back, taken_over, sweep = asyncio.run(scenario())
+    assert not held_back and taken_over
+    assert sweep["status"] == "COMPLETED"
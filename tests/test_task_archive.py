@@ -0,0 +1,93 @@
+"""
+# tests/test_task_archive.py
+------------------------------------------
+Validates the SQL archive of finished tasks and the
+Redis task table's expiry, compaction and fallback to it.
+"""
+
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.fastapi_app.services.task_archive import TaskArchive
+from backend.fastapi_app.services.task_registry import TaskRegistry
+
+
+@pytest.fixture
+def archive(sqlite_engine):
+    archive = TaskArchive(sessionmaker(bind=sqlite_engine))
+    archive.ensure_table(sqlite_engine)
+    return archive
+
+
+RECORD = {
+    "experiment_id": "7",
+    "env": "CartPole-v1",
+    "algo": "DQN",
+    "status": "SUCCESS",
+    "created_at": "2026-01-01T10:00:00",
+    "completed_at": "2026-01-01T10:05:00",
+}
+
+
+def test_archive_round_trip(archive):
+    """Archived records come back verbatim; storing twice replaces the row."""
+    result = {"final_accuracy": 0.91, "status": "SUCCESS"}
+    assert archive.store([("task-1", RECORD, result)]) == 1
+    archive.store([("task-1", RECORD, result)])
+
+    assert archive.get("task-1") == RECORD
+    assert archive.get("missing") == {}
+    assert archive.get_states(["task-1", "missing"]) == {"task-1": ("SUCCESS", result)}
+
+
+def test_archive_streams_in_batches(archive):
+    archive.store([(f"task-{i}", RECORD, None) for i in range(5)])
+    batches = list(archive.iter_records(batch_size=2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert batches[0][0] == {"task_id": "task-0", "record": RECORD, "result": None}
+
+
+def test_finished_tasks_expire_and_compact(redis_client, archive):
+    """Only old finished tasks are compacted; lookups then fall back to the archive."""
+    registry = TaskRegistry(redis_client, record_ttl_seconds=600, archive=archive)
+    registry.upsert("done", dict(RECORD))
+    registry.upsert("running", {**RECORD, "status": "RUNNING"})
+
+    assert 0 < redis_client.ttl(registry.task_key("done")) <= 600
+    assert redis_client.ttl(registry.task_key("running")) == -1
+
+    assert registry.finished_before(time.time() - 60, limit=10) == []
+    candidates = registry.finished_before(time.time() + 1, limit=10)
+    assert [(task_id, status) for task_id, status, _ in candidates] == [("done", "SUCCESS")]
+
+    _, _, record = candidates[0]
+    archive.store([("done", record, None)])
+    registry.remove("done", record)
+
+    assert not redis_client.exists(registry.task_key("done"))
+    assert registry.get("done") == RECORD
+    assert [t["task_id"] for t in registry.list_tasks()["tasks"]] == ["running"]
+    assert registry.list_tasks(experiment_id=7, status="success")["tasks"] == []
+
+    # Export: live tasks first, then archived ones no longer in Redis
+    archive.store([("running", {**RECORD, "status": "RUNNING"}, None)])  # still live: not repeated
+    exported = list(registry.iter_records(batch_size=1))
+    assert [(e["task_id"], e["record"]["status"]) for e in exported] == [("running", "RUNNING"), ("done", "SUCCESS")]
+
+
+def test_export_includes_live_results(fake_redis):
+    """Finished tasks still in Redis are exported with their result, as archived ones are."""
+    registry = TaskRegistry(fake_redis)
+    registry.upsert("done", dict(RECORD))
+    registry.upsert("failed", {**RECORD, "status": "FAILURE"})
+    registry.upsert("running", {**RECORD, "status": "RUNNING"})
+    states = {
+        "done": ("SUCCESS", {"final_accuracy": 0.91}),
+        "failed": ("FAILURE", RuntimeError("diverged")),
+        "running": ("PROGRESS", {"epoch": 3}),
+    }
+
+    exported = {e["task_id"]: e["result"] for e in registry.iter_records(2, lambda ids: [states[i] for i in ids])}
+    assert exported == {"done": {"final_accuracy": 0.91}, "failed": "diverged", "running": None}
@@ -0,0 +1,50 @@
+"""
+# tests/test_task_control.py
+------------------------------------------
+Validates the cancellation flags and the waiting set
+that drive cooperative cancellation and preemption.
+"""
+
+import time
+
+from backend.fastapi_app.services.task_control import TaskControl
+
+
+def test_cancel_flag(redis_client):
+    control = TaskControl(redis_client)
+    assert not control.cancel_requested("t1")
+    control.request_cancel("t1")
+    assert control.cancel_requested("t1")
+    assert redis_client.ttl(control.cancel_key("t1")) > 0
+
+
+def test_preemption_needs_better_priority_and_grace(redis_client):
+    """Only a strictly better-priority task that has waited past the grace period preempts."""
+    control = TaskControl(redis_client)
+    control.mark_waiting("training", "same-priority", 5)
+    control.mark_waiting("training", "urgent", 0)
+
+    # Waiting time below the grace period
+    assert control.preemption_target("training", 5, grace_seconds=60) is None
+
+    redis_client.zadd(f"{control.waiting_key('training')}:since", {"urgent": time.time() - 120})
+    assert control.preemption_target("training", 5, grace_seconds=60) == "urgent"
+    # Already claimed by the first running task
+    assert control.preemption_target("training", 5, grace_seconds=60) is None
+    # Nothing outranks a priority-0 task
+    assert control.preemption_target("training", 0, grace_seconds=0) is None
+
+
+def test_started_tasks_leave_waiting_set(redis_client):
+    control = TaskControl(redis_client)
+    control.mark_waiting("training", "urgent", 0)
+    control.mark_started("training", "urgent")
+    assert control.preemption_target("training", 9, grace_seconds=0) is None
+
+
+def test_oldest_wait(redis_client):
+    control = TaskControl(redis_client)
+    assert control.oldest_wait_seconds("training") == 0.0
+    control.mark_waiting("training", "t1", 5)
+    redis_client.zadd(f"{control.waiting_key('training')}:since", {"t1": time.time() - 30})
+    assert 29 < control.oldest_wait_seconds("training") < 60
@@ -0,0 +1,42 @@
+"""
+# tests/test_task_dedup.py
+------------------------------------------
+Validates idempotent submission records and the
+per-experiment training lock.
+"""
+
+from backend.fastapi_app.services.task_dedup import TaskDeduplicator, derive_idempotency_key
+
+
+def test_derived_key_is_stable():
+    a = derive_idempotency_key(1, "CartPole-v1", "DQN", hyperparams={"lr": 0.1, "gamma": 0.9})
+    b = derive_idempotency_key(1, "CartPole-v1", "DQN", hyperparams={"gamma": 0.9, "lr": 0.1})
+    c = derive_idempotency_key(1, "CartPole-v1", "PPO", hyperparams={"lr": 0.1, "gamma": 0.9})
+    assert a == b
+    assert a != c
+
+
+def test_duplicate_claim_returns_first_task(redis_client):
+    dedup = TaskDeduplicator(redis_client)
+    assert dedup.claim("k1", "task-a", ttl_seconds=60) is None
+    assert dedup.claim("k1", "task-b", ttl_seconds=60) == "task-a"
+
+    # Only the owner can release the record
+    dedup.release("k1", "task-b")
+    assert dedup.claim("k1", "task-c", ttl_seconds=60) == "task-a"
+    dedup.release("k1", "task-a")
+    assert dedup.claim("k1", "task-c", ttl_seconds=60) is None
+
+
+def test_experiment_lock(redis_client):
+    dedup = TaskDeduplicator(redis_client)
+    assert dedup.acquire_experiment(7, "task-a", ttl_seconds=60)
+    assert not dedup.acquire_experiment(7, "task-b", ttl_seconds=60)
+    # Redelivered copies of the holder re-take their own lock
+    assert dedup.acquire_experiment(7, "task-a", ttl_seconds=60)
+    assert dedup.experiment_holder(7) == "task-a"
+
+    dedup.release_experiment(7, "task-b")
+    assert dedup.experiment_holder(7) == "task-a"
+    dedup.release_experiment(7, "task-a")
+    assert dedup.acquire_experiment(7, "task-b", ttl_seconds=60)
@@ -0,0 +1,114 @@
+"""
+# tests/test_task_registry.py
+------------------------------------------
+Validates the indexed, cursor-paginated task table
+behind GET /orchestrate/tasks.
+"""
+
+import pytest
+
+from backend.fastapi_app.services.task_registry import TaskRegistry, InvalidCursorError
+
+
+@pytest.fixture
+def registry(redis_client):
+    reg = TaskRegistry(redis_client)
+    for i in range(12):
+        reg.upsert(f"task-{i:02d}", {
+            "experiment_id": i % 3,
+            "env": "CartPole-v1" if i % 2 else "MountainCar-v0",
+            "algo": "DQN",
+            "status": "QUEUED",
+        })
+    return reg
+
+
+def test_pages_are_newest_first_and_complete(registry):
+    """Walking all cursors returns every task exactly once, newest first."""
+    seen = []
+    cursor = None
+    while True:
+        page = registry.list_tasks(limit=5, cursor=cursor)
+        seen.extend(t["task_id"] for t in page["tasks"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"task-{i:02d}" for i in reversed(range(12))]
+
+
+def test_status_index_follows_updates(registry):
+    """Changing status moves a task between status indexes."""
+    registry.upsert("task-03", {"status": "RUNNING"})
+
+    running = registry.list_tasks(status="running")
+    queued = registry.list_tasks(status="QUEUED", limit=100)
+
+    assert [t["task_id"] for t in running["tasks"]] == ["task-03"]
+    assert "task-03" not in {t["task_id"] for t in queued["tasks"]}
+    assert queued["count"] == 11
+
+
+def test_combined_filters(registry):
+    """Residual filters are applied on top of the primary index."""
+    page = registry.list_tasks(experiment_id=1, env="CartPole-v1", limit=100)
+    ids = {t["task_id"] for t in page["tasks"]}
+
+    assert ids == {"task-01", "task-07"}
+    assert all(t["experiment_id"] == "1" for t in page["tasks"])
+
+
+def test_invalid_cursor_rejected(registry):
+    with pytest.raises(InvalidCursorError):
+        registry.list_tasks(cursor="not-a-cursor")
+
+
+def test_ties_across_page_boundary(fake_redis, monkeypatch):
+    """Tasks registered in the same instant are neither skipped nor repeated between pages."""
+    monkeypatch.setattr("backend.fastapi_app.services.task_registry.time.time", lambda: 1000.0)
+    registry = TaskRegistry(fake_redis)
+    for i in range(7):
+        registry.upsert(f"task-{i}", {"status": "QUEUED"})
+
+    for limit in (1, 2, 3, 5):
+        seen = []
+        cursor = None
+        while True:
+            page = registry.list_tasks(limit=limit, cursor=cursor, status="queued")
+            seen.extend(t["task_id"] for t in page["tasks"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [f"task-{i}" for i in reversed(range(7))]
+
+
+def test_status_moves_once_under_concurrent_updates(fake_redis):
+    """Racing status changes leave the task in exactly one status index."""
+    registry = TaskRegistry(fake_redis)
+    registry.upsert("task-0", {"status": "QUEUED"})
+
+    # A concurrent writer changes the status between this upsert's read and its write
+    original = fake_redis.pipeline
+
+    def racing_pipeline(*args, **kwargs):
+        pipe = original(*args, **kwargs)
+        hget = pipe.hget
+
+        def hget_then_race(key, field):
+            value = hget(key, field)
+            if racing_pipeline.pending:
+                racing_pipeline.pending = False
+                TaskRegistry(original.__self__).upsert("task-0", {"status": "RUNNING"})
+            return value
+
+        pipe.hget = hget_then_race
+        return pipe
+
+    racing_pipeline.pending = True
+    fake_redis.pipeline = racing_pipeline
+    registry.upsert("task-0", {"status": "SUCCESS"})
+    fake_redis.pipeline = original
+
+    indexed = [s for s in ("QUEUED", "RUNNING", "SUCCESS") if fake_redis.zscore(registry.index_key("status", s), "task-0")]
+    assert indexed == ["SUCCESS"]
+    assert registry.get("task-0")["status"] == "SUCCESS"